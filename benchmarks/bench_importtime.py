@@ -0,0 +1,127 @@
+"""
+Benchmark de tempo de import dos comandos de leitura
+Executa cada comando com `python -X importtime` num diretório temporário
+(cópia de config/ e examples/), soma o tempo cumulativo dos imports e
+falha se algum comando importar dependências pesadas que não usa ou
+passar do limite de tempo.
+
+Uso:
+    python benchmarks/bench_importtime.py [--limite-ms 150] [--repeticoes 3]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PESADOS = {"selenium", "webdriver_manager", "pandas", "numpy", "anthropic"}
+
+# (nome, código executado, entrada do menu, módulos proibidos)
+CENARIOS = [
+    (
+        "extractor: ajuda",
+        "import sys; sys.argv = ['linkedin_lead_extractor.py']; import linkedin_lead_extractor as m; m.main()",
+        "",
+        PESADOS | {"dotenv"},
+    ),
+    (
+        "extractor: status",
+        "import sys; sys.argv = ['linkedin_lead_extractor.py', 'status']; import linkedin_lead_extractor as m; m.main()",
+        "",
+        PESADOS | {"dotenv"},
+    ),
+    (
+        "bot: opção 3 (status)",
+        "import linkedin_bot_cadencia as m; m.main()",
+        "3\n",
+        PESADOS,
+    ),
+    (
+        "bot: opção 7 (templates)",
+        "import linkedin_bot_cadencia as m; m.main()",
+        "7\n",
+        PESADOS,
+    ),
+]
+
+
+def medir(codigo, entrada, pasta):
+    """Executa o código com -X importtime e retorna (ms cumulativo, módulos importados, erro)"""
+    caminho = os.pathsep.join(filter(None, [RAIZ, os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=caminho, PYTHONDONTWRITEBYTECODE="1")
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        input=entrada, capture_output=True, text=True, cwd=pasta, env=env
+    )
+
+    total_us = 0
+    modulos = set()
+    erro = ""
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:"):
+            erro = erro or (linha if "Error" in linha else "")
+            continue
+        partes = linha[len("import time:"):].split("|")
+        if len(partes) != 3 or not partes[1].strip().isdigit():
+            continue
+        nome = partes[2]
+        modulos.add(nome.strip().split(".")[0])
+        # Só os imports de primeiro nível entram na soma (os aninhados já estão no cumulativo)
+        if len(nome) - len(nome.lstrip()) <= 1:
+            total_us += int(partes[1])
+
+    return total_us / 1000, modulos, erro
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de import dos comandos de leitura")
+    parser.add_argument("--limite-ms", type=float, default=150.0,
+                        help="tempo máximo de import por comando (padrão: 150 ms)")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="execuções por comando; vale a mediana (padrão: 3)")
+    args = parser.parse_args()
+
+    falhas = []
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for sub in ("config", "examples"):
+            origem = os.path.join(RAIZ, sub)
+            if os.path.isdir(origem):
+                shutil.copytree(origem, os.path.join(pasta, sub))
+
+        print(f"{'comando':<28} {'import (ms)':>12}  pesados importados")
+        for nome, codigo, entrada, proibidos in CENARIOS:
+            tempos = []
+            importados = set()
+            erro = ""
+            for _ in range(args.repeticoes):
+                ms, modulos, erro = medir(codigo, entrada, pasta)
+                tempos.append(ms)
+                importados |= modulos & proibidos
+
+            mediana = sorted(tempos)[len(tempos) // 2]
+            print(f"{nome:<28} {mediana:>12.1f}  {', '.join(sorted(importados)) or '-'}")
+            if erro:
+                print(f"{'':<28} ⚠️ {erro}")
+                falhas.append(f"{nome}: comando falhou ({erro})")
+
+            if importados:
+                falhas.append(f"{nome}: importou {', '.join(sorted(importados))}")
+            if mediana > args.limite_ms:
+                falhas.append(f"{nome}: {mediana:.1f} ms > limite {args.limite_ms:.0f} ms")
+
+    if falhas:
+        print("\n❌ Falhas:")
+        for falha in falhas:
+            print(f"   - {falha}")
+        sys.exit(1)
+
+    print("\n✅ Todos os comandos dentro do limite")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark de uma semana simulada do modo contínuo
+Roda o modo contínuo do bot sobre um RelogioSimulado (o tempo virtual
+avança nas esperas em vez de dormir) com um navegador falso: detecção de
+tipo, envios, aceites e respostas são sorteados de forma determinística.
+Mede o tempo real da semana, confere os limites de envio e repete a
+execução com a mesma semente para garantir que o resultado é idêntico.
+
+Uso:
+    python benchmarks/bench_semana_simulada.py [--contatos 300] [--dias 7] [--semente 42]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Percentuais dos contatos (sorteio fixo pela URL)
+CONEXOES_EXISTENTES = 30
+ACEITAM_CONVITE = 60
+RESPONDEM = 15
+# Chance de um envio falhar (sorteada pelo relógio simulado)
+FALHA_ENVIO = 0.03
+
+
+def _sorteio(url, sal):
+    """0-99 fixo para a URL (não depende da ordem de execução)"""
+    return zlib.crc32(f"{sal}:{url}".encode()) % 100
+
+
+class SessaoFalsa:
+    """Sessão sem navegador real: só o que o modo contínuo consulta"""
+
+    driver = object()
+
+    def verificar_memoria(self):
+        return False
+
+    def fechar(self):
+        pass
+
+
+def simular(contatos, dias, semente, inicio):
+    """Executa o modo contínuo por 'dias' num diretório temporário; retorna o resumo"""
+    from linkedin_relogio import RelogioSimulado
+    from linkedin_condicoes import AvaliadorCondicoes
+    from linkedin_bot_cadencia import LinkedInBotCadencia, ARQUIVO_ESTADO
+
+    urls = [f"https://www.linkedin.com/in/simulado-{i:05d}/" for i in range(contatos)]
+
+    class AvaliadorSimulado(AvaliadorCondicoes):
+        def _carregar_conexoes(self):
+            return {self.aliases.resolver(u) for u in urls if _sorteio(u, "aceita") < ACEITAM_CONVITE}
+
+        def _carregar_respostas(self):
+            hoje = self.relogio.agora().date()
+            return {self.aliases.resolver(u): (hoje, False) for u in urls if _sorteio(u, "responde") < RESPONDEM}
+
+    class BotSimulado(LinkedInBotCadencia):
+        def detectar_tipo_contato(self, url):
+            return 'conexao_existente' if _sorteio(url, "tipo") < CONEXOES_EXISTENTES else 'novo'
+
+        def _enviar(self):
+            if self.relogio.aleatorio.random() < FALHA_ENVIO:
+                return False, "timeout"
+            return True, "enviado"
+
+        def enviar_convite(self, url, mensagem=None, dados_perfil=None):
+            return self._enviar()
+
+        def enviar_mensagem(self, url, mensagem, dados_perfil=None):
+            return self._enviar()
+
+    relogio = RelogioSimulado(inicio, semente)
+    sessao = SessaoFalsa()
+    bot = BotSimulado(sessao, relogio)
+    bot.cadencia.condicoes = AvaliadorSimulado(
+        sessao, bot.cadencia.aliases, bot.cadencia.config.get('condicoes'), relogio, bot.cadencia.fuso
+    )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot.modo_continuo(urls, ate=relogio.agora(bot.cadencia.fuso) + timedelta(days=dias))
+
+    with open(ARQUIVO_ESTADO, 'rb') as f:
+        bruto = f.read()
+    estado = json.loads(bruto)
+
+    por_dia = {}
+    for instante in bot.cadencia.limitador.eventos():
+        dia = datetime.fromtimestamp(instante, bot.cadencia.fuso).date().isoformat()
+        por_dia[dia] = por_dia.get(dia, 0) + 1
+
+    return {
+        "envios": len(bot.cadencia.limitador.eventos()),
+        "por_dia": por_dia,
+        "respondeu": sum(1 for c in estado['contatos'].values() if c.get('respondeu')),
+        "limites": bot.cadencia.config['limites'],
+        "assinatura": hashlib.sha256(bruto).hexdigest()[:16],
+    }
+
+
+def executar(contatos, dias, semente, inicio):
+    """simular() num diretório temporário com cópia de config/ e examples/; retorna (resumo, segundos)"""
+    original = os.getcwd()
+    with tempfile.TemporaryDirectory() as pasta:
+        for sub in ("config", "examples"):
+            origem = os.path.join(RAIZ, sub)
+            if os.path.isdir(origem):
+                shutil.copytree(origem, os.path.join(pasta, sub))
+
+        os.chdir(pasta)
+        try:
+            comeco = time.perf_counter()
+            resumo = simular(contatos, dias, semente, inicio)
+            return resumo, time.perf_counter() - comeco
+        finally:
+            os.chdir(original)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semana simulada do modo contínuo")
+    parser.add_argument("--contatos", type=int, default=300,
+                        help="contatos na lista simulada (padrão: 300)")
+    parser.add_argument("--dias", type=int, default=7,
+                        help="dias de tempo virtual (padrão: 7)")
+    parser.add_argument("--semente", type=int, default=42,
+                        help="semente do relógio simulado (padrão: 42)")
+    parser.add_argument("--inicio", default="2024-03-04T08:00:00",
+                        help="início do tempo virtual, ISO com ou sem fuso (padrão: segunda 08:00)")
+    parser.add_argument("--limite-s", type=float, default=30.0,
+                        help="tempo real máximo por execução (padrão: 30 s)")
+    args = parser.parse_args()
+
+    inicio = datetime.fromisoformat(args.inicio)
+    falhas = []
+
+    primeiro, duracao = executar(args.contatos, args.dias, args.semente, inicio)
+    segundo, _ = executar(args.contatos, args.dias, args.semente, inicio)
+
+    print(f"📅 {args.dias} dia(s) simulados com {args.contatos} contatos em {duracao:.2f} s")
+    print(f"📤 Envios: {primeiro['envios']}  💬 Responderam: {primeiro['respondeu']}")
+    for dia, total in sorted(primeiro['por_dia'].items()):
+        print(f"   {dia}: {total}")
+
+    limites = primeiro['limites']
+    maior_dia = max(primeiro['por_dia'].values(), default=0)
+    if limites.get('max_por_dia') and maior_dia > limites['max_por_dia']:
+        falhas.append(f"{maior_dia} envios num dia > limite {limites['max_por_dia']}")
+    if limites.get('max_por_semana') and args.dias <= 7 and primeiro['envios'] > limites['max_por_semana']:
+        falhas.append(f"{primeiro['envios']} envios na semana > limite {limites['max_por_semana']}")
+    if primeiro != segundo:
+        falhas.append(f"execuções com a mesma semente diferem ({primeiro['assinatura']} != {segundo['assinatura']})")
+    if duracao > args.limite_s:
+        falhas.append(f"{duracao:.1f} s > limite {args.limite_s:.0f} s")
+
+    if falhas:
+        print("\n❌ Falhas:")
+        for falha in falhas:
+            print(f"   - {falha}")
+        sys.exit(1)
+
+    print(f"\n✅ Semana reproduzível (estado {primeiro['assinatura']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,33 +9,38 @@ Versão: 3.1 - Com cadências separadas para novos contatos e conexões existent
 AVISO: Use com moderação para evitar restrições do LinkedIn
 """
 
-import time
-import random
 import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-import pytz
-import pandas as pd
-from dotenv import load_dotenv
 
-load_dotenv()
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+# Dependências pesadas (selenium, webdriver_manager, pandas, pytz, dotenv)
+# são importadas dentro das funções que as usam, para que comandos de
+# leitura (status, validar templates) iniciem rápido.
+
+from linkedin_urls import IndiceAliases
+from linkedin_navegador import obter_sessao
+from linkedin_ingestao import carregar_registros, colunas_dos_templates, COLUNAS_BASE
+from linkedin_diario import DiarioAcoes, trecho_fixo
+from linkedin_fila import FilaAcoes
+from linkedin_condicoes import AvaliadorCondicoes
+from linkedin_fatos import FatosPerfis, VALIDADE_PADRAO_DIAS
+from linkedin_limites import LimitadorEnvios
+from linkedin_calendario import CalendarioJanelas
+from linkedin_prioridade import AgendaPrioridade
+from linkedin_previsao import PrevisaoCadencia
+from linkedin_relogio import obter_relogio
+from linkedin_falhas import (DisjuntorFalhas, classificar_erro, classificar_prontidao,
+                             PERFIL_INDISPONIVEL, SESSAO_EXPIRADA, SEM_CONECTAR, OUTRO)
 
 # ============================================
 # CONFIGURAÇÕES BÁSICAS
 # ============================================
 
-EMAIL = os.getenv("LINKEDIN_EMAIL", "")
-SENHA = os.getenv("LINKEDIN_SENHA", "")
+# Preenchidas por carregar_ambiente()
+EMAIL = ""
+SENHA = ""
+_ambiente_carregado = False
 
 # Arquivos
 ARQUIVO_URLS = "config/urls.csv"
@@ -45,15 +50,49 @@ ARQUIVO_LOG = "data/log_envios.csv"
 
 TIMEOUT = 15
 
+# Situações do perfil quando o botão "Conectar" não aparece
+CONVITE_PENDENTE = "convite_pendente"
+JA_CONECTADO = "já_conectado"
+
+# Backoff por contato (sobrescrito por "retentativas" em config/cadencia.json)
+RETENTATIVAS_PADRAO = {
+    "base_minutos": 60,
+    "max_horas": 72,
+    "max_falhas": 5,
+    "max_falhas_por_classe": {PERFIL_INDISPONIVEL: 2},
+    "classes_ignoradas": [SESSAO_EXPIRADA],
+}
+
+
+def carregar_ambiente():
+    """Carrega as credenciais do .env (uma única vez, só quando necessárias)"""
+    global EMAIL, SENHA, _ambiente_carregado
+    if _ambiente_carregado:
+        return
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    EMAIL = os.getenv("LINKEDIN_EMAIL", "")
+    SENHA = os.getenv("LINKEDIN_SENHA", "")
+    _ambiente_carregado = True
+
 # ============================================
 # GERENCIADOR DE CADÊNCIA
 # ============================================
 
 class CadenciaManager:
-    def __init__(self):
+    def __init__(self, relogio=None):
+        import pytz
+
+        self.relogio = relogio or obter_relogio()
         self.config = self.carregar_config()
-        self.estado = self.carregar_estado()
+        self.aliases = IndiceAliases()
         self.fuso = pytz.timezone(self.config['horarios']['fuso_horario'])
+        self.estado = self.carregar_estado()  # A migração dos envios usa o fuso
+        self.calendario = CalendarioJanelas(self.config['horarios'], self.fuso)
+        self.limitador = LimitadorEnvios(self.config['limites'], self.estado.get('envios_recentes'))
+        self.condicoes = None  # AvaliadorCondicoes, definido pelo bot
 
     def carregar_config(self):
         """Carrega configuração de cadência"""
@@ -87,18 +126,77 @@ class CadenciaManager:
         """Carrega estado da execução"""
         try:
             with open(ARQUIVO_ESTADO, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                estado = json.load(f)
         except FileNotFoundError:
             return self._estado_inicial()
 
+        if not estado.get('chaves_canonicas'):
+            self._migrar_chaves_canonicas(estado)
+        if 'envios_recentes' not in estado:
+            estado['envios_recentes'] = self._envios_do_historico(estado)
+        return estado
+
+    def _envios_do_historico(self, estado):
+        """Instantes dos envios bem-sucedidos (migração dos contadores por hora/dia)"""
+        return sorted(
+            int(self.data_local(h['data']).timestamp())
+            for contato in estado.get('contatos', {}).values()
+            for h in contato.get('historico', [])
+            if h.get('sucesso') and h.get('data')
+        )
+
+    def _migrar_chaves_canonicas(self, estado):
+        """
+        Migração única: reindexa os contatos pela URL canônica e mescla
+        entradas duplicadas (barra final, http/https, ?miniProfile...).
+        """
+        contatos = {}
+        mesclados = 0
+
+        for url, contato in estado.get('contatos', {}).items():
+            chave = self.aliases.resolver(url)
+            if chave in contatos:
+                contatos[chave] = self._mesclar_contatos(contatos[chave], contato)
+                mesclados += 1
+            else:
+                contatos[chave] = contato
+
+        estado['contatos'] = contatos
+        estado['chaves_canonicas'] = True
+
+        os.makedirs(os.path.dirname(ARQUIVO_ESTADO), exist_ok=True)
+        with open(ARQUIVO_ESTADO, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, indent=2, ensure_ascii=False)
+
+        if mesclados:
+            print(f"🔗 Estado migrado: {mesclados} contato(s) duplicado(s) mesclado(s)")
+
+    def _mesclar_contatos(self, a, b):
+        """Mescla duas entradas do mesmo contato mantendo o progresso mais avançado"""
+        acoes = [c['ultima_acao'] for c in (a, b) if c.get('ultima_acao')]
+        tentativas = [c['proxima_tentativa'] for c in (a, b) if c.get('proxima_tentativa')]
+        mesclado = {
+            "tipo": a.get('tipo') or b.get('tipo'),
+            "etapa_atual": max(a.get('etapa_atual', 0), b.get('etapa_atual', 0)),
+            "ultima_acao": max(acoes, key=datetime.fromisoformat) if acoes else None,
+            "historico": sorted(
+                a.get('historico', []) + b.get('historico', []),
+                key=lambda h: h.get('data', '')
+            ),
+            "falhas": max(a.get('falhas', 0), b.get('falhas', 0)),
+            "proxima_tentativa": max(tentativas, key=datetime.fromisoformat) if tentativas else None
+        }
+        for campo in ('descartado', 'respondeu', 'nome'):
+            if a.get(campo) or b.get(campo):
+                mesclado[campo] = a.get(campo) or b.get(campo)
+        return mesclado
+
     def _estado_inicial(self):
         """Retorna estado inicial"""
         return {
             "ultima_execucao": None,
-            "envios_hoje": 0,
-            "envios_hora_atual": 0,
-            "hora_atual": None,
-            "data_atual": None,
+            "envios_recentes": [],  # Instantes dos últimos envios (janelas deslizantes)
+            "chaves_canonicas": True,  # Contatos indexados pela URL canônica
             "contatos": {}  # Armazena info de cada contato incluindo tipo (novo/conexao)
         }
 
@@ -110,60 +208,18 @@ class CadenciaManager:
 
     def agora(self):
         """Retorna datetime atual no fuso configurado"""
-        return datetime.now(self.fuso)
-
-    def resetar_contadores_se_necessario(self):
-        """Reseta contadores diários/horários"""
-        agora = self.agora()
-        data_atual = agora.strftime("%Y-%m-%d")
-        hora_atual = agora.hour
-
-        # Reset diário
-        if self.estado['data_atual'] != data_atual:
-            self.estado['data_atual'] = data_atual
-            self.estado['envios_hoje'] = 0
-            self.estado['envios_hora_atual'] = 0
-            self.estado['hora_atual'] = hora_atual
-            print(f"📅 Novo dia: {data_atual} - Contadores resetados")
-
-        # Reset horário
-        if self.estado['hora_atual'] != hora_atual:
-            self.estado['hora_atual'] = hora_atual
-            self.estado['envios_hora_atual'] = 0
-            print(f"⏰ Nova hora: {hora_atual}h - Contador horário resetado")
-
-        self.salvar_estado()
+        return self.relogio.agora(self.fuso)
 
     def dentro_janela_horario(self):
-        """Verifica se está dentro da janela de horário permitida"""
-        agora = self.agora()
-        dia_semana = agora.weekday()
-
-        # Verifica dia da semana
-        if dia_semana not in self.config['horarios']['dias_semana']:
-            return False, f"Dia {dia_semana} não está na lista de dias permitidos"
-
-        # Verifica janelas de horário
-        hora_atual = agora.strftime("%H:%M")
-        for janela in self.config['horarios']['janelas']:
-            if janela['inicio'] <= hora_atual <= janela['fim']:
-                return True, f"Dentro da janela {janela['inicio']}-{janela['fim']}"
-
-        return False, f"Fora das janelas de horário ({hora_atual})"
+        """Verifica se está dentro da janela de horário permitida (dias, feriados e janelas)"""
+        return self.calendario.aberto(self.agora())
 
     def pode_enviar(self):
         """Verifica se pode enviar mais mensagens"""
-        self.resetar_contadores_se_necessario()
-
-        limites = self.config['limites']
-
-        # Verifica limite diário
-        if self.estado['envios_hoje'] >= limites['max_por_dia']:
-            return False, f"Limite diário atingido ({limites['max_por_dia']})"
-
-        # Verifica limite por hora
-        if self.estado['envios_hora_atual'] >= limites['max_por_hora']:
-            return False, f"Limite por hora atingido ({limites['max_por_hora']})"
+        # Limites por hora/dia/semana em janelas deslizantes
+        pode, motivo = self.limitador.admite(self.agora().timestamp())
+        if not pode:
+            return False, motivo
 
         # Verifica janela de horário
         dentro, motivo = self.dentro_janela_horario()
@@ -172,74 +228,84 @@ class CadenciaManager:
 
         return True, "OK"
 
-    def registrar_envio(self, url, sucesso=True):
-        """Registra um envio realizado"""
+    def registrar_envio(self, url, sucesso=True, instante=None):
+        """Registra um envio realizado (instante: quando foi feito, padrão agora)"""
         if sucesso:
-            self.estado['envios_hoje'] += 1
-            self.estado['envios_hora_atual'] += 1
+            self.limitador.registrar((instante or self.agora()).timestamp())
+            self.estado['envios_recentes'] = self.limitador.eventos()
         self.estado['ultima_execucao'] = self.agora().isoformat()
         self.salvar_estado()
 
     def get_intervalo(self):
         """Retorna intervalo aleatório entre ações"""
         limites = self.config['limites']
-        return random.uniform(
+        return self.relogio.uniforme(
             limites['intervalo_min_segundos'],
             limites['intervalo_max_segundos']
         )
 
+    def proxima_liberacao(self):
+        """Quando os limites de envio voltam a admitir um envio"""
+        instante = self.limitador.proxima_liberacao(self.agora().timestamp())
+        return datetime.fromtimestamp(instante, self.fuso)
+
     def proxima_janela(self):
         """Calcula quando será a próxima janela de envio"""
-        agora = self.agora()
-
-        # Verifica próximas janelas hoje
-        for janela in self.config['horarios']['janelas']:
-            inicio = datetime.strptime(janela['inicio'], "%H:%M").time()
-            if agora.time() < inicio:
-                proxima = agora.replace(
-                    hour=inicio.hour,
-                    minute=inicio.minute,
-                    second=0
-                )
-                return proxima
-
-        # Se não há mais janelas hoje, pega primeira de amanhã
-        amanha = agora + timedelta(days=1)
-        primeira_janela = self.config['horarios']['janelas'][0]
-        inicio = datetime.strptime(primeira_janela['inicio'], "%H:%M").time()
-        proxima = amanha.replace(
-            hour=inicio.hour,
-            minute=inicio.minute,
-            second=0
-        )
+        return self.calendario.proxima_abertura(self.agora())
 
-        # Pula para próximo dia permitido
-        while proxima.weekday() not in self.config['horarios']['dias_semana']:
-            proxima += timedelta(days=1)
-
-        return proxima
+    def data_local(self, iso):
+        """Lê um instante salvo no estado; valores antigos sem fuso são horário local"""
+        instante = datetime.fromisoformat(iso)
+        return instante if instante.tzinfo else self.fuso.localize(instante)
 
     # ============================================
     # SISTEMA DE SEQUÊNCIA (MULTI-STEP) COM DUAS CADÊNCIAS
     # ============================================
 
+    def chave_contato(self, url):
+        """Retorna a chave do contato no estado (URL canônica do perfil)"""
+        return self.aliases.resolver(url)
+
+    def registrar_alias(self, url_original, url_final):
+        """
+        Registra a URL final de um perfil após navegação (ex: redirecionamento)
+        e mescla o estado que estava sob a URL antiga.
+        """
+        origem = self.chave_contato(url_original)
+        if not self.aliases.registrar(url_original, url_final):
+            return
+
+        destino = self.chave_contato(url_final)
+        contatos = self.estado['contatos']
+        if origem in contatos and origem != destino:
+            antigo = contatos.pop(origem)
+            contatos[destino] = self._mesclar_contatos(contatos[destino], antigo) if destino in contatos else antigo
+            self.salvar_estado()
+
     def get_etapa_contato(self, url):
         """Retorna a etapa atual de um contato"""
-        if url not in self.estado['contatos']:
-            self.estado['contatos'][url] = {
+        chave = self.chave_contato(url)
+        if chave not in self.estado['contatos']:
+            self.estado['contatos'][chave] = {
                 "tipo": None,  # 'novo' ou 'conexao_existente'
                 "etapa_atual": 0,
                 "ultima_acao": None,
                 "historico": []
             }
-        return self.estado['contatos'][url]
+        return self.estado['contatos'][chave]
+
+    def redefinir_tipo_contato(self, url, tipo):
+        """Troca o tipo detectado (ex: convite aceito por fora) e recomeça na sequência do novo tipo"""
+        contato = self.get_etapa_contato(url)
+        contato['tipo'] = tipo
+        contato['etapa_atual'] = 0
+        self.salvar_estado()
 
     def definir_tipo_contato(self, url, tipo):
         """Define o tipo do contato (novo ou conexao_existente)"""
         contato = self.get_etapa_contato(url)
         if contato['tipo'] is None:  # Só define se ainda não foi definido
             contato['tipo'] = tipo
-            self.estado['contatos'][url] = contato
             self.salvar_estado()
         return contato['tipo']
 
@@ -261,6 +327,9 @@ class CadenciaManager:
             # Tipo ainda não definido - será detectado pelo bot
             return None, None
 
+        if contato.get('respondeu'):
+            return None, tipo  # Contato respondeu: sequência encerrada
+
         sequencia = self.get_sequencia_para_tipo(tipo)
 
         if not sequencia.get('ativo', False):
@@ -278,44 +347,120 @@ class CadenciaManager:
 
         # Verifica dias de espera
         if contato['ultima_acao']:
-            ultima = datetime.fromisoformat(contato['ultima_acao'])
-            dias_passados = (self.agora() - ultima.replace(tzinfo=self.fuso)).days
+            ultima = self.data_local(contato['ultima_acao'])
+            dias_passados = (self.agora() - ultima).days
 
             if dias_passados < proxima_etapa.get('dias_espera', 0):
                 return None, tipo  # Ainda não é hora
 
+        # Condição da etapa (conexao_aceita, sem_resposta), avaliada em lote.
+        # Sem como avaliar (None), a etapa segue como antes.
+        condicao = proxima_etapa.get('condicao')
+        if condicao and self.condicoes and self.condicoes.avaliar(condicao, url, contato) is False:
+            if condicao == 'sem_resposta':
+                contato['respondeu'] = {"em": self.agora().isoformat(), "etapa": etapa_atual}
+                self.salvar_estado()
+                print(f"💬 {url} respondeu - sequência encerrada")
+            return None, tipo
+
         return proxima_etapa, tipo
 
-    def registrar_etapa_concluida(self, url, etapa_id, tipo_contato, sucesso=True):
-        """Registra conclusão de uma etapa"""
+    def registrar_etapa_concluida(self, url, etapa_id, tipo_contato, sucesso=True, classe_erro=None, instante=None):
+        """Registra conclusão de uma etapa (instante: quando foi feita, padrão agora)"""
         contato = self.get_etapa_contato(url)
+        instante = instante or self.agora()
 
         # Garante que o tipo está definido
         if contato['tipo'] is None:
             contato['tipo'] = tipo_contato
 
-        contato['historico'].append({
+        registro = {
             "etapa_id": etapa_id,
             "tipo": tipo_contato,
-            "data": self.agora().isoformat(),
+            "data": instante.isoformat(),
             "sucesso": sucesso
-        })
+        }
+        if not sucesso:
+            registro["erro"] = classe_erro or OUTRO
+        contato['historico'].append(registro)
 
         if sucesso:
             contato['etapa_atual'] += 1
-            contato['ultima_acao'] = self.agora().isoformat()
+            contato['ultima_acao'] = instante.isoformat()
+            contato['falhas'] = 0
+            contato['proxima_tentativa'] = None
+        else:
+            self._registrar_falha(contato, classe_erro or OUTRO)
 
-        self.estado['contatos'][url] = contato
         self.salvar_estado()
 
+    def _registrar_falha(self, contato, classe_erro):
+        """
+        Conta a falha do contato e agenda a próxima tentativa com backoff
+        exponencial. Depois de N falhas (menos para perfil indisponível)
+        o contato vai para a fila de descartados.
+        """
+        config = {**RETENTATIVAS_PADRAO, **self.config.get('retentativas', {})}
+
+        # Sessão expirada não é culpa do contato
+        if classe_erro in config['classes_ignoradas']:
+            return
+
+        contato['falhas'] = contato.get('falhas', 0) + 1
+        contato['ultimo_erro'] = classe_erro
+
+        limite = config['max_falhas_por_classe'].get(classe_erro, config['max_falhas'])
+        if contato['falhas'] >= limite:
+            contato['descartado'] = {
+                "em": self.agora().isoformat(),
+                "motivo": classe_erro,
+                "falhas": contato['falhas']
+            }
+            contato['proxima_tentativa'] = None
+            print(f"🪦 Contato descartado após {contato['falhas']} falha(s): {classe_erro}")
+            return
+
+        espera = min(
+            config['base_minutos'] * 2 ** (contato['falhas'] - 1),
+            config['max_horas'] * 60
+        )
+        contato['proxima_tentativa'] = (self.agora() + timedelta(minutes=espera)).isoformat()
+        print(f"⏳ Falha {contato['falhas']}/{limite} ({classe_erro}) - nova tentativa em {espera:.0f} min")
+
+    def em_espera(self, contato):
+        """True se o contato está descartado ou aguardando o backoff"""
+        if contato.get('descartado'):
+            return True
+        proxima = contato.get('proxima_tentativa')
+        return bool(proxima) and self.data_local(proxima) > self.agora()
+
+    def get_descartados(self):
+        """Contatos na fila de descartados: [(url, contato)]"""
+        return [
+            (url, contato) for url, contato in self.estado['contatos'].items()
+            if contato.get('descartado')
+        ]
+
     def get_contatos_pendentes(self, urls):
         """Retorna contatos que têm ações pendentes (para contatos já tipados)"""
         pendentes = []
+        vistos = set()
 
         for item in urls:
-            url = item.get('url', item) if isinstance(item, dict) else item
+            url = self.chave_contato(item.get('url', item) if isinstance(item, dict) else item)
+            if url in vistos:
+                continue
+            vistos.add(url)
             contato = self.get_etapa_contato(url)
 
+            # Nome da lista: casa o contato com a conversa na caixa de mensagens
+            if isinstance(item, dict) and item.get('nome') and not contato.get('nome'):
+                contato['nome'] = item['nome']
+
+            # Descartados e contatos em backoff ficam de fora
+            if self.em_espera(contato):
+                continue
+
             # Se tipo já foi definido, verifica próxima etapa
             if contato['tipo']:
                 etapa, tipo = self.get_proxima_etapa(url)
@@ -341,17 +486,23 @@ class CadenciaManager:
         """Retorna status atual da cadência"""
         pode, motivo = self.pode_enviar()
         dentro_janela, janela_motivo = self.dentro_janela_horario()
+        agora = self.agora().timestamp()
+        liberacao = self.limitador.proxima_liberacao(agora)
+        janela = self.proxima_janela() if not dentro_janela else None
 
         return {
             "pode_enviar": pode,
             "motivo": motivo,
             "dentro_janela": dentro_janela,
             "janela_motivo": janela_motivo,
-            "envios_hoje": self.estado['envios_hoje'],
+            "envios_hoje": self.limitador.contagem('dia', agora),
             "limite_diario": self.config['limites']['max_por_dia'],
-            "envios_hora": self.estado['envios_hora_atual'],
+            "envios_hora": self.limitador.contagem('hora', agora),
             "limite_hora": self.config['limites']['max_por_hora'],
-            "proxima_janela": self.proxima_janela().isoformat() if not dentro_janela else None
+            "envios_semana": self.limitador.contagem('semana', agora),
+            "limite_semanal": self.config['limites'].get('max_por_semana'),
+            "proxima_liberacao": self.proxima_liberacao().isoformat() if liberacao > agora else None,
+            "proxima_janela": janela.isoformat() if janela else None
         }
 
 
@@ -360,66 +511,36 @@ class CadenciaManager:
 # ============================================
 
 class LinkedInBotCadencia:
-    def __init__(self):
+    def __init__(self, sessao=None, relogio=None):
         self.driver = None
         self.wait = None
-        self.cadencia = CadenciaManager()
+        self.sessao = sessao or obter_sessao()
+        self.relogio = relogio or obter_relogio()
+        self.cadencia = CadenciaManager(self.relogio)
+        self.disjuntor = DisjuntorFalhas(self.cadencia.config.get('disjuntor'), self.relogio)
+        self.diario = DiarioAcoes(relogio=self.relogio)
+        self.fila = FilaAcoes(relogio=self.relogio)
+        self.cadencia.condicoes = AvaliadorCondicoes(
+            self.sessao, self.cadencia.aliases, self.cadencia.config.get('condicoes'), self.relogio,
+            self.cadencia.fuso
+        )
+        self.fatos = FatosPerfis(aliases=self.cadencia.aliases, relogio=self.relogio)
         self.log_data = []
 
     def inicializar_driver(self):
-        """Inicializa o navegador Chrome"""
+        """Inicializa (ou reaproveita) o navegador da sessão compartilhada"""
+        from selenium.webdriver.support.ui import WebDriverWait
+
         print("🚀 Iniciando navegador...")
 
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=chrome_options
-        )
+        self.driver = self.sessao.iniciar()
         self.wait = WebDriverWait(self.driver, TIMEOUT)
         print("✅ Navegador iniciado!")
 
     def fazer_login(self):
-        """Faz login no LinkedIn"""
-        print("\n🔐 Fazendo login...")
-
-        try:
-            self.driver.get("https://www.linkedin.com/login")
-            time.sleep(random.uniform(2, 4))
-
-            email_field = self.wait.until(
-                EC.presence_of_element_located((By.ID, "username"))
-            )
-            email_field.send_keys(EMAIL)
-            time.sleep(random.uniform(0.5, 1.5))
-
-            password_field = self.driver.find_element(By.ID, "password")
-            password_field.send_keys(SENHA)
-            time.sleep(random.uniform(0.5, 1.5))
-
-            login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            login_button.click()
-
-            time.sleep(5)
-
-            if "feed" in self.driver.current_url or "check" not in self.driver.current_url:
-                print("✅ Login realizado!")
-                return True
-            else:
-                print("⚠️ Verificação adicional necessária")
-                print("Complete manualmente e pressione ENTER")
-                input()
-                return True
-
-        except Exception as e:
-            print(f"❌ Erro no login: {str(e)}")
-            return False
+        """Garante login no LinkedIn (reaproveita a sessão se já estiver logada)"""
+        carregar_ambiente()
+        return self.sessao.garantir_login(EMAIL, SENHA)
 
     def carregar_template(self, arquivo):
         """Carrega template de mensagem"""
@@ -449,10 +570,12 @@ class LinkedInBotCadencia:
         Detecta se o perfil é uma conexão existente ou novo contato.
         Retorna: 'conexao_existente' ou 'novo'
         """
+        from selenium.webdriver.common.by import By
+
         try:
             print(f"\n🔍 Detectando tipo de contato: {url}")
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            self.sessao.abrir(url, "perfil")
+            self.cadencia.registrar_alias(url, self.driver.current_url)
 
             # Fecha popups que podem atrapalhar
             try:
@@ -461,7 +584,7 @@ class LinkedInBotCadencia:
                 for btn in dismiss_buttons:
                     try:
                         btn.click()
-                        time.sleep(0.5)
+                        self.relogio.dormir(0.5)
                     except:
                         pass
             except:
@@ -510,17 +633,20 @@ class LinkedInBotCadencia:
 
     def enviar_convite(self, url, mensagem=None, dados_perfil=None):
         """Envia convite de conexão"""
+        from selenium.webdriver.common.by import By
+
         try:
             print(f"\n📨 Acessando: {url}")
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            classe = classificar_prontidao(self.sessao.abrir(url, "perfil"))
+            if classe:
+                print(f"❌ Perfil não abriu: {classe}")
+                self.registrar_log(url, "Erro", "erro", "convite", classe)
+                return False, classe
 
             nome = "Desconhecido"
 
             try:
-                nome_element = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "h1.text-heading-xlarge"))
-                )
+                nome_element = self.sessao.aguardar("h1.text-heading-xlarge")
                 nome = nome_element.text
                 print(f"👤 Perfil: {nome}")
             except:
@@ -533,7 +659,7 @@ class LinkedInBotCadencia:
                 for btn in dismiss_buttons:
                     try:
                         btn.click()
-                        time.sleep(0.5)
+                        self.relogio.dormir(0.5)
                     except:
                         pass
             except:
@@ -550,47 +676,45 @@ class LinkedInBotCadencia:
                     break
 
             if not botao_conectar:
-                print("⚠️ Botão 'Conectar' não encontrado")
-                self.registrar_log(url, nome, "já_conectado", "convite", "")
-                return False, "já_conectado"
+                botao_conectar = self._conectar_no_menu()
+
+            if not botao_conectar:
+                situacao = self._situacao_sem_conectar()
+                print(f"⚠️ Botão 'Conectar' não encontrado ({situacao})")
+                self.registrar_log(url, nome, situacao, "convite", "")
+                return False, situacao
 
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", botao_conectar)
-            time.sleep(1)
+            self.relogio.dormir(1)
 
             try:
                 botao_conectar.click()
             except:
                 self.driver.execute_script("arguments[0].click();", botao_conectar)
-            time.sleep(random.uniform(1, 2))
+            self.relogio.dormir(self.relogio.uniforme(1, 2))
 
             # Adiciona nota se houver mensagem
             if mensagem:
                 try:
-                    botao_nota = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "button[aria-label*='nota'], button[aria-label*='note']"))
-                    )
+                    botao_nota = self.sessao.aguardar("button[aria-label*='nota'], button[aria-label*='note']")
                     botao_nota.click()
-                    time.sleep(1)
+                    self.relogio.dormir(1)
 
                     msg_personalizada = self.personalizar_mensagem(mensagem, nome, dados_perfil)
 
                     if len(msg_personalizada) > 300:
                         msg_personalizada = msg_personalizada[:297] + "..."
 
-                    campo_mensagem = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "textarea[name='message']"))
-                    )
+                    campo_mensagem = self.sessao.aguardar("textarea[name='message']")
                     campo_mensagem.send_keys(msg_personalizada)
-                    time.sleep(1)
+                    self.relogio.dormir(1)
 
                     print(f"📝 Mensagem: {msg_personalizada[:50]}...")
                 except Exception as e:
                     print(f"⚠️ Não foi possível adicionar nota: {str(e)}")
 
             # Confirma envio
-            botao_enviar = self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label*='Enviar'], button[aria-label*='Send']"))
-            )
+            botao_enviar = self.sessao.aguardar("button[aria-label*='Enviar'], button[aria-label*='Send']", clicavel=True)
             botao_enviar.click()
 
             print("✅ Convite enviado!")
@@ -600,46 +724,72 @@ class LinkedInBotCadencia:
         except Exception as e:
             print(f"❌ Erro: {str(e)}")
             self.registrar_log(url, "Erro", "erro", "convite", str(e))
-            return False, "erro"
+            return False, classificar_erro(e)
+
+    def _conectar_no_menu(self):
+        """Item 'Conectar' escondido no menu 'Mais' do perfil, ou None"""
+        from selenium.webdriver.common.by import By
+
+        for menu in self.driver.find_elements(By.CSS_SELECTOR, "main button[aria-label*='Mais'], main button[aria-label*='More']"):
+            try:
+                menu.click()
+                self.relogio.dormir(1)
+            except Exception:
+                continue
+            for item in self.driver.find_elements(By.CSS_SELECTOR, "main div[role='button'], main [role='menuitem']"):
+                rotulo = f"{item.get_attribute('aria-label') or ''} {item.text}".lower()
+                if ("conectar" in rotulo or "connect" in rotulo) and "remov" not in rotulo:
+                    return item
+        return None
+
+    def _situacao_sem_conectar(self):
+        """Por que o perfil aberto não tem 'Conectar': convite pendente, já conectado ou desconhecido"""
+        from selenium.webdriver.common.by import By
+
+        rotulos = [
+            f"{b.get_attribute('aria-label') or ''} {b.text}".lower()
+            for b in self.driver.find_elements(By.CSS_SELECTOR, "main button")
+        ]
+        if any("pendente" in r or "pending" in r for r in rotulos):
+            return CONVITE_PENDENTE
+        if any("mensagem" in r or "message" in r for r in rotulos):
+            return JA_CONECTADO
+        return SEM_CONECTAR
 
     def enviar_mensagem(self, url, mensagem, dados_perfil=None):
         """Envia mensagem para conexão existente"""
+
         try:
             print(f"\n📨 Acessando: {url}")
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            classe = classificar_prontidao(self.sessao.abrir(url, "perfil"))
+            if classe:
+                print(f"❌ Perfil não abriu: {classe}")
+                self.registrar_log(url, "Erro", "erro", "mensagem", classe)
+                return False, classe
 
             nome = "Desconhecido"
 
             try:
-                nome_element = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "h1.text-heading-xlarge"))
-                )
+                nome_element = self.sessao.aguardar("h1.text-heading-xlarge")
                 nome = nome_element.text
                 print(f"👤 Perfil: {nome}")
             except:
                 pass
 
             try:
-                botao_mensagem = self.wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label*='Mensagem'], button[aria-label*='Message']"))
-                )
+                botao_mensagem = self.sessao.aguardar("button[aria-label*='Mensagem'], button[aria-label*='Message']", clicavel=True)
                 botao_mensagem.click()
-                time.sleep(2)
+                self.relogio.dormir(2)
 
                 msg_personalizada = self.personalizar_mensagem(mensagem, nome, dados_perfil)
 
-                campo_mensagem = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.msg-form__contenteditable"))
-                )
+                campo_mensagem = self.sessao.aguardar("div.msg-form__contenteditable")
                 campo_mensagem.send_keys(msg_personalizada)
-                time.sleep(1)
+                self.relogio.dormir(1)
 
                 print(f"📝 Mensagem: {msg_personalizada[:50]}...")
 
-                botao_enviar = self.wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button.msg-form__send-button"))
-                )
+                botao_enviar = self.sessao.aguardar("button.msg-form__send-button", clicavel=True)
                 botao_enviar.click()
 
                 print("✅ Mensagem enviada!")
@@ -649,17 +799,17 @@ class LinkedInBotCadencia:
             except Exception as e:
                 print(f"❌ Erro: {str(e)}")
                 self.registrar_log(url, nome, "erro", "mensagem", str(e))
-                return False, "erro"
+                return False, classificar_erro(e)
 
         except Exception as e:
             print(f"❌ Erro geral: {str(e)}")
             self.registrar_log(url, "Erro", "erro_geral", "mensagem", str(e))
-            return False, "erro"
+            return False, classificar_erro(e)
 
     def registrar_log(self, url, nome, status, tipo, mensagem):
         """Registra ação no log"""
         self.log_data.append({
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": self.relogio.agora().strftime("%Y-%m-%d %H:%M:%S"),
             "url": url,
             "nome": nome,
             "status": status,
@@ -669,6 +819,8 @@ class LinkedInBotCadencia:
 
     def salvar_log(self):
         """Salva log em CSV"""
+        import pandas as pd
+
         try:
             os.makedirs(os.path.dirname(ARQUIVO_LOG), exist_ok=True)
             df = pd.DataFrame(self.log_data)
@@ -685,17 +837,29 @@ class LinkedInBotCadencia:
             print(f"⚠️ Erro ao salvar log: {str(e)}")
 
     def executar_etapa(self, contato_info):
-        """Executa uma etapa da sequência para um contato"""
+        """
+        Executa uma etapa da sequência para um contato. Retorna None se a
+        ação foi pulada sem abrir nenhuma página (disjuntor aberto).
+        """
         url = contato_info['url']
         dados = contato_info['dados']
         etapa = contato_info.get('etapa')
         tipo_contato = contato_info.get('tipo')
+        ja_tipado = bool(tipo_contato)
 
         print(f"\n{'='*50}")
 
-        # Se o tipo ainda não foi detectado, detecta agora
+        # Se o tipo ainda não foi detectado, usa o fato fresco da extração ou detecta agora
         if not tipo_contato:
-            tipo_contato = self.detectar_tipo_contato(url)
+            validade = self.cadencia.config.get('fatos_perfis', {}).get('validade_dias', VALIDADE_PADRAO_DIAS)
+            tipo_contato = self.fatos.ler(url, 'tipo', validade)
+            if tipo_contato:
+                ja_tipado = True  # Nenhuma página aberta
+                print(f"♻️ Tipo já conhecido: {tipo_contato}")
+            else:
+                tipo_contato = self.detectar_tipo_contato(url)
+                self.fatos.gravar(url, 'tipo', tipo_contato, 'cadencia')
+                self.fatos.salvar()
             self.cadencia.definir_tipo_contato(url, tipo_contato)
 
             # Agora busca a etapa correta para esse tipo
@@ -708,15 +872,36 @@ class LinkedInBotCadencia:
         print(f"👤 Tipo: {'Conexão existente' if tipo_contato == 'conexao_existente' else 'Novo contato'}")
         print(f"📌 Etapa: {etapa['nome']} (ID: {etapa['id']})")
 
+        # Mensagem aprovada na fila (gerada por IA para este lead) substitui o template
+        etapas = self.cadencia.get_sequencia_para_tipo(tipo_contato).get('etapas', [])
+        numero = etapas.index(etapa) + 1 if etapa in etapas else None
+        texto_fila = self.fila.texto(url, numero) if numero else None
+
         # Carrega template
-        template = self.carregar_template(etapa['template'])
+        template = texto_fila or self.carregar_template(etapa['template'])
         if not template:
             print(f"⚠️ Template vazio, pulando...")
             return False
+        if texto_fila:
+            print("📬 Usando mensagem aprovada da fila")
+
+        # Com o disjuntor da ação aberto, só a detecção de tipo continua
+        acao = 'convite' if etapa['tipo'] in ['convite', 'convite_com_mensagem'] else 'mensagem'
+        aberto, motivo = self.disjuntor.aberto(acao)
+        if aberto:
+            print(f"🔌 '{acao}' suspenso ({motivo}) - apenas detecção")
+            return None if ja_tipado else False
+
+        # Grava a intenção antes de tocar no navegador (chave: contato, etapa, tentativa)
+        usar_msg = acao == 'mensagem' or etapa['tipo'] == 'convite_com_mensagem' or bool(texto_fila)
+        historico = self.cadencia.get_etapa_contato(url)['historico']
+        tentativa = sum(1 for h in historico if h.get('etapa_id') == etapa['id']) + 1
+        chave = self.diario.registrar_intencao(
+            url, etapa['id'], acao, tentativa, trecho_fixo(template) if usar_msg else ""
+        )
 
         # Executa ação baseada no tipo da etapa
-        if etapa['tipo'] in ['convite', 'convite_com_mensagem']:
-            usar_msg = etapa['tipo'] == 'convite_com_mensagem'
+        if acao == 'convite':
             sucesso, status = self.enviar_convite(
                 url,
                 template if usar_msg else None,
@@ -729,12 +914,172 @@ class LinkedInBotCadencia:
                 dados if isinstance(dados, dict) else None
             )
 
+        if status == CONVITE_PENDENTE:
+            # O convite já existe: a etapa está feita, sem envio agora
+            print("📨 Convite já pendente - etapa considerada concluída")
+            self.cadencia.registrar_etapa_concluida(url, etapa['id'], tipo_contato, True)
+            self.diario.registrar_resultado(chave, False, status)
+            if texto_fila:
+                self.fila.concluir(url, numero, True, status)
+            return False
+
+        if status == JA_CONECTADO:
+            # Tipo desatualizado (convite aceito por fora): segue a sequência de conexões
+            print("🤝 Já é conexão - contato passa para a sequência de conexões existentes")
+            self.cadencia.redefinir_tipo_contato(url, 'conexao_existente')
+            self.fatos.gravar(url, 'tipo', 'conexao_existente', 'cadencia')
+            self.fatos.salvar()
+            self.diario.registrar_resultado(chave, False, status)
+            self.fila.cancelar_contato(url, "tipo_divergente")
+            return False
+
+        # Falta de "Conectar" é do perfil, não do fluxo: não conta para o disjuntor
+        classe = None if sucesso else status
+        if classe != SEM_CONECTAR:
+            self.disjuntor.registrar(acao, sucesso, classe)
+
         # Registra conclusão
-        self.cadencia.registrar_etapa_concluida(url, etapa['id'], tipo_contato, sucesso)
+        self.cadencia.registrar_etapa_concluida(url, etapa['id'], tipo_contato, sucesso, classe)
         self.cadencia.registrar_envio(url, sucesso)
+        self.diario.registrar_resultado(chave, sucesso, status)
+
+        if texto_fila:
+            self.fila.concluir(url, numero, sucesso, status)
+        if self.cadencia.get_etapa_contato(url).get('descartado'):
+            self.fila.cancelar_contato(url, "descartado")
 
         return sucesso
 
+    def incluir_fila(self, urls, somente_leitura=False):
+        """
+        Acrescenta à lista os contatos com mensagens aprovadas na fila.
+        Com 'somente_leitura' (status, previsão) não grava o estado nem
+        cancela nada na fila: só deixa de fora quem seria cancelado.
+        """
+        contatos = self.fila.contatos()
+        if not contatos:
+            return urls
+
+        existentes = {
+            self.cadencia.chave_contato(item.get('url', item) if isinstance(item, dict) else item)
+            for item in urls
+        }
+        extras = []
+        ignorados = 0
+        for contato in contatos:
+            estado = self.cadencia.estado['contatos'].get(self.cadencia.chave_contato(contato['url']), {})
+            encerrado = 'respondeu' if estado.get('respondeu') else 'descartado' if estado.get('descartado') else None
+
+            # As mensagens foram numeradas para a sequência do tipo da extração
+            if not encerrado and estado.get('tipo') and estado['tipo'] != contato['tipo']:
+                encerrado = 'tipo_divergente'
+                print(f"⚠️ {contato['url']}: fila gerada para '{contato['tipo']}', "
+                      f"mas o contato segue a sequência '{estado['tipo']}'")
+
+            if encerrado:
+                ignorados += 1
+                if not somente_leitura:
+                    self.fila.cancelar_contato(contato['url'], encerrado)
+                continue
+
+            # O tipo já foi detectado na extração: dispensa nova detecção
+            if not somente_leitura:
+                self.cadencia.definir_tipo_contato(contato['url'], contato['tipo'])
+            if self.cadencia.chave_contato(contato['url']) not in existentes:
+                extras.append({"url": contato['url'], "nome": contato['nome'], "tipo": contato['tipo']})
+
+        print(f"📬 Fila de aprovados: {len(contatos)} contato(s) com mensagens pendentes")
+        if ignorados:
+            acao = "ignorado(s)" if somente_leitura else "cancelado(s)"
+            print(f"   {ignorados} {acao} (respondeu, descartado ou tipo divergente)")
+        return list(urls) + extras
+
+    def recuperar_acoes_pendentes(self):
+        """
+        Reconcilia as ações que ficaram sem resultado no diário (queda ou
+        Ctrl+C no meio de um envio): confere o estado e, se preciso, o
+        perfil uma única vez, em vez de repetir o envio às cegas.
+        """
+        pendentes = self.diario.pendentes()
+        if not pendentes:
+            self.diario.compactar()
+            return
+
+        print(f"\n🩹 {len(pendentes)} ação(ões) sem resultado no diário - verificando...")
+
+        for intencao in pendentes:
+            url = intencao['url']
+            contato = self.cadencia.get_etapa_contato(url)
+            registradas = sum(1 for h in contato['historico'] if h.get('etapa_id') == intencao['etapa_id'])
+
+            if registradas >= intencao['tentativa']:
+                # Caiu depois de salvar o estado: nada a refazer
+                self.diario.registrar_resultado(intencao['chave'], None, "reconciliado_estado")
+                continue
+
+            realizada = self._verificar_acao_realizada(intencao)
+            if realizada is None:
+                # Na dúvida, não reenvia: mensagem duplicada é pior que uma perdida
+                print(f"   ⚠️ {url}: não foi possível confirmar - considerando enviada")
+                realizada = True
+
+            if realizada:
+                tipo = contato['tipo'] or ('novo' if intencao['acao'] == 'convite' else 'conexao_existente')
+                # Conta o envio quando foi feito (intenção), não agora
+                enviado_em = datetime.fromtimestamp(
+                    datetime.fromisoformat(intencao['em']).timestamp(), self.cadencia.fuso
+                )
+                self.cadencia.registrar_etapa_concluida(url, intencao['etapa_id'], tipo, True, instante=enviado_em)
+                self.cadencia.registrar_envio(url, True, instante=enviado_em)
+                print(f"   ✅ {url}: {intencao['acao']} já tinha sido enviado")
+                self.diario.registrar_resultado(intencao['chave'], True, "reconciliado_enviado")
+            else:
+                print(f"   ↩️ {url}: {intencao['acao']} não chegou a ser enviado")
+                self.diario.registrar_resultado(intencao['chave'], False, "reconciliado_nao_enviado")
+
+        self.diario.compactar()
+
+    def _verificar_acao_realizada(self, intencao):
+        """Abre o perfil e diz se a ação da intenção aconteceu (True/False) ou None se não der para saber"""
+        from selenium.webdriver.common.by import By
+
+        try:
+            if classificar_prontidao(self.sessao.abrir(intencao['url'], "perfil")):
+                return None
+
+            if intencao['acao'] == 'convite':
+                rotulos = [
+                    f"{b.get_attribute('aria-label') or ''} {b.text}".lower()
+                    for b in self.driver.find_elements(By.CSS_SELECTOR, "main button")
+                ]
+                if any("pendente" in r or "pending" in r for r in rotulos):
+                    return True
+                if any("conectar" in r or "connect" in r for r in rotulos):
+                    return False
+                # Sem "Conectar" e com "Mensagem": o convite já foi aceito
+                return True if any("mensagem" in r or "message" in r for r in rotulos) else None
+
+            trecho = intencao.get('trecho')
+            if not trecho:
+                return None
+
+            self.sessao.aguardar("button[aria-label*='Mensagem'], button[aria-label*='Message']", clicavel=True).click()
+            self.sessao.aguardar("div.msg-form__contenteditable")
+            try:
+                self.sessao.aguardar(".msg-s-event-listitem__body")
+            except Exception:
+                return False  # Conversa aberta e vazia
+
+            textos = [
+                " ".join(e.text.split())
+                for e in self.driver.find_elements(By.CSS_SELECTOR, ".msg-s-event-listitem__body")
+            ]
+            return any(trecho in texto for texto in textos)
+
+        except Exception as e:
+            print(f"   ⚠️ Erro ao verificar {intencao['url']}: {str(e)}")
+            return None
+
     def processar_cadencia(self, urls):
         """Processa lista com sistema de cadência"""
         print("\n" + "="*50)
@@ -744,44 +1089,62 @@ class LinkedInBotCadencia:
         # Mostra status inicial
         status = self.cadencia.status()
         print(f"\n📊 Status:")
-        print(f"   Envios hoje: {status['envios_hoje']}/{status['limite_diario']}")
-        print(f"   Envios esta hora: {status['envios_hora']}/{status['limite_hora']}")
+        print(f"   Envios nas últimas 24h: {status['envios_hoje']}/{status['limite_diario']}")
+        print(f"   Envios na última hora: {status['envios_hora']}/{status['limite_hora']}")
         print(f"   Dentro da janela: {'✅' if status['dentro_janela'] else '❌'} {status['janela_motivo']}")
 
         if not status['pode_enviar']:
             print(f"\n⏸️ Não é possível enviar agora: {status['motivo']}")
+            if status['proxima_liberacao']:
+                print(f"   Limites liberam em: {status['proxima_liberacao']}")
             if status['proxima_janela']:
                 print(f"   Próxima janela: {status['proxima_janela']}")
             return
 
-        # Obtém contatos pendentes
-        pendentes = self.cadencia.get_contatos_pendentes(urls)
+        # Obtém contatos pendentes (lista + fila de aprovados)
+        pendentes = self.cadencia.get_contatos_pendentes(self.incluir_fila(urls))
         print(f"\n📋 Contatos com ações pendentes: {len(pendentes)}")
 
         if not pendentes:
             print("✅ Todos os contatos já foram processados!")
             return
 
+        # Follow-ups devidos antes de novos convites dentro do orçamento do dia
+        agenda = AgendaPrioridade(self.cadencia, self.cadencia.config.get('prioridade'))
+        agenda.adicionar(pendentes)
+        print(f"🎯 Ordem: {agenda.resumo()}")
+
         contador = 0
 
-        for contato in pendentes:
+        while agenda:
+            contato = agenda.proximo()
+
             # Verifica se ainda pode enviar
             pode, motivo = self.cadencia.pode_enviar()
             if not pode:
                 print(f"\n⏸️ Parando: {motivo}")
                 break
 
+            if self.disjuntor.interromper_sessao():
+                print("\n🔌 Parando: disjuntor aberto (fluxo do LinkedIn parece quebrado)")
+                break
+
             # Executa etapa
             sucesso = self.executar_etapa(contato)
 
+            if sucesso is None:
+                continue  # Nada foi aberto: sem intervalo
             if sucesso:
                 contador += 1
 
+            # Entre ações é seguro reciclar o navegador se a memória estourou
+            self.verificar_memoria()
+
             # Delay entre ações
             if pode:
                 intervalo = self.cadencia.get_intervalo()
                 print(f"\n⏱️ Aguardando {intervalo:.0f}s até próxima ação...")
-                time.sleep(intervalo)
+                self.relogio.dormir(intervalo)
 
         print("\n" + "="*50)
         print(f"✅ Sessão concluída! Enviados: {contador}")
@@ -789,17 +1152,17 @@ class LinkedInBotCadencia:
         # Mostra status final
         status = self.cadencia.status()
         print(f"\n📊 Status final:")
-        print(f"   Envios hoje: {status['envios_hoje']}/{status['limite_diario']}")
+        print(f"   Envios nas últimas 24h: {status['envios_hoje']}/{status['limite_diario']}")
         if not status['dentro_janela'] and status['proxima_janela']:
             print(f"   Próxima janela: {status['proxima_janela']}")
 
-    def modo_continuo(self, urls):
-        """Executa em modo contínuo (fica rodando)"""
+    def modo_continuo(self, urls, ate=None):
+        """Executa em modo contínuo (fica rodando; com 'ate', para nesse instante)"""
         print("\n🔄 MODO CONTÍNUO - Ctrl+C para parar")
 
         intervalo_verificacao = self.cadencia.config['execucao']['verificar_intervalo_minutos']
 
-        while True:
+        while ate is None or self.cadencia.agora() < ate:
             try:
                 status = self.cadencia.status()
 
@@ -810,25 +1173,45 @@ class LinkedInBotCadencia:
                     if status['proxima_janela']:
                         print(f"   Próxima janela: {status['proxima_janela']}")
 
-                # Aguarda próxima verificação
-                print(f"\n💤 Próxima verificação em {intervalo_verificacao} minutos...")
-                time.sleep(intervalo_verificacao * 60)
+                self.verificar_memoria()
+
+                # Com os limites cheios, dorme até o instante exato da liberação
+                liberacao = self.cadencia.proxima_liberacao()
+                espera = (liberacao - self.cadencia.agora()).total_seconds()
+                if espera > 0:
+                    print(f"\n💤 Limites cheios - próximo envio possível às {liberacao.strftime('%d/%m %H:%M:%S')}")
+                    self.relogio.dormir(espera)
+                else:
+                    print(f"\n💤 Próxima verificação em {intervalo_verificacao} minutos...")
+                    self.relogio.dormir(intervalo_verificacao * 60)
 
             except KeyboardInterrupt:
                 print("\n\n⚠️ Interrompido pelo usuário")
                 break
 
+    def verificar_memoria(self):
+        """Recicla o navegador se o vigia de memória pedir, mantendo o login"""
+        if not self.driver or not self.sessao.verificar_memoria():
+            return
+
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.driver = self.sessao.driver
+        self.wait = WebDriverWait(self.driver, TIMEOUT)
+        self.fazer_login()
+
     def fechar(self):
-        """Fecha o navegador"""
+        """Libera o navegador da sessão"""
         if self.driver:
-            self.driver.quit()
-            print("\n👋 Navegador fechado")
+            self.sessao.fechar()
+            self.driver = None
 
     def modo_teste(self, urls, url_especifica=None):
         """
         Modo de teste manual com confirmação a cada envio.
         Permite testar uma URL específica ou as primeiras N URLs da lista.
         """
+
         print("\n" + "="*50)
         print("🧪 MODO TESTE - Confirmação manual a cada envio")
         print("="*50)
@@ -881,9 +1264,7 @@ class LinkedInBotCadencia:
             # Tenta extrair nome do perfil (já estamos na página)
             nome = "Desconhecido"
             try:
-                nome_element = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "h1.text-heading-xlarge"))
-                )
+                nome_element = self.sessao.aguardar("h1.text-heading-xlarge")
                 nome = nome_element.text
             except:
                 pass
@@ -1000,21 +1381,31 @@ class LinkedInBotCadencia:
 # FUNÇÕES AUXILIARES
 # ============================================
 
-def carregar_urls(arquivo):
-    """Carrega URLs do arquivo"""
+def carregar_urls(arquivo, colunas=None):
+    """
+    Carrega URLs do arquivo, normalizadas e sem perfis duplicados.
+    Mantém só as colunas usadas nos templates (ou as indicadas).
+    """
+    if colunas is None:
+        try:
+            with open(ARQUIVO_CADENCIA, 'r', encoding='utf-8') as f:
+                colunas = colunas_dos_templates(json.load(f))
+        except FileNotFoundError:
+            colunas = list(COLUNAS_BASE)
+
     try:
-        if arquivo.endswith('.csv'):
-            df = pd.read_csv(arquivo)
-            return df.to_dict('records')
-        else:
-            with open(arquivo, 'r', encoding='utf-8') as f:
-                return [line.strip() for line in f if line.strip()]
+        urls, duplicados = carregar_registros(arquivo, colunas, IndiceAliases())
     except FileNotFoundError:
         print(f"❌ Arquivo não encontrado: {arquivo}")
         return []
 
+    if duplicados:
+        print(f"🔗 {duplicados} URL(s) duplicada(s) ignorada(s)")
+    return urls
+
 def validar_configuracao():
     """Valida configurações"""
+    carregar_ambiente()
     erros = []
 
     if EMAIL == "seu_email@example.com":
@@ -1067,8 +1458,9 @@ def main():
     print("5. 🧪 MODO TESTE - Testar URLs da lista")
     print("6. 🧪 MODO TESTE - Testar URL específica")
     print("7. 📄 Validar templates")
+    print("8. 📈 Prever cadência (volumes e datas de conclusão)")
 
-    opcao = input("\nEscolha (1-7): ").strip()
+    opcao = input("\nEscolha (1-8): ").strip()
 
     bot = LinkedInBotCadencia()
 
@@ -1078,20 +1470,47 @@ def main():
             print("\n📊 Status da Cadência:")
             print(f"   Pode enviar: {'✅' if status['pode_enviar'] else '❌'} - {status['motivo']}")
             print(f"   Dentro da janela: {'✅' if status['dentro_janela'] else '❌'}")
-            print(f"   Envios hoje: {status['envios_hoje']}/{status['limite_diario']}")
-            print(f"   Envios esta hora: {status['envios_hora']}/{status['limite_hora']}")
+            print(f"   Envios nas últimas 24h: {status['envios_hoje']}/{status['limite_diario']}")
+            print(f"   Envios na última hora: {status['envios_hora']}/{status['limite_hora']}")
+            if status['limite_semanal']:
+                print(f"   Envios nos últimos 7 dias: {status['envios_semana']}/{status['limite_semanal']}")
+            if status['proxima_liberacao']:
+                print(f"   Limites liberam em: {status['proxima_liberacao']}")
             if status['proxima_janela']:
                 print(f"   Próxima janela: {status['proxima_janela']}")
 
-            # Mostra contatos
-            pendentes = bot.cadencia.get_contatos_pendentes(urls)
+            # Mostra contatos (lista + fila de aprovados)
+            pendentes = bot.cadencia.get_contatos_pendentes(bot.incluir_fila(urls, somente_leitura=True))
             print(f"\n   Contatos pendentes: {len(pendentes)}")
 
+            fila = bot.fila.resumo()
+            if fila:
+                print(f"   Fila de aprovados: {fila.get('pendente', 0)} pendente(s), "
+                      f"{fila.get('concluida', 0)} enviada(s), {fila.get('cancelada', 0)} cancelada(s)")
+
             # Mostra breakdown por tipo
             novos = sum(1 for p in pendentes if p.get('tipo') == 'novo' or p.get('tipo') is None)
             conexoes = sum(1 for p in pendentes if p.get('tipo') == 'conexao_existente')
             print(f"   - Novos/Não detectados: {novos}")
             print(f"   - Conexões existentes: {conexoes}")
+
+            em_backoff = sum(
+                1 for c in bot.cadencia.estado['contatos'].values()
+                if not c.get('descartado') and bot.cadencia.em_espera(c)
+            )
+            if em_backoff:
+                print(f"   - Aguardando nova tentativa: {em_backoff}")
+
+            responderam = sum(1 for c in bot.cadencia.estado['contatos'].values() if c.get('respondeu'))
+            if responderam:
+                print(f"   - Responderam (sequência encerrada): {responderam}")
+
+            descartados = bot.cadencia.get_descartados()
+            if descartados:
+                print(f"\n   🪦 Descartados após falhas repetidas: {len(descartados)}")
+                for url, contato in descartados:
+                    info = contato['descartado']
+                    print(f"   - {url} ({info['motivo']}, {info['falhas']} falha(s), {info['em'][:10]})")
             return
 
         elif opcao == "4":
@@ -1107,6 +1526,12 @@ def main():
             bot.validar_templates()
             return
 
+        elif opcao == "8":
+            # Simulação sobre o estado salvo: não abre o navegador
+            previsao = PrevisaoCadencia(bot.cadencia, bot.cadencia.config.get('previsao'))
+            previsao.imprimir(previsao.prever(bot.incluir_fila(urls, somente_leitura=True)))
+            return
+
         # Opções que precisam de login
         bot.inicializar_driver()
 
@@ -1114,6 +1539,9 @@ def main():
             print("❌ Falha no login")
             return
 
+        # Reconcilia envios interrompidos por uma queda anterior
+        bot.recuperar_acoes_pendentes()
+
         if opcao == "2":
             bot.modo_continuo(urls)
         elif opcao == "5":
@@ -0,0 +1,108 @@
+"""
+Calendário das janelas de envio
+Compila o bloco "horarios" do cadencia.json (janelas, dias da semana,
+feriados, fuso) numa lista ordenada de intervalos em minutos desde a
+epoch, com os horários locais convertidos pelo fuso (horário de verão
+incluído). "Está aberto?" e "quando abre?" viram buscas binárias.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, date, timedelta
+
+# Dias compilados por vez (o calendário se estende sob demanda)
+BLOCO_DIAS = 35
+# Limite da busca pela próxima abertura (config sem nenhum dia útil)
+HORIZONTE_DIAS = 400
+
+
+def _minuto(instante):
+    """Minutos desde a epoch de um datetime com fuso"""
+    return int(instante.timestamp()) // 60
+
+
+class CalendarioJanelas:
+    """
+    Intervalos [início, fim) em minutos desde a epoch. O fim de uma janela
+    é inclusivo no config ("17:00" vale até 17:00:59), como na comparação
+    de "HH:MM" que este calendário substitui. Feriados aceitam "AAAA-MM-DD"
+    (data única) ou "MM-DD" (todo ano).
+    """
+
+    def __init__(self, horarios, fuso):
+        self.fuso = fuso
+        self.dias_semana = set(horarios.get('dias_semana', []))
+        self.janelas = []
+        for janela in horarios.get('janelas', []):
+            inicio = datetime.strptime(janela['inicio'], "%H:%M").time()
+            fim = datetime.strptime(janela['fim'], "%H:%M").time()
+            self.janelas.append((inicio, fim, f"{janela['inicio']}-{janela['fim']}"))
+        self.janelas.sort()
+
+        feriados = horarios.get('feriados', [])
+        self.feriados = {date.fromisoformat(f) for f in feriados if len(f) == 10}
+        self.feriados_anuais = {f for f in feriados if len(f) == 5}
+
+        self.inicios = []
+        self.fins = []
+        self.rotulos = []
+        self._primeiro_dia = None
+        self._ultimo_dia = None
+
+    def feriado(self, dia):
+        return dia in self.feriados or dia.strftime("%m-%d") in self.feriados_anuais
+
+    def _local(self, dia, horario):
+        """Minuto epoch do horário local do dia (localize aplica o deslocamento certo da data)"""
+        return _minuto(self.fuso.localize(datetime.combine(dia, horario)))
+
+    def _compilar(self, ate_dia):
+        """Estende os intervalos até 'ate_dia' (inclusive)"""
+        dia = self._ultimo_dia + timedelta(days=1)
+        while dia <= ate_dia:
+            if dia.weekday() in self.dias_semana and not self.feriado(dia):
+                for inicio, fim, rotulo in self.janelas:
+                    # Janela que vira a noite termina no dia seguinte
+                    dia_fim = dia + timedelta(days=1) if fim <= inicio else dia
+                    self.inicios.append(self._local(dia, inicio))
+                    self.fins.append(self._local(dia_fim, fim) + 1)
+                    self.rotulos.append(rotulo)
+            dia += timedelta(days=1)
+        self._ultimo_dia = ate_dia
+
+    def _cobrir(self, instante, dias=0):
+        """Garante intervalos compilados do dia do instante até 'dias' depois"""
+        hoje = instante.astimezone(self.fuso).date()
+        if self._primeiro_dia is None or hoje <= self._primeiro_dia:
+            # Começa um dia antes: cobre a janela de ontem que vira a noite
+            self._primeiro_dia = hoje - timedelta(days=1)
+            self._ultimo_dia = self._primeiro_dia - timedelta(days=1)
+            self.inicios, self.fins, self.rotulos = [], [], []
+        if self._ultimo_dia < hoje + timedelta(days=dias):
+            self._compilar(hoje + timedelta(days=dias + BLOCO_DIAS))
+
+    def aberto(self, instante):
+        """(True, motivo) se o instante está numa janela; senão (False, motivo)"""
+        self._cobrir(instante)
+        minuto = _minuto(instante)
+        i = bisect_right(self.inicios, minuto) - 1
+        if i >= 0 and minuto < self.fins[i]:
+            return True, f"Dentro da janela {self.rotulos[i]}"
+
+        local = instante.astimezone(self.fuso)
+        if self.feriado(local.date()):
+            return False, f"Feriado ({local.date().isoformat()})"
+        if local.weekday() not in self.dias_semana:
+            return False, f"Dia {local.weekday()} não está na lista de dias permitidos"
+        return False, f"Fora das janelas de horário ({local.strftime('%H:%M')})"
+
+    def proxima_abertura(self, instante):
+        """Início da próxima janela depois do instante (None se não houver no horizonte)"""
+        minuto = _minuto(instante)
+        dias = 0
+        while dias <= HORIZONTE_DIAS:
+            self._cobrir(instante, dias)
+            i = bisect_right(self.inicios, minuto)
+            if i < len(self.inicios):
+                return datetime.fromtimestamp(self.inicios[i] * 60, self.fuso)
+            dias += BLOCO_DIAS
+        return None
@@ -0,0 +1,288 @@
+"""
+Avaliação em lote das condições das etapas
+As condições das sequências ('conexao_aceita', 'sem_resposta') são
+resolvidas a partir de páginas do próprio usuário carregadas uma vez por
+sessão (lista de conexões, caixa de mensagens), em vez de visitar o
+perfil ou a conversa de cada contato.
+"""
+
+import re
+import unicodedata
+from datetime import datetime, timedelta
+
+from linkedin_relogio import obter_relogio
+from linkedin_urls import IndiceAliases, id_perfil
+
+URL_CONEXOES = "https://www.linkedin.com/mynetwork/invite-connect/connections/"
+URL_MENSAGENS = "https://www.linkedin.com/messaging/"
+
+INTERVALO_ROLAGEM = 1.5
+# Rodadas seguidas sem itens novos para considerar a lista completa
+RODADAS_ESTAVEIS = 2
+
+# Coleta os links de perfil visíveis e pede mais resultados (botão ou rolagem)
+_JS_COLETAR_PERFIS = """
+const links = Array.from(document.querySelectorAll("main a[href*='/in/']"), a => a.href);
+const mais = Array.from(document.querySelectorAll("main button"))
+    .find(b => /mostrar mais|ver mais|show more|load more/i.test(b.innerText || ''));
+if (mais) { mais.click(); } else { window.scrollTo(0, document.body.scrollHeight); }
+return links;
+"""
+
+# Coleta as conversas visíveis (participante, horário, prévia) e rola a lista
+_JS_COLETAR_CONVERSAS = """
+const texto = (li, sel) => ((li.querySelector(sel) || {}).innerText || '').trim();
+const itens = Array.from(document.querySelectorAll("li.msg-conversation-listitem, li.msg-conversation-card"));
+const lista = document.querySelector(".msg-conversations-container__conversations-list");
+if (lista) { lista.scrollTop = lista.scrollHeight; }
+return itens.map(li => ({
+    perfil: (li.querySelector("a[href*='/in/']") || {}).href || null,
+    nome: texto(li, ".msg-conversation-listitem__participant-names, .msg-conversation-card__participant-names"),
+    quando: texto(li, "time, .msg-conversation-listitem__time-stamp, .msg-conversation-card__time-stamp"),
+    previa: texto(li, ".msg-conversation-card__message-snippet, .msg-conversation-listitem__message-snippet")
+}));
+"""
+
+# Prévia de mensagem enviada pelo próprio usuário
+_PREVIA_PROPRIA = re.compile(r'^\s*(voc[eê]|you)\s*:', re.IGNORECASE)
+
+_HORA = re.compile(r'^\d{1,2}:\d{2}')
+_DATA_NUMERICA = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{2,4})$')
+_ANO = re.compile(r'\b(\d{4})\b')
+_DIA = re.compile(r'\b(\d{1,2})\b')
+
+_DIAS_SEMANA = {
+    "seg": 0, "ter": 1, "qua": 2, "qui": 3, "sex": 4, "sab": 5, "dom": 6,
+    "mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6,
+}
+_MESES = {
+    "jan": 1, "fev": 2, "feb": 2, "mar": 3, "abr": 4, "apr": 4, "mai": 5, "may": 5,
+    "jun": 6, "jul": 7, "ago": 8, "aug": 8, "set": 9, "sep": 9, "out": 10, "oct": 10,
+    "nov": 11, "dez": 12, "dec": 12,
+}
+
+
+def _sem_acentos(texto):
+    return unicodedata.normalize("NFKD", texto or "").encode("ascii", "ignore").decode().lower().strip()
+
+
+def chave_nome(nome):
+    """Chave de um contato pelo nome (para conversas sem link de perfil)"""
+    nome = " ".join(_sem_acentos(nome).split())
+    return f"nome:{nome}" if nome else None
+
+
+def data_conversa(texto, hoje):
+    """
+    Converte o horário exibido na lista de conversas ('10:32', 'ontem',
+    'qua', '12 de mar', '12/03/2023'...) numa data, ou None.
+    """
+    texto = _sem_acentos(texto)
+    if not texto:
+        return None
+    if _HORA.match(texto):
+        return hoje
+    if texto.startswith(("ontem", "yesterday")):
+        return hoje - timedelta(days=1)
+
+    numerica = _DATA_NUMERICA.match(texto)
+    if numerica:
+        dia, mes, ano = (int(g) for g in numerica.groups())
+        try:
+            return datetime(ano + 2000 if ano < 100 else ano, mes, dia).date()
+        except ValueError:
+            return None
+
+    palavras = re.findall(r'[a-z]+', texto)
+    mes = next((_MESES[p[:3]] for p in palavras if p[:3] in _MESES), None)
+    dia = _DIA.search(_ANO.sub("", texto))
+    if mes and dia:
+        ano = _ANO.search(texto)
+        try:
+            data = datetime(int(ano.group(1)) if ano else hoje.year, mes, int(dia.group(1))).date()
+        except ValueError:
+            return None
+        # Sem ano na lista: uma data "no futuro" é do ano passado
+        return data.replace(year=data.year - 1) if not ano and data > hoje else data
+
+    if palavras and palavras[0][:3] in _DIAS_SEMANA:
+        atraso = (hoje.weekday() - _DIAS_SEMANA[palavras[0][:3]]) % 7 or 7
+        return hoje - timedelta(days=atraso)
+
+    return None
+
+
+class AvaliadorCondicoes:
+    """
+    Resolve as condições das etapas para todos os contatos pendentes com
+    uma carga de página por fonte. As listas ficam em memória e são
+    recarregadas quando passam da validade (modo contínuo).
+    Retorna None quando não dá para avaliar (sem navegador, erro): quem
+    chama decide o que fazer na dúvida.
+    """
+
+    def __init__(self, sessao, aliases=None, config=None, relogio=None, fuso=None):
+        config = config or {}
+        self.sessao = sessao
+        self.relogio = relogio or obter_relogio()
+        self.fuso = fuso  # Fuso da cadência: 'hoje' das datas da caixa de mensagens
+        self.aliases = aliases or IndiceAliases()
+        self.validade = config.get("validade_minutos", 60) * 60
+        self.max_rolagens = config.get("max_rolagens", 50)
+        self._listas = {}  # fonte -> (carregada_em, dados ou None)
+        self._avisadas = set()
+
+    def avaliar(self, condicao, url, contato=None):
+        """True/False se a condição vale para o contato, None se não der para saber"""
+        if condicao == "conexao_aceita":
+            conexoes = self.conexoes()
+            return None if conexoes is None else self.aliases.resolver(url) in conexoes
+
+        if condicao == "sem_resposta":
+            respostas = self.respostas()
+            if respostas is None:
+                return None
+            contato = contato or {}
+            # Chave de nome só existe para conversa sem link e com nome único (ver _carregar_respostas)
+            ultima = respostas.get(self.aliases.resolver(url)) or respostas.get(chave_nome(contato.get('nome')))
+            if ultima is None:
+                return True
+            quando, propria = ultima
+            if propria:
+                # Última mensagem é do usuário: se veio depois do último envio do bot,
+                # foi escrita à mão (em resposta ao lead) e conta como conversa em andamento
+                envio = _ultimo_envio(contato)
+                return envio is not None and quando <= envio
+            desde = _inicio_sequencia(contato)
+            return desde is not None and quando < desde
+
+        if condicao not in self._avisadas:
+            self._avisadas.add(condicao)
+            print(f"⚠️ Condição desconhecida: '{condicao}' - ignorada")
+        return None
+
+    def _lista(self, fonte, carregar):
+        """
+        Lista da fonte em memória, recarregada depois da validade. Uma carga
+        sem resultado (None) também fica guardada: numa sessão ruim cada
+        fonte custa uma carga, não uma por contato.
+        """
+        if fonte in self._listas:
+            carregada_em, dados = self._listas[fonte]
+            if self.relogio.monotonico() - carregada_em < self.validade:
+                return dados
+
+        if self.sessao.driver is None:
+            return None
+
+        dados = carregar()
+        self._listas[fonte] = (self.relogio.monotonico(), dados)
+        return dados
+
+    def conexoes(self):
+        """URLs canônicas das conexões do usuário"""
+        return self._lista("conexoes", self._carregar_conexoes)
+
+    def respostas(self):
+        """
+        (data, própria) da última mensagem por contato (URL canônica ou
+        chave_nome); 'própria' indica que a última mensagem é do usuário
+        """
+        return self._lista("mensagens", self._carregar_respostas)
+
+    def _carregar_conexoes(self):
+        print("\n🤝 Carregando lista de conexões...")
+        links = self._rolar_lista(URL_CONEXOES, "conexoes", _JS_COLETAR_PERFIS, lambda link: link)
+        if links is None:
+            return None
+
+        conexoes = {self.aliases.resolver(link) for link in links if id_perfil(link)}
+        print(f"✅ {len(conexoes)} conexão(ões) carregada(s)")
+        return conexoes
+
+    def _carregar_respostas(self):
+        print("\n💬 Carregando caixa de mensagens...")
+        conversas = self._rolar_lista(
+            URL_MENSAGENS, "mensagens", _JS_COLETAR_CONVERSAS,
+            lambda c: (c.get('perfil'), c.get('nome'), c.get('quando'), c.get('previa'))
+        )
+        if conversas is None:
+            return None
+
+        hoje = self.relogio.agora(self.fuso).date()
+
+        # Nome só identifica conversas sem link de perfil e com nome único na caixa
+        nomes = {}
+        for conversa in conversas:
+            nome = chave_nome(conversa.get('nome'))
+            nomes[nome] = nomes.get(nome, 0) + 1
+
+        respostas = {}
+        for conversa in conversas:
+            quando = data_conversa(conversa.get('quando'), hoje)
+            if quando is None:
+                continue
+
+            if id_perfil(conversa.get('perfil')):
+                chave = self.aliases.resolver(conversa['perfil'])
+            else:
+                chave = chave_nome(conversa.get('nome'))
+                if not chave or nomes[chave] > 1:
+                    continue
+            # Última mensagem do próprio usuário: pode ser do bot ou resposta manual (ver avaliar)
+            propria = bool(_PREVIA_PROPRIA.match(conversa.get('previa') or ''))
+            anterior = respostas.get(chave)
+            # Na mesma data, a mensagem recebida prevalece
+            if anterior is None or (quando, not propria) > (anterior[0], not anterior[1]):
+                respostas[chave] = (quando, propria)
+
+        recebidas = sum(1 for _, propria in respostas.values() if not propria)
+        print(f"✅ {len(conversas)} conversa(s) lida(s), {recebidas} com mensagem recebida por último")
+        return respostas
+
+    def _rolar_lista(self, url, tipo, script, chave):
+        """Abre a lista e rola até não surgirem itens novos; retorna os itens sem repetição"""
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            if self.sessao.abrir(url, tipo) != "pronto":
+                print("⚠️ Lista não carregou - condições ficam sem avaliação")
+                return None
+
+            itens = {}
+            estaveis = 0
+            for _ in range(self.max_rolagens):
+                antes = len(itens)
+                for item in self.sessao.driver.execute_script(script) or []:
+                    itens.setdefault(chave(item), item)
+
+                estaveis = estaveis + 1 if len(itens) == antes else 0
+                if estaveis >= RODADAS_ESTAVEIS:
+                    break
+                self.relogio.dormir(INTERVALO_ROLAGEM)
+            else:
+                # Lista parcial responderia "não" para quem ficou de fora
+                print(f"⚠️ Lista incompleta após {self.max_rolagens} rolagens ({len(itens)} itens) "
+                      f"- condições ficam sem avaliação")
+                return None
+
+            return list(itens.values())
+
+        except WebDriverException as e:
+            print(f"⚠️ Erro ao carregar {url}: {str(e)}")
+            return None
+
+
+def _ultimo_envio(contato):
+    """Data da última ação bem-sucedida do bot para o contato"""
+    if contato.get('ultima_acao'):
+        return datetime.fromisoformat(contato['ultima_acao']).date()
+    return None
+
+
+def _inicio_sequencia(contato):
+    """Data da primeira ação bem-sucedida da sequência do contato"""
+    for registro in contato.get('historico', []):
+        if registro.get('sucesso') and registro.get('data'):
+            return datetime.fromisoformat(registro['data']).date()
+    return None
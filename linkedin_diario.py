@@ -0,0 +1,119 @@
+"""
+Diário de ações (write-ahead)
+Antes de cada ação no navegador grava a intenção com uma chave de
+idempotência (contato, etapa, tentativa); depois grava o resultado.
+Uma intenção sem resultado indica que o processo caiu no meio da ação:
+na próxima execução ela é reconciliada (checando o perfil uma vez) em vez
+de ser repetida às cegas.
+"""
+
+import json
+import os
+import re
+
+from linkedin_relogio import obter_relogio
+
+ARQUIVO_DIARIO = "data/diario_acoes.jsonl"
+
+# Resultados mantidos no arquivo após a compactação (histórico recente)
+MANTER_RESOLVIDAS = 500
+
+_VARIAVEL = re.compile(r'\{\w+\}')
+
+
+def chave_idempotencia(url, etapa_id, tentativa):
+    """Chave única de uma tentativa de etapa para um contato"""
+    return f"{url}|{etapa_id}|{tentativa}"
+
+
+def trecho_fixo(template, tamanho=60):
+    """
+    Maior trecho do template sem variáveis, usado para reconhecer a
+    mensagem já enviada numa conversa (o texto final é personalizado).
+    """
+    # Pontuação colada nas variáveis ("{nome}, ...") fica de fora
+    partes = [p.strip(" \t\n.,;:!?-") for p in _VARIAVEL.split(template or "")]
+    maior = max(partes, key=len, default="")
+    return " ".join(maior.split())[:tamanho]
+
+
+class DiarioAcoes:
+    """Diário append-only em JSONL, com fsync a cada registro"""
+
+    def __init__(self, arquivo=ARQUIVO_DIARIO, relogio=None):
+        self.arquivo = arquivo
+        self.relogio = relogio or obter_relogio()
+
+    def _anexar(self, registro):
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        with open(self.arquivo, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _ler(self):
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                linhas = f.readlines()
+        except FileNotFoundError:
+            return []
+
+        registros = []
+        for linha in linhas:
+            try:
+                registros.append(json.loads(linha))
+            except json.JSONDecodeError:
+                # Última linha pode ter ficado pela metade numa queda
+                continue
+        return registros
+
+    def registrar_intencao(self, url, etapa_id, acao, tentativa, trecho=""):
+        """Grava a intenção antes da ação e retorna a chave de idempotência"""
+        chave = chave_idempotencia(url, etapa_id, tentativa)
+        self._anexar({
+            "evento": "intencao",
+            "chave": chave,
+            "url": url,
+            "etapa_id": etapa_id,
+            "acao": acao,
+            "tentativa": tentativa,
+            "trecho": trecho,
+            "em": self.relogio.agora().isoformat(timespec="seconds"),
+        })
+        return chave
+
+    def registrar_resultado(self, chave, sucesso, status):
+        """Grava o resultado da ação"""
+        self._anexar({
+            "evento": "resultado",
+            "chave": chave,
+            "sucesso": sucesso,
+            "status": status,
+            "em": self.relogio.agora().isoformat(timespec="seconds"),
+        })
+
+    def pendentes(self):
+        """Intenções sem resultado (ações em dúvida), na ordem em que foram gravadas"""
+        intencoes = {}
+        for registro in self._ler():
+            if registro.get("evento") == "intencao":
+                intencoes[registro["chave"]] = registro
+            elif registro.get("evento") == "resultado":
+                intencoes.pop(registro.get("chave"), None)
+        return list(intencoes.values())
+
+    def compactar(self):
+        """Reescreve o diário só com as pendências e o histórico recente"""
+        registros = self._ler()
+        if len(registros) <= 2 * MANTER_RESOLVIDAS:
+            return
+
+        abertas = {r["chave"] for r in self.pendentes()}
+        recentes = registros[-2 * MANTER_RESOLVIDAS:]
+        manter = [r for r in registros[:-2 * MANTER_RESOLVIDAS] if r.get("chave") in abertas] + recentes
+
+        temporario = self.arquivo + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            for registro in manter:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        os.replace(temporario, self.arquivo)
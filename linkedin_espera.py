@@ -0,0 +1,226 @@
+"""
+Esperas por condições de página
+Depois de navegar, espera a página ficar pronta observando o DOM
+(card do topo renderizado, barra de ações presente...) em vez de dormir
+um tempo fixo. Cada tipo de página tem seus grupos de condições.
+As esperas por elemento usam timeouts adaptativos por seletor, tirados
+do histórico de latências observadas.
+"""
+
+import json
+import os
+from bisect import bisect_left
+
+from linkedin_relogio import obter_relogio
+
+ARQUIVO_LATENCIAS = "data/cache/latencias_seletores.json"
+
+TIMEOUT_PRONTIDAO = 15
+INTERVALO_VERIFICACAO = 0.2
+
+# Limites do histograma de latência (segundos); o último balde é "acima de 20 s"
+BALDES_LATENCIA = [0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 8, 12, 20]
+
+# Tipo de página -> grupo -> seletores. Um grupo é satisfeito quando
+# QUALQUER um dos seletores aparece; a página está pronta quando todos os
+# grupos pedidos estão satisfeitos.
+CONDICOES_PAGINA = {
+    "perfil": {
+        "topo": [
+            "h1.text-heading-xlarge",
+            "div.pv-text-details__left-panel h1",
+            "section.artdeco-card h1",
+            "div.ph5 h1",
+        ],
+        "acoes": [
+            "div.pvs-profile-actions",
+            "div.pv-top-card-v2-ctas",
+            "main button[aria-label*='Conectar']",
+            "main button[aria-label*='Connect']",
+            "main button[aria-label*='Mensagem']",
+            "main button[aria-label*='Message']",
+            "main button[aria-label*='Mais ações']",
+            "main button[aria-label*='More actions']",
+        ],
+    },
+    "atividade": {
+        "conteudo": [
+            "div.feed-shared-update-v2",
+            "div[data-urn*='activity']",
+            ".occludable-update",
+            ".artdeco-empty-state",
+        ],
+    },
+    "conexoes": {
+        "lista": [
+            "li.mn-connection-card",
+            "main a[href*='/in/']",
+            ".artdeco-empty-state",
+        ],
+    },
+    "mensagens": {
+        "lista": [
+            "li.msg-conversation-listitem",
+            "li.msg-conversation-card",
+            ".msg-conversations-container__conversations-list",
+            ".artdeco-empty-state",
+        ],
+    },
+}
+
+# Páginas que nunca vão satisfazer as condições: perfil inexistente
+# ('indisponivel') ou sessão caída em login/authwall ('desvio')
+_JS_PRONTIDAO = """
+const grupos = arguments[0];
+if (document.readyState === 'loading') { return null; }
+if (/\\/(404|in\\/unavailable)/.test(location.pathname)) { return 'indisponivel'; }
+if (/\\/(authwall|login|checkpoint)/.test(location.pathname)) { return 'desvio'; }
+for (const seletores of grupos) {
+    if (!seletores.some(s => document.querySelector(s))) { return null; }
+}
+return 'pronto';
+"""
+
+
+def aguardar_pagina(driver, tipo, grupos=None, timeout=TIMEOUT_PRONTIDAO):
+    """
+    Espera a página do tipo dado ficar pronta. 'grupos' escolhe quais
+    condições exigir (padrão: todas do tipo). Retorna 'pronto',
+    'indisponivel' (perfil inexistente/404), 'desvio' (caiu em
+    login/authwall) ou 'timeout'; nunca levanta exceção.
+    """
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    condicoes = CONDICOES_PAGINA[tipo]
+    seletores = [condicoes[g] for g in (grupos or condicoes)]
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=INTERVALO_VERIFICACAO).until(
+            lambda d: d.execute_script(_JS_PRONTIDAO, seletores)
+        )
+    except WebDriverException:
+        # TimeoutException é subclasse: também cobre o estouro do prazo
+        return "timeout"
+
+
+# ============================================
+# TIMEOUTS ADAPTATIVOS POR SELETOR
+# ============================================
+
+class EsperaAdaptativa:
+    """
+    Mantém um histograma de latências de sucesso por seletor e deriva o
+    timeout de cada um de um percentil alto (com margem), entre um piso e
+    um teto. Seletor sem histórico suficiente usa o teto. Assim um seletor
+    que o LinkedIn removeu falha em ~2 s em vez de consumir o teto inteiro.
+    Cada falha recente dobra o timeout (até o teto; um sucesso desfaz uma), para que uma página
+    que ficou mais lenta volte a registrar sucessos, e o histograma é
+    reduzido à metade ao passar de 'max_amostras', esquecendo o passado.
+    """
+
+    def __init__(self, config=None, arquivo=ARQUIVO_LATENCIAS, relogio=None):
+        config = config or {}
+        self.arquivo = arquivo
+        self.relogio = relogio or obter_relogio()
+        self.percentil = config.get("percentil", 0.95)
+        self.margem = config.get("margem", 1.5)
+        self.piso = config.get("piso_segundos", 2)
+        self.teto = config.get("teto_segundos", TIMEOUT_PRONTIDAO)
+        self.min_amostras = config.get("min_amostras", 5)
+        self.max_amostras = config.get("max_amostras", 200)
+        self.historico = self._carregar()
+        self.alterado = False
+
+    def _carregar(self):
+        """Carrega os histogramas do disco"""
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                historico = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        # Descarta histogramas gravados com outra configuração de baldes
+        return {
+            seletor: registro for seletor, registro in historico.items()
+            if len(registro.get("baldes", [])) == len(BALDES_LATENCIA) + 1
+        }
+
+    def salvar(self):
+        """Salva os histogramas se houve mudança"""
+        if not self.alterado:
+            return
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        with open(self.arquivo, 'w', encoding='utf-8') as f:
+            json.dump(self.historico, f, indent=2, ensure_ascii=False)
+        self.alterado = False
+
+    def _registro(self, seletor):
+        registro = self.historico.get(seletor)
+        if registro is None:
+            registro = {"baldes": [0] * (len(BALDES_LATENCIA) + 1), "falhas": 0, "falhas_seguidas": 0}
+            self.historico[seletor] = registro
+        return registro
+
+    def registrar_sucesso(self, seletor, segundos):
+        """Conta a latência observada no balde correspondente"""
+        registro = self._registro(seletor)
+        baldes = registro["baldes"]
+        baldes[bisect_left(BALDES_LATENCIA, segundos)] += 1
+        if sum(baldes) > self.max_amostras:
+            registro["baldes"] = [quantidade // 2 for quantidade in baldes]
+        # Desfaz a folga das falhas aos poucos, enquanto o histograma aprende a nova latência
+        registro["falhas_seguidas"] = max(0, registro.get("falhas_seguidas", 0) - 1)
+        self.alterado = True
+
+    def registrar_falha(self, seletor):
+        """Conta um timeout (não entra no histograma: a latência real é desconhecida)"""
+        registro = self._registro(seletor)
+        registro["falhas"] += 1
+        registro["falhas_seguidas"] = registro.get("falhas_seguidas", 0) + 1
+        self.alterado = True
+
+    def timeout(self, seletor):
+        """Timeout em segundos para o seletor"""
+        registro = self.historico.get(seletor)
+        baldes = registro["baldes"] if registro else []
+        total = sum(baldes)
+        if total < self.min_amostras:
+            return self.teto
+
+        alvo = self.percentil * total
+        acumulado = 0
+        limite = self.teto
+        for indice, quantidade in enumerate(baldes):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                # Limite superior do balde (o balde final não tem limite)
+                limite = BALDES_LATENCIA[indice] if indice < len(BALDES_LATENCIA) else self.teto
+                break
+
+        # Falhas seguidas: a latência pode ter subido além do que o histograma conhece
+        fator = 2 ** min(registro.get("falhas_seguidas", 0), 10)
+        return min(self.teto, max(self.piso, limite * self.margem) * fator)
+
+    def aguardar(self, driver, seletor, clicavel=False):
+        """
+        Espera o elemento (presente ou clicável) com o timeout do seletor,
+        registrando a latência. Levanta NoSuchElementException se não
+        aparecer no prazo (a página carregou, o elemento é que falta).
+        """
+        from selenium.common.exceptions import NoSuchElementException, TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        condicao = EC.element_to_be_clickable if clicavel else EC.presence_of_element_located
+        prazo = self.timeout(seletor)
+        inicio = self.relogio.monotonico()
+
+        try:
+            elemento = WebDriverWait(driver, prazo).until(condicao((By.CSS_SELECTOR, seletor)))
+        except TimeoutException:
+            self.registrar_falha(seletor)
+            raise NoSuchElementException(f"'{seletor}' não apareceu em {prazo:.1f}s")
+
+        self.registrar_sucesso(seletor, self.relogio.monotonico() - inicio)
+        return elemento
@@ -0,0 +1,110 @@
+"""
+Classificação de falhas e disjuntor de ações
+Separa os erros em classes (timeout, elemento ausente, perfil
+indisponível...) e interrompe um tipo de ação quando a taxa de falhas
+estruturais numa janela deslizante passa do limite, para não queimar
+páginas e orçamento diário num fluxo que o LinkedIn quebrou.
+"""
+
+from collections import deque
+
+from linkedin_relogio import obter_relogio
+
+# Classes de erro
+TIMEOUT = "timeout"
+ELEMENTO_AUSENTE = "elemento_ausente"
+PERFIL_INDISPONIVEL = "perfil_indisponivel"
+SESSAO_EXPIRADA = "sessao_expirada"
+# Perfil sem "Conectar" (nem no menu "Mais") que não é convite pendente
+# nem conexão: problema do perfil, não do fluxo, então fica fora do disjuntor
+SEM_CONECTAR = "sem_conectar"
+OUTRO = "outro"
+
+# Nomes das exceções do Selenium por classe (comparados pelo nome para
+# não importar o selenium só para classificar)
+_EXCECOES = {
+    "TimeoutException": TIMEOUT,
+    "NoSuchElementException": ELEMENTO_AUSENTE,
+    "ElementNotInteractableException": ELEMENTO_AUSENTE,
+    "ElementClickInterceptedException": ELEMENTO_AUSENTE,
+    "StaleElementReferenceException": ELEMENTO_AUSENTE,
+}
+
+# Resultado da espera de prontidão -> classe de erro
+_PRONTIDAO = {
+    "indisponivel": PERFIL_INDISPONIVEL,
+    "desvio": SESSAO_EXPIRADA,
+}
+
+
+def classificar_erro(erro):
+    """Retorna a classe de uma exceção levantada durante uma ação"""
+    for classe in type(erro).__mro__:
+        if classe.__name__ in _EXCECOES:
+            return _EXCECOES[classe.__name__]
+    return OUTRO
+
+
+def classificar_prontidao(resultado):
+    """Classe de erro para o resultado de aguardar_pagina, ou None se a página abriu"""
+    return _PRONTIDAO.get(resultado)
+
+
+class DisjuntorFalhas:
+    """
+    Janela deslizante das últimas tentativas de cada tipo de ação
+    (convite, mensagem). Abre quando a fração de falhas de alguma classe
+    estrutural atinge o limite; depois do resfriamento volta a deixar
+    passar e a janela recomeça.
+    """
+
+    def __init__(self, config=None, relogio=None):
+        config = config or {}
+        self.relogio = relogio or obter_relogio()
+        self.ativo = config.get("ativo", True)
+        self.tamanho_janela = config.get("janela", 10)
+        self.min_amostras = config.get("min_amostras", 5)
+        self.limite_taxa = config.get("limite_taxa", 0.6)
+        self.classes = set(config.get("classes", [ELEMENTO_AUSENTE, TIMEOUT, SESSAO_EXPIRADA]))
+        self.modo = config.get("modo", "parar")  # 'parar' ou 'deteccao'
+        self.resfriamento = config.get("resfriamento_minutos", 60) * 60
+        self.janelas = {}
+        self.abertos = {}  # ação -> (aberto_ate, motivo)
+
+    def registrar(self, acao, sucesso, classe=None):
+        """Registra o resultado de uma tentativa e abre o disjuntor se preciso"""
+        if not self.ativo:
+            return
+
+        janela = self.janelas.setdefault(acao, deque(maxlen=self.tamanho_janela))
+        janela.append(None if sucesso else (classe or OUTRO))
+
+        if len(janela) < self.min_amostras:
+            return
+
+        for classe_erro in self.classes:
+            taxa = sum(1 for item in janela if item == classe_erro) / len(janela)
+            if taxa >= self.limite_taxa:
+                motivo = f"{taxa:.0%} de '{classe_erro}' nas últimas {len(janela)} tentativas"
+                self.abertos[acao] = (self.relogio.monotonico() + self.resfriamento, motivo)
+                print(f"\n🔌 Disjuntor aberto para '{acao}': {motivo}")
+                return
+
+    def aberto(self, acao):
+        """Retorna (aberto, motivo) para o tipo de ação"""
+        if acao not in self.abertos:
+            return False, ""
+
+        aberto_ate, motivo = self.abertos[acao]
+        if self.relogio.monotonico() >= aberto_ate:
+            # Resfriamento cumprido: volta a testar com a janela zerada
+            del self.abertos[acao]
+            self.janelas.pop(acao, None)
+            print(f"\n🔌 Disjuntor de '{acao}' fechado após resfriamento")
+            return False, ""
+
+        return True, motivo
+
+    def interromper_sessao(self):
+        """True se algum disjuntor está aberto e o modo é parar a sessão"""
+        return self.modo == "parar" and any(self.aberto(acao)[0] for acao in list(self.abertos))
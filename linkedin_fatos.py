@@ -0,0 +1,76 @@
+"""
+Fatos compartilhados sobre perfis
+Guarda o que um módulo já descobriu sobre um perfil (ex: tipo de contato
+detectado na extração) pela URL canônica, com a data da observação, para
+que o outro módulo reaproveite enquanto o fato estiver fresco em vez de
+abrir a página de novo.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from linkedin_relogio import obter_relogio
+from linkedin_urls import IndiceAliases
+
+ARQUIVO_FATOS = "data/cache/fatos_perfis.json"
+
+VALIDADE_PADRAO_DIAS = 14
+
+
+class FatosPerfis:
+    """URL canônica -> fato -> {"valor", "em", "fonte"}"""
+
+    def __init__(self, arquivo=ARQUIVO_FATOS, aliases=None, relogio=None):
+        self.arquivo = arquivo
+        self.relogio = relogio or obter_relogio()
+        self.aliases = aliases or IndiceAliases()
+        self.fatos = self._carregar()
+        self.alterados = {}
+
+    def _carregar(self):
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def ler(self, url, fato, validade_dias=VALIDADE_PADRAO_DIAS):
+        """Valor do fato se foi observado há menos de 'validade_dias', senão None"""
+        registro = self.fatos.get(self.aliases.resolver(url), {}).get(fato)
+        if not registro:
+            return None
+        if datetime.fromisoformat(registro['em']) < self.relogio.agora() - timedelta(days=validade_dias):
+            return None
+        return registro['valor']
+
+    def gravar(self, url, fato, valor, fonte=""):
+        """Registra uma observação (vale a partir de agora)"""
+        chave = self.aliases.resolver(url)
+        registro = {"valor": valor, "em": self.relogio.agora().isoformat(timespec="seconds"), "fonte": fonte}
+        self.fatos.setdefault(chave, {})[fato] = registro
+        self.alterados.setdefault(chave, {})[fato] = registro
+
+    def salvar(self):
+        """
+        Grava as observações novas mesclando com o arquivo atual (o bot e o
+        extrator podem ter gravado nesse meio tempo); a mais recente vence.
+        """
+        if not self.alterados:
+            return
+
+        fatos = self._carregar()
+        for chave, novos in self.alterados.items():
+            atuais = fatos.setdefault(chave, {})
+            for fato, registro in novos.items():
+                if fato not in atuais or atuais[fato]['em'] <= registro['em']:
+                    atuais[fato] = registro
+
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        temporario = self.arquivo + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(fatos, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.arquivo)
+
+        self.fatos = fatos
+        self.alterados = {}
@@ -0,0 +1,151 @@
+"""
+Fila durável de ações aprovadas (SQLite)
+O comando 'aprovar' enfileira aqui as mensagens geradas por IA e
+aprovadas para cada lead; o motor de cadência do bot consome a fila
+respeitando os mesmos limites, janelas e dias de espera das sequências,
+com a mesma sessão de navegador.
+"""
+
+import os
+import sqlite3
+
+from linkedin_relogio import obter_relogio
+
+ARQUIVO_FILA = "data/fila_acoes.db"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS acoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    numero INTEGER NOT NULL,
+    tipo_contato TEXT NOT NULL,
+    nome TEXT NOT NULL DEFAULT '',
+    texto TEXT NOT NULL,
+    origem TEXT NOT NULL DEFAULT '',
+    estado TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    ultimo_status TEXT,
+    criada_em TEXT NOT NULL,
+    atualizada_em TEXT NOT NULL,
+    UNIQUE (url, numero)
+);
+CREATE INDEX IF NOT EXISTS idx_acoes_estado ON acoes (estado, url);
+"""
+
+# Estados de uma ação
+PENDENTE = "pendente"
+CONCLUIDA = "concluida"
+CANCELADA = "cancelada"
+
+
+class FilaAcoes:
+    """
+    Uma linha por (contato, número da mensagem). O número corresponde à
+    posição da etapa na sequência do tipo de contato (1 = primeira etapa).
+    """
+
+    def __init__(self, arquivo=ARQUIVO_FILA, relogio=None):
+        self.arquivo = arquivo
+        self.relogio = relogio or obter_relogio()
+        self._conexao = None
+
+    def _agora(self):
+        return self.relogio.agora().isoformat(timespec="seconds")
+
+    def _conectar(self):
+        if self._conexao is None:
+            os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+            self._conexao = sqlite3.connect(self.arquivo)
+            self._conexao.row_factory = sqlite3.Row
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.executescript(_ESQUEMA)
+        return self._conexao
+
+    def enfileirar_lead(self, url, tipo_contato, nome, mensagens, origem=""):
+        """
+        Enfileira as mensagens aprovadas de um lead ([{"numero", "texto"}]).
+        Uma mensagem já na fila é substituída (texto regenerado, tipo
+        corrigido) e volta a pendente, a menos que já tenha sido enviada.
+        Retorna (enfileiradas, numeros_recusados).
+        """
+        conexao = self._conectar()
+        agora = self._agora()
+        enfileiradas = 0
+        recusados = []
+        with conexao:
+            for m in mensagens:
+                cursor = conexao.execute(
+                    """INSERT INTO acoes
+                       (url, numero, tipo_contato, nome, texto, origem, criada_em, atualizada_em)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (url, numero) DO UPDATE SET
+                           texto = excluded.texto, tipo_contato = excluded.tipo_contato,
+                           nome = excluded.nome, origem = excluded.origem,
+                           estado = 'pendente', ultimo_status = NULL,
+                           atualizada_em = excluded.atualizada_em
+                       WHERE estado != 'concluida'""",
+                    (url, m['numero'], tipo_contato, nome, m['texto'], origem, agora, agora)
+                )
+                if cursor.rowcount:
+                    enfileiradas += 1
+                else:
+                    recusados.append(m['numero'])
+        return enfileiradas, recusados
+
+    def contatos(self):
+        """Contatos com ações pendentes: [{"url", "nome", "tipo"}]"""
+        if not os.path.exists(self.arquivo):
+            return []
+        linhas = self._conectar().execute(
+            """SELECT url, MAX(nome) AS nome, MAX(tipo_contato) AS tipo
+               FROM acoes WHERE estado = ? GROUP BY url ORDER BY MIN(id)""",
+            (PENDENTE,)
+        ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def texto(self, url, numero):
+        """Texto aprovado pendente para a etapa do contato, ou None"""
+        if not os.path.exists(self.arquivo):
+            return None
+        linha = self._conectar().execute(
+            "SELECT texto FROM acoes WHERE url = ? AND numero = ? AND estado = ?",
+            (url, numero, PENDENTE)
+        ).fetchone()
+        return linha['texto'] if linha else None
+
+    def concluir(self, url, numero, sucesso, status):
+        """Registra a tentativa; com sucesso a ação sai da fila"""
+        conexao = self._conectar()
+        with conexao:
+            conexao.execute(
+                """UPDATE acoes SET estado = ?, tentativas = tentativas + 1,
+                   ultimo_status = ?, atualizada_em = ?
+                   WHERE url = ? AND numero = ? AND estado = ?""",
+                (CONCLUIDA if sucesso else PENDENTE, status, self._agora(), url, numero, PENDENTE)
+            )
+
+    def cancelar_contato(self, url, motivo):
+        """Cancela as ações pendentes do contato (ex: contato descartado)"""
+        if not os.path.exists(self.arquivo):
+            return
+        conexao = self._conectar()
+        with conexao:
+            conexao.execute(
+                """UPDATE acoes SET estado = ?, ultimo_status = ?, atualizada_em = ?
+                   WHERE url = ? AND estado = ?""",
+                (CANCELADA, motivo, self._agora(), url, PENDENTE)
+            )
+
+    def resumo(self):
+        """Quantidade de ações por estado"""
+        if not os.path.exists(self.arquivo):
+            return {}
+        linhas = self._conectar().execute(
+            "SELECT estado, COUNT(*) AS total FROM acoes GROUP BY estado"
+        ).fetchall()
+        return {linha['estado']: linha['total'] for linha in linhas}
+
+    def fechar(self):
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
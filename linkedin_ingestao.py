@@ -0,0 +1,245 @@
+"""
+Ingestão de listas de URLs (CSV, JSONL ou texto simples)
+Lê o arquivo em blocos, mantém só as colunas usadas pelos templates,
+internaliza valores repetidos (empresa, cidade...) e guarda um snapshot
+binário indexado pelo hash do arquivo, para que reinícios não precisem
+reprocessar a lista. As linhas são geradas sob demanda; só quem precisa
+da lista inteira (carregar_registros) a materializa.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+from operator import itemgetter
+
+from linkedin_urls import url_canonica
+
+PASTA_CACHE = "data/cache"
+ARQUIVO_INDICE_CACHE = "data/cache/indice_snapshots.json"
+
+VERSAO_SNAPSHOT = 2
+TAMANHO_BLOCO = 5000
+
+# Colunas sempre mantidas, além das usadas nos templates
+COLUNAS_BASE = ("url", "nome")
+
+_VARIAVEL_TEMPLATE = re.compile(r'\{(\w+)\}')
+
+
+def colunas_dos_templates(config):
+    """
+    Retorna as colunas referenciadas como {variavel} nos templates da
+    cadência, mais a coluna de score usada pela agenda de prioridade.
+    """
+    colunas = list(COLUNAS_BASE)
+
+    for chave, sequencia in config.items():
+        if not chave.startswith('sequencia') or not isinstance(sequencia, dict):
+            continue
+        for etapa in sequencia.get('etapas', []):
+            try:
+                with open(etapa['template'], 'r', encoding='utf-8') as f:
+                    texto = f.read()
+            except (KeyError, FileNotFoundError):
+                continue
+            for variavel in _VARIAVEL_TEMPLATE.findall(texto):
+                if variavel not in colunas:
+                    colunas.append(variavel)
+
+    campo_score = config.get('prioridade', {}).get('campo_score')
+    if campo_score and campo_score not in colunas:
+        colunas.append(campo_score)
+
+    return colunas
+
+
+def _valor(valor):
+    """Normaliza um valor lido: texto internalizado, vazio para ausente"""
+    if valor is None:
+        return ""
+    if not isinstance(valor, str):
+        valor = str(valor)
+    return sys.intern(valor.strip())
+
+
+def _linhas_csv(leitor, cabecalho, colunas):
+    """Projeta cada registro do CSV nas colunas pedidas (ausentes viram vazio)"""
+    largura = len(cabecalho)
+    # Colunas ausentes apontam para uma célula vazia extra no fim do registro
+    posicoes = [cabecalho.index(c) if c in cabecalho else largura for c in colunas]
+    pegar = itemgetter(*posicoes)
+    preenchimento = [""] * (largura + 1)
+    internar = sys.intern
+
+    for registro in leitor:
+        if len(registro) != largura:
+            registro = (registro + preenchimento)[:largura]
+        registro.append("")
+        valores = pegar(registro)
+        if len(posicoes) == 1:
+            valores = (valores,)
+        yield tuple([internar(v.strip()) for v in valores])
+
+
+def ler_blocos(arquivo, colunas, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Gera blocos de linhas (tuplas na ordem de 'colunas') sem carregar
+    o arquivo inteiro. A URL já sai canônica; linhas sem URL são ignoradas.
+    """
+    indice_url = colunas.index("url")
+    bloco = []
+
+    with open(arquivo, 'r', encoding='utf-8-sig', newline='') as f:
+        if arquivo.endswith('.csv'):
+            leitor = csv.reader(f)
+            cabecalho = [c.strip() for c in next(leitor, [])]
+            linhas = _linhas_csv(leitor, cabecalho, colunas)
+        elif arquivo.endswith('.jsonl'):
+            linhas = (
+                tuple(_valor(registro.get(c)) for c in colunas)
+                for registro in (json.loads(linha) for linha in f if linha.strip())
+            )
+        else:
+            linhas = (
+                tuple(linha.strip() if c == "url" else "" for c in colunas)
+                for linha in f if linha.strip()
+            )
+
+        for linha in linhas:
+            if not linha[indice_url]:
+                continue
+            linha = linha[:indice_url] + (url_canonica(linha[indice_url]),) + linha[indice_url + 1:]
+            bloco.append(linha)
+            if len(bloco) >= tamanho_bloco:
+                yield bloco
+                bloco = []
+
+    if bloco:
+        yield bloco
+
+
+def hash_arquivo(arquivo):
+    """Hash do conteúdo do arquivo, reaproveitado enquanto tamanho e mtime não mudam"""
+    info = os.stat(arquivo)
+    assinatura = [info.st_size, info.st_mtime_ns]
+
+    indice = _carregar_indice()
+    registro = indice.get(os.path.abspath(arquivo))
+    if registro and registro['assinatura'] == assinatura:
+        return registro['hash']
+
+    sha = hashlib.sha256()
+    with open(arquivo, 'rb') as f:
+        for pedaco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(pedaco)
+
+    indice[os.path.abspath(arquivo)] = {"assinatura": assinatura, "hash": sha.hexdigest()}
+    _salvar_indice(indice)
+    return sha.hexdigest()
+
+
+def _carregar_indice():
+    try:
+        with open(ARQUIVO_INDICE_CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _salvar_indice(indice):
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    with open(ARQUIVO_INDICE_CACHE, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, indent=2)
+
+
+def _caminho_snapshot(hash_fonte, colunas):
+    chave = hashlib.sha256(f"{VERSAO_SNAPSHOT}|{hash_fonte}|{','.join(colunas)}".encode()).hexdigest()[:24]
+    return os.path.join(PASTA_CACHE, f"urls_{chave}.pickle")
+
+
+def _ler_snapshot(arquivo):
+    """Gera as linhas do snapshot bloco a bloco"""
+    with open(arquivo, 'rb') as f:
+        pickle.load(f)  # Cabeçalho
+        while True:
+            try:
+                bloco = pickle.load(f)
+            except EOFError:
+                return
+            yield from bloco
+
+
+def _ler_gravando_snapshot(arquivo, colunas, snapshot):
+    """
+    Gera as linhas do arquivo fonte enquanto grava o snapshot bloco a
+    bloco; o snapshot só passa a valer se a leitura chegar ao fim.
+    """
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    temporario = snapshot + ".tmp"
+    completo = False
+    try:
+        with open(temporario, 'wb') as f:
+            pickle.dump({"colunas": colunas}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            for bloco in ler_blocos(arquivo, colunas):
+                pickle.dump(bloco, f, protocol=pickle.HIGHEST_PROTOCOL)
+                yield from bloco
+        os.replace(temporario, snapshot)
+        completo = True
+    finally:
+        if not completo and os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def carregar_linhas(arquivo, colunas):
+    """
+    Retorna (colunas, linhas), com as linhas geradas sob demanda: do
+    snapshot binário quando o conteúdo não mudou desde o último
+    carregamento, ou do arquivo fonte (gravando o snapshot) quando mudou.
+    """
+    colunas = list(dict.fromkeys(["url"] + list(colunas)))
+    snapshot = _caminho_snapshot(hash_arquivo(arquivo), colunas)
+
+    try:
+        with open(snapshot, 'rb') as f:
+            if pickle.load(f).get('colunas') == colunas:
+                return colunas, _ler_snapshot(snapshot)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, AttributeError):
+        pass
+
+    return colunas, _ler_gravando_snapshot(arquivo, colunas, snapshot)
+
+
+def iterar_registros(arquivo, colunas, aliases=None, contagem=None):
+    """
+    Gera a lista registro a registro: dicts só com as colunas pedidas,
+    URLs resolvidas pelo índice de aliases e sem perfis duplicados
+    (primeira ocorrência vence). Os duplicados ignorados são somados
+    em contagem['duplicados'], se 'contagem' for passado.
+    """
+    colunas, linhas = carregar_linhas(arquivo, colunas)
+
+    vistos = set()
+    for linha in linhas:
+        registro = dict(zip(colunas, linha))
+        if aliases is not None:
+            registro['url'] = aliases.seguir(registro['url'])
+        if registro['url'] in vistos:
+            if contagem is not None:
+                contagem['duplicados'] = contagem.get('duplicados', 0) + 1
+            continue
+        vistos.add(registro['url'])
+        yield registro
+
+
+def carregar_registros(arquivo, colunas, aliases=None):
+    """
+    Materializa iterar_registros() numa lista, para quem percorre os
+    registros mais de uma vez. Retorna (registros, duplicados).
+    """
+    contagem = {"duplicados": 0}
+    registros = list(iterar_registros(arquivo, colunas, aliases, contagem))
+    return registros, contagem['duplicados']
@@ -11,135 +11,242 @@ Fluxo:
 """
 
 import time
-import random
 import json
 import os
 import re
-from datetime import datetime
+import hashlib
+import unicodedata
 from pathlib import Path
-import pytz
-import pandas as pd
-from dotenv import load_dotenv
-import anthropic
-
-load_dotenv()
-
-# API do Claude para geração de mensagens
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
-
-# Selenium para extração de dados e envio
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+# Selenium (extração) e anthropic (geração) são importados dentro dos
+# comandos que os usam; 'status' e 'classificar' não pagam esse custo.
+
+from linkedin_urls import IndiceAliases, id_perfil
+from linkedin_navegador import obter_sessao
+from linkedin_seletores import obter_registro_seletores
+from linkedin_fila import FilaAcoes
+from linkedin_fatos import FatosPerfis
+from linkedin_ingestao import iterar_registros, COLUNAS_BASE
+from linkedin_relogio import obter_relogio
 
 # ============================================
 # CONFIGURAÇÕES
 # ============================================
 
-EMAIL = os.getenv("LINKEDIN_EMAIL", "")
-SENHA = os.getenv("LINKEDIN_SENHA", "")
+# Preenchidas por carregar_ambiente()
+EMAIL = ""
+SENHA = ""
+ANTHROPIC_API_KEY = ""
+_ambiente_carregado = False
 
 ARQUIVO_URLS = "config/urls.csv"
 ARQUIVO_CADENCIA = "config/cadencia.json"
+ARQUIVO_AREAS = "config/areas.json"
 PASTA_LEADS = "leads"
 ARQUIVO_LEADS_JSON = "leads/leads_data.json"
+# Subpastas de PASTA_LEADS para onde 'aprovar' (e versões anteriores) movem os .md
+SUBPASTAS_LEAD = ("enfileirados", "enviados")
 
 TIMEOUT = 15
 
+
+def carregar_ambiente():
+    """Carrega credenciais e chave da API do .env (uma única vez, só quando necessárias)"""
+    global EMAIL, SENHA, ANTHROPIC_API_KEY, _ambiente_carregado
+    if _ambiente_carregado:
+        return
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    EMAIL = os.getenv("LINKEDIN_EMAIL", "")
+    SENHA = os.getenv("LINKEDIN_SENHA", "")
+    ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+    _ambiente_carregado = True
+
+# Campos cuja mudança exige regenerar as mensagens do lead
+CAMPOS_MATERIAIS = ["nome", "cargo", "empresa", "localizacao", "tipo", "sobre", "publicacoes"]
+
+# ============================================
+# CLASSIFICADOR DE ÁREAS
+# ============================================
+
+# Taxonomia usada quando config/areas.json não existe
+AREAS_PADRAO = {
+    "sustentabilidade": {"sustentabilidade": 1.0, "esg": 1.0, "ambiental": 1.0, "meio ambiente": 1.0, "green": 0.8, "carbono": 1.0, "sustainability": 1.0},
+    "engenharia": {"engenheir*": 1.0, "engenharia": 1.0, "engineer*": 1.0, "tecnic*": 0.6},
+    "construção": {"construcao": 1.0, "obra*": 1.0, "construction": 1.0, "building": 0.8, "incorporacao": 1.0, "incorporador*": 1.0},
+    "inovação": {"inovacao": 1.0, "innovation": 1.0, "p&d": 1.0, "r&d": 1.0, "pesquisa": 0.8, "research": 0.8},
+    "tecnologia": {"tecnologia": 1.0, "tech": 0.8, "ti": 1.0, "it": 0.6, "software": 1.0, "developer": 1.0, "dados": 0.8, "data": 0.8},
+    "comercial": {"comercial": 1.0, "vendas": 1.0, "sales": 1.0, "business development": 1.0, "negocios": 0.8},
+    "marketing": {"marketing": 1.0, "comunicacao": 1.0, "branding": 1.0, "digital": 0.5},
+    "operações": {"operacoes": 1.0, "operations": 1.0, "supply chain": 1.0, "logistica": 1.0},
+    "financeiro": {"financeir*": 1.0, "finance": 1.0, "controller": 1.0, "contabil": 1.0, "cfo": 1.0},
+    "gestão": {"diretor*": 0.5, "gerente": 0.5, "coordenador*": 0.5, "manager": 0.5, "head": 0.5, "lider": 0.5, "ceo": 0.5, "coo": 0.5, "cto": 0.5},
+}
+
+
+# Variantes acentuadas aceitas para cada letra das palavras-chave
+_VARIANTES_ACENTO = {
+    "a": "aàáâãä", "e": "eèéêë", "i": "iìíîï", "o": "oòóôõö",
+    "u": "uùúûü", "c": "cç", "n": "nñ",
+}
+
+def _remover_acentos(texto):
+    """Normaliza texto para comparação: minúsculas e sem acentos"""
+    texto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+
+class ClassificadorAreas:
+    """
+    Classifica cargos em áreas usando uma taxonomia configurável.
+    As palavras-chave são compiladas numa única regex em forma de trie
+    (prefixos comuns fatorados), com limites de palavra: 'ti' não casa
+    dentro de 'gestionar'. Cada letra aceita suas variantes acentuadas,
+    então o texto só precisa de lower(). Cada palavra termina num grupo
+    vazio cujo índice leva às áreas e pesos daquela palavra.
+    """
+
+    def __init__(self, taxonomia):
+        self.areas = list(taxonomia.keys())
+        self.ordem = {area: i for i, area in enumerate(self.areas)}
+
+        # Trie: cada nó é {caractere: nó}; a chave '' guarda os terminais
+        trie = {}
+        for area, palavras in taxonomia.items():
+            for palavra, peso in palavras.items():
+                palavra = _remover_acentos(palavra.strip())
+                curinga = palavra.endswith('*')
+                no = trie
+                for caractere in palavra.rstrip('*'):
+                    no = no.setdefault(caractere, {})
+                no.setdefault('', {}).setdefault(curinga, []).append((area, float(peso)))
+
+        self.grupos = [None]
+        padrao = self._compilar_no(trie) if trie else ''
+        self.regex = re.compile(r'(?<!\w)' + padrao + r'(?!\w)') if padrao else None
+
+    def _compilar_no(self, no):
+        """Converte um nó da trie em regex; filhos antes dos terminais (mais longo primeiro)"""
+        alternativas = []
+        for caractere in sorted(k for k in no if k):
+            variantes = _VARIANTES_ACENTO.get(caractere)
+            letra = f"[{variantes}]" if variantes else re.escape(caractere)
+            alternativas.append(letra + self._compilar_no(no[caractere]))
+
+        for curinga, areas in sorted(no.get('', {}).items(), reverse=True):
+            self.grupos.append(areas)
+            alternativas.append((r'\w*' if curinga else '') + '()')
+
+        if len(alternativas) == 1:
+            return alternativas[0]
+        return '(?:' + '|'.join(alternativas) + ')'
+
+    @classmethod
+    def carregar(cls, arquivo=ARQUIVO_AREAS):
+        """Carrega a taxonomia do arquivo (ou a padrão, se não existir)"""
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                return cls(json.load(f).get('areas', {}))
+        except FileNotFoundError:
+            return cls(AREAS_PADRAO)
+
+    def pontuar(self, texto):
+        """Retorna {área: pontuação} somando os pesos das palavras encontradas"""
+        pontuacao = {}
+        if not texto or self.regex is None:
+            return pontuacao
+
+        grupos = self.grupos
+        for match in self.regex.finditer(texto.lower()):
+            for area, peso in grupos[match.lastindex]:
+                pontuacao[area] = pontuacao.get(area, 0.0) + peso
+
+        return pontuacao
+
+    def area_principal(self, pontuacao):
+        """Área de maior pontuação; em empate vence a primeira da taxonomia"""
+        if not pontuacao:
+            return ""
+        if len(pontuacao) == 1:
+            return next(iter(pontuacao))
+        return min(pontuacao, key=lambda area: (-pontuacao[area], self.ordem[area]))
+
+    def classificar(self, texto):
+        """Retorna (área principal, pontuações) para um texto"""
+        pontuacao = self.pontuar(texto)
+        return self.area_principal(pontuacao), pontuacao
+
+    def classificar_lote(self, leads, campo='cargo'):
+        """
+        Reclassifica uma lista de leads no lugar.
+        Retorna quantos leads tiveram a área principal alterada.
+        """
+        alterados = 0
+        cache = {}  # cargos se repetem muito numa base grande
+        for lead in leads:
+            texto = lead.get(campo) or ''
+            if texto not in cache:
+                cache[texto] = self.classificar(texto)
+            area, pontuacao = cache[texto]
+            if lead.get('area', '') != area:
+                alterados += 1
+            lead['area'] = area
+            lead['areas'] = dict(pontuacao)
+        return alterados
+
+
+_classificador_cache = {}
+
+def obter_classificador(arquivo=ARQUIVO_AREAS):
+    """Retorna o classificador compilado, recompilando só se a taxonomia mudar"""
+    try:
+        versao = os.path.getmtime(arquivo)
+    except OSError:
+        versao = None
+
+    cache = _classificador_cache.get(arquivo)
+    if cache is None or cache[0] != versao:
+        cache = (versao, ClassificadorAreas.carregar(arquivo))
+        _classificador_cache[arquivo] = cache
+
+    return cache[1]
+
+
 # ============================================
 # EXTRATOR DE DADOS DO PERFIL (usando Selenium)
 # ============================================
 
 class LinkedInExtractor:
-    def __init__(self):
+    def __init__(self, sessao=None, relogio=None):
         self.driver = None
         self.wait = None
         self.leads_data = {}
+        self.aliases = IndiceAliases()
+        self.sessao = sessao or obter_sessao()
+        self.relogio = relogio or obter_relogio()
+        self.seletores = obter_registro_seletores()
+        self.fatos = FatosPerfis(aliases=self.aliases, relogio=self.relogio)
 
     def inicializar(self):
-        """Inicializa o navegador Chrome"""
+        """Inicializa (ou reaproveita) o navegador da sessão compartilhada"""
+        from selenium.webdriver.support.ui import WebDriverWait
+
         print("🚀 Iniciando navegador...")
 
         try:
-            chrome_options = Options()
-
-            # Usa um perfil dedicado para o bot (não conflita com Chrome aberto)
-            perfil_bot = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chrome_profile")
-            os.makedirs(perfil_bot, exist_ok=True)
-            chrome_options.add_argument(f"--user-data-dir={perfil_bot}")
-
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--disable-notifications")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self.driver = self.sessao.iniciar()
             self.wait = WebDriverWait(self.driver, TIMEOUT)
-
             print("✅ Navegador iniciado!")
 
-            # Verifica se está logado
-            self.driver.get("https://www.linkedin.com/feed/")
-            time.sleep(3)
-
-            if "login" in self.driver.current_url or "checkpoint" in self.driver.current_url:
-                print("⚠️ Não está logado. Fazendo login...")
-                return self._fazer_login()
-
-            print("✅ Sessão do LinkedIn ativa!")
-            return True
+            carregar_ambiente()
+            return self.sessao.garantir_login(EMAIL, SENHA)
 
         except Exception as e:
             print(f"❌ Erro ao iniciar navegador: {str(e)}")
             return False
 
-    def _fazer_login(self):
-        """Faz login no LinkedIn"""
-        try:
-            self.driver.get("https://www.linkedin.com/login")
-            time.sleep(2)
-
-            # Preenche email
-            email_field = self.wait.until(EC.presence_of_element_located((By.ID, "username")))
-            email_field.clear()
-            email_field.send_keys(EMAIL)
-
-            # Preenche senha
-            senha_field = self.driver.find_element(By.ID, "password")
-            senha_field.clear()
-            senha_field.send_keys(SENHA)
-
-            # Clica em entrar
-            login_btn = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            login_btn.click()
-
-            time.sleep(5)
-
-            # Verifica se login foi bem sucedido
-            if "feed" in self.driver.current_url:
-                print("✅ Login realizado com sucesso!")
-                return True
-            elif "checkpoint" in self.driver.current_url:
-                print("⚠️ LinkedIn pediu verificação de segurança.")
-                print("   Complete a verificação manualmente no navegador...")
-                input("   Pressione ENTER quando terminar...")
-                return "feed" in self.driver.current_url
-            else:
-                print(f"❌ Login falhou. URL atual: {self.driver.current_url}")
-                return False
-
-        except Exception as e:
-            print(f"❌ Erro no login: {str(e)}")
-            return False
-
     def extrair_dados_perfil(self, url):
         """Extrai nome, cargo e empresa do perfil via Selenium"""
         dados = {
@@ -148,19 +255,23 @@ class LinkedInExtractor:
             "cargo": "",
             "empresa": "",
             "area": "",
+            "areas": {},
             "tipo": None,
             "localizacao": "",
             "sobre": "",
-            "publicacoes": [],
-            "extraido_em": datetime.now().isoformat()
+            "publicacoes": None,  # Adiadas: buscadas só para leads aprovados (ver buscar_publicacoes)
+            "extraido_em": self.relogio.agora().isoformat()
         }
 
         try:
             print(f"\n🔍 Extraindo: {url}")
 
             # Navega para o perfil
-            self.driver.get(url)
-            time.sleep(random.uniform(3, 5))
+            self.sessao.abrir(url, "perfil", ["topo"])
+
+            # Registra redirecionamentos (ex: URL com ID interno -> slug público)
+            self.aliases.registrar(url, self.driver.current_url)
+            dados["url"] = self.aliases.resolver(url)
 
             # Extrai nome
             dados["nome"] = self._extrair_nome()
@@ -168,11 +279,12 @@ class LinkedInExtractor:
             # Extrai cargo e empresa da headline ou experiência
             dados["cargo"], dados["empresa"] = self._extrair_cargo_empresa()
 
-            # Infere área de atuação
-            dados["area"] = self._inferir_area(dados["cargo"])
+            # Infere área de atuação (principal + pontuação por área)
+            dados["area"], dados["areas"] = obter_classificador().classificar(dados["cargo"])
 
             # Detecta tipo (conexão existente vs novo contato)
             dados["tipo"] = self._detectar_tipo()
+            self.fatos.gravar(dados["url"], "tipo", dados["tipo"], "extracao")
 
             # Extrai localização
             dados["localizacao"] = self._extrair_localizacao()
@@ -180,8 +292,8 @@ class LinkedInExtractor:
             # Extrai seção "Sobre"
             dados["sobre"] = self._extrair_sobre()
 
-            # Extrai últimas publicações
-            dados["publicacoes"] = self._extrair_publicacoes()
+            # Hash por campo para detectar mudanças na próxima extração
+            dados["hashes"] = calcular_hashes(dados)
 
             # Mostra resultados
             print(f"   👤 Nome: {dados['nome'] or '(não encontrado)'}")
@@ -190,7 +302,7 @@ class LinkedInExtractor:
             print(f"   📋 Área: {dados['area'] or '(não identificada)'}")
             print(f"   📍 Local: {dados['localizacao'] or '(não encontrado)'}")
             print(f"   🏷️  Tipo: {'Conexão existente' if dados['tipo'] == 'conexao_existente' else 'Novo contato'}")
-            print(f"   📝 Publicações: {len(dados['publicacoes'])} encontradas")
+            print("   📝 Publicações: adiadas (buscadas após a aprovação dos dados)")
 
             return dados
 
@@ -200,26 +312,12 @@ class LinkedInExtractor:
 
     def _extrair_nome(self):
         """Extrai o nome do perfil com múltiplos seletores"""
-        seletores_nome = [
-            # Seletores mais específicos primeiro
-            "h1.text-heading-xlarge",
-            "h1.inline.t-24.v-align-middle.break-words",
-            "h1[class*='text-heading']",
-            "div.pv-text-details__left-panel h1",
-            "div.ph5 h1",
-            ".pv-top-card--list h1",
-            # Seletores genéricos
-            "h1",
-        ]
-
-        for seletor in seletores_nome:
-            try:
-                elemento = self.driver.find_element(By.CSS_SELECTOR, seletor)
-                nome = elemento.text.strip()
-                if nome and len(nome) > 1 and not nome.startswith("LinkedIn"):
-                    return nome
-            except:
-                continue
+        nome = self.seletores.buscar_texto(
+            self.driver, "nome",
+            lambda texto: len(texto) > 1 and not texto.startswith("LinkedIn")
+        )
+        if nome:
+            return nome
 
         # Fallback: extrai do título da página
         try:
@@ -246,6 +344,8 @@ class LinkedInExtractor:
 
     def _extrair_cargo_empresa(self):
         """Extrai cargo e empresa do perfil"""
+        from selenium.webdriver.common.by import By
+
         cargo = ""
         empresa = ""
 
@@ -284,7 +384,7 @@ class LinkedInExtractor:
                 exp_section = self.driver.find_elements(By.CSS_SELECTOR, "#experience")
                 if exp_section:
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", exp_section[0])
-                    time.sleep(1)
+                    self.relogio.dormir(1)
 
                 primeira_exp = self.driver.find_elements(By.CSS_SELECTOR,
                     "#experience ~ div li.artdeco-list__item:first-child")
@@ -316,22 +416,7 @@ class LinkedInExtractor:
         # SEGUNDO: Busca CARGO da headline
         # =====================================================
 
-        seletores_headline = [
-            "div.text-body-medium.break-words",
-            "div[class*='text-body-medium']",
-            ".pv-top-card--list .text-body-medium",
-            "div.ph5 div.text-body-medium",
-        ]
-
-        headline = ""
-        for seletor in seletores_headline:
-            try:
-                elemento = self.driver.find_element(By.CSS_SELECTOR, seletor)
-                headline = elemento.text.strip()
-                if headline:
-                    break
-            except:
-                continue
+        headline = self.seletores.buscar_texto(self.driver, "headline")
 
         if headline:
             # Se headline tem muitos "|" (lista de skills), pega só o primeiro
@@ -394,6 +479,8 @@ class LinkedInExtractor:
 
     def _detectar_tipo(self):
         """Detecta se é conexão existente (1º grau) ou novo contato"""
+        from selenium.webdriver.common.by import By
+
         try:
             page_source = self.driver.page_source.lower()
 
@@ -451,115 +538,59 @@ class LinkedInExtractor:
             print(f"   ⚠️ Erro ao detectar tipo: {str(e)}")
             return "novo"
 
-    def _inferir_area(self, cargo):
-        """Infere a área de atuação baseado no cargo"""
-        if not cargo:
-            return ""
-
-        cargo_lower = cargo.lower()
-
-        # Mapeamento de palavras-chave para áreas
-        areas_map = {
-            "sustentabilidade": ["sustentabilidade", "esg", "ambiental", "meio ambiente", "green", "carbono", "sustainability"],
-            "engenharia": ["engenheiro", "engenharia", "engineer", "engineering", "técnico"],
-            "construção": ["construção", "obra", "construction", "building", "incorporação", "incorporador"],
-            "inovação": ["inovação", "innovation", "p&d", "r&d", "pesquisa", "research"],
-            "tecnologia": ["tecnologia", "tech", "ti", "it", "software", "developer", "dados", "data"],
-            "comercial": ["comercial", "vendas", "sales", "business development", "negócios"],
-            "marketing": ["marketing", "comunicação", "branding", "digital"],
-            "operações": ["operações", "operations", "supply chain", "logística"],
-            "financeiro": ["financeiro", "finance", "controller", "contábil", "cfo"],
-            "gestão": ["diretor", "gerente", "coordenador", "manager", "head", "líder", "ceo", "coo", "cto"]
-        }
-
-        for area, palavras in areas_map.items():
-            for palavra in palavras:
-                if palavra in cargo_lower:
-                    return area
-
-        return ""
-
     def _extrair_localizacao(self):
         """Extrai a localização do perfil"""
-        seletores = [
-            "span.text-body-small.inline.t-black--light.break-words",
-            ".pv-text-details__left-panel span.text-body-small",
-            "div.ph5 span.text-body-small",
-        ]
+        def parece_localizacao(texto):
+            # Localização geralmente tem vírgula (Cidade, Estado) ou é curta,
+            # e não é contagem de seguidores/conexões
+            return 2 < len(texto) < 100 and not any(
+                x in texto.lower() for x in ['seguidores', 'conexões', 'followers', 'connections']
+            )
 
-        for seletor in seletores:
-            try:
-                elementos = self.driver.find_elements(By.CSS_SELECTOR, seletor)
-                for elem in elementos:
-                    texto = elem.text.strip()
-                    # Localização geralmente tem vírgula (Cidade, Estado) ou é curta
-                    if texto and len(texto) > 2 and len(texto) < 100:
-                        # Ignora textos que são claramente não-localização
-                        if not any(x in texto.lower() for x in ['seguidores', 'conexões', 'followers', 'connections']):
-                            return texto
-            except:
-                continue
-        return ""
+        return self.seletores.buscar_texto(self.driver, "localizacao", parece_localizacao, todos=True)
 
     def _extrair_sobre(self):
         """Extrai a seção 'Sobre' do perfil"""
+        from selenium.webdriver.common.by import By
+
         try:
             # Rola até a seção Sobre
             sobre_section = self.driver.find_elements(By.CSS_SELECTOR, "#about")
             if sobre_section:
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", sobre_section[0])
-                time.sleep(1)
-
-            # Tenta diferentes seletores para o texto do Sobre
-            seletores = [
-                "#about + div + div span[aria-hidden='true']",
-                "#about ~ div .inline-show-more-text span",
-                "#about ~ div .pv-shared-text-with-see-more span",
-                "section.pv-about-section div.pv-shared-text-with-see-more span",
-            ]
+                self.relogio.dormir(1)
 
-            for seletor in seletores:
-                try:
-                    elementos = self.driver.find_elements(By.CSS_SELECTOR, seletor)
-                    for elem in elementos:
-                        texto = elem.text.strip()
-                        if texto and len(texto) > 50:  # Sobre geralmente é mais longo
-                            return texto[:1000]  # Limita a 1000 caracteres
-                except:
-                    continue
+            # Sobre geralmente é mais longo; limita a 1000 caracteres
+            texto = self.seletores.buscar_texto(
+                self.driver, "sobre", lambda texto: len(texto) > 50, todos=True
+            )
+            return texto[:1000]
 
         except:
             pass
         return ""
 
-    def _extrair_publicacoes(self):
-        """Extrai as últimas publicações do perfil"""
+    def buscar_publicacoes(self, url):
+        """
+        Extrai as últimas publicações de um perfil (campo adiado: só é
+        chamado para leads aprovados, numa passada separada da extração).
+        """
+        from selenium.webdriver.common.by import By
+
         publicacoes = []
 
         try:
-            # Navega para a página de atividades/posts do perfil
-            url_atual = self.driver.current_url.rstrip('/')
-            url_posts = f"{url_atual}/recent-activity/all/"
+            # Vai direto para a página de atividades/posts do perfil
+            url_posts = f"{self.aliases.resolver(url).rstrip('/')}/recent-activity/all/"
 
-            self.driver.get(url_posts)
-            time.sleep(random.uniform(2, 4))
+            self.sessao.abrir(url_posts, "atividade")
 
             # Rola um pouco para carregar posts
             self.driver.execute_script("window.scrollTo(0, 800);")
-            time.sleep(2)
+            self.relogio.dormir(2)
 
             # Busca os posts
-            seletores_post = [
-                "div.feed-shared-update-v2",
-                "div[data-urn*='activity']",
-                ".occludable-update",
-            ]
-
-            posts_elements = []
-            for seletor in seletores_post:
-                posts_elements = self.driver.find_elements(By.CSS_SELECTOR, seletor)
-                if posts_elements:
-                    break
+            posts_elements = self.seletores.buscar_elementos(self.driver, "publicacoes")
 
             # Extrai até 3 publicações
             for i, post in enumerate(posts_elements[:3]):
@@ -594,20 +625,19 @@ class LinkedInExtractor:
                 except Exception as e:
                     continue
 
-            # Volta para o perfil principal
-            self.driver.get(url_atual)
-            time.sleep(1)
-
         except Exception as e:
+            # Continua adiada: tenta de novo na próxima passada
             print(f"   ⚠️ Erro ao extrair publicações: {str(e)}")
+            return None
 
         return publicacoes
 
     def fechar(self):
-        """Fecha o navegador"""
-        if self.driver:
-            self.driver.quit()
-        print("\n👋 Navegador fechado")
+        """Libera o navegador da sessão"""
+        self.seletores.salvar()
+        self.fatos.salvar()
+        self.sessao.fechar()
+        self.driver = None
 
 
 # ============================================
@@ -627,13 +657,14 @@ class LeadMarkdownGenerator:
             print(f"❌ Arquivo de cadência não encontrado: {ARQUIVO_CADENCIA}")
             return {}
 
-    def gerar_arquivo_lead(self, dados):
-        """Gera arquivo .md com dados brutos do lead (sem mensagens ainda)"""
+    def caminho_arquivo_lead(self, dados):
+        """
+        Retorna o caminho do .md de um lead: o arquivo já registrado para
+        ele ou, na primeira extração, o slug do nome (ou da URL)
+        """
+        if dados.get('arquivo'):
+            return os.path.join(PASTA_LEADS, dados['arquivo'])
 
-        # Cria pasta leads se não existir
-        os.makedirs(PASTA_LEADS, exist_ok=True)
-
-        # Nome do arquivo: slug do nome ou da URL
         nome = dados.get('nome', '')
         if not nome or nome == 'Desconhecido':
             url = dados.get('url', '')
@@ -642,9 +673,21 @@ class LeadMarkdownGenerator:
         nome_slug = self._criar_slug(nome) if nome else 'lead-sem-nome'
 
         if not nome_slug:
-            nome_slug = f"lead-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            nome_slug = f"lead-{obter_relogio().agora().strftime('%Y%m%d%H%M%S')}"
+
+        return os.path.join(PASTA_LEADS, f"{nome_slug}.md")
+
+    def gerar_arquivo_lead(self, dados, dados_aprovados=False, alteracoes=None):
+        """
+        Gera arquivo .md com dados brutos do lead (sem mensagens ainda).
+        Em re-extrações com mudanças, mantém a aprovação dos dados e
+        lista os campos alterados para a regeneração das mensagens.
+        """
+
+        # Cria pasta leads se não existir
+        os.makedirs(PASTA_LEADS, exist_ok=True)
 
-        arquivo_md = os.path.join(PASTA_LEADS, f"{nome_slug}.md")
+        arquivo_md = self.caminho_arquivo_lead(dados)
 
         # Define tipo
         if dados.get('tipo') == 'conexao_existente':
@@ -676,28 +719,21 @@ class LeadMarkdownGenerator:
 
 """
         # Adiciona publicações
-        publicacoes = dados.get('publicacoes', [])
-        if publicacoes:
-            for i, pub in enumerate(publicacoes, 1):
-                conteudo += f"""### Publicação {i}
-- **Data:** {pub.get('data', 'Não identificada')}
-- **Tipo:** {pub.get('tipo', 'post')}
-
-> {pub.get('texto', '(Sem texto)')}
-
----
-
-"""
-        else:
-            conteudo += "(Nenhuma publicação encontrada)\n\n---\n\n"
+        conteudo += self.secao_publicacoes(dados.get('publicacoes'))
 
         # Seção de status
-        conteudo += """## Status
+        marcador = "x" if dados_aprovados else " "
+        conteudo += f"""## Status
 
-- [ ] **DADOS APROVADOS** - Marque para gerar mensagens personalizadas
+- [{marcador}] **DADOS APROVADOS** - Marque para gerar mensagens personalizadas
 
 > Após aprovar os dados, execute: `python linkedin_lead_extractor.py gerar`
 > Isso usará a IA para criar mensagens únicas baseadas neste perfil.
+"""
+        if alteracoes:
+            conteudo += f"""
+> Perfil alterado desde a última extração: {', '.join(alteracoes)}
+> As mensagens anteriores foram descartadas e serão regeneradas.
 """
 
         # Salva arquivo
@@ -707,6 +743,34 @@ class LeadMarkdownGenerator:
         print(f"   📄 Arquivo gerado: {arquivo_md}")
         return arquivo_md
 
+    def secao_publicacoes(self, publicacoes):
+        """Corpo da seção 'Últimas Publicações' (None = ainda não buscadas)"""
+        if publicacoes is None:
+            return "(Publicações serão buscadas após a aprovação dos dados)\n\n---\n\n"
+        if not publicacoes:
+            return "(Nenhuma publicação encontrada)\n\n---\n\n"
+
+        secao = ""
+        for i, pub in enumerate(publicacoes, 1):
+            secao += f"""### Publicação {i}
+- **Data:** {pub.get('data', 'Não identificada')}
+- **Tipo:** {pub.get('tipo', 'post')}
+
+> {pub.get('texto', '(Sem texto)')}
+
+---
+
+"""
+        return secao
+
+    def atualizar_publicacoes_md(self, conteudo, publicacoes):
+        """Substitui a seção de publicações de um .md existente (mantém o resto, inclusive aprovações)"""
+        return re.sub(
+            r'(## Últimas Publicações\n\n).*?(?=## Status)',
+            lambda m: m.group(1) + self.secao_publicacoes(publicacoes),
+            conteudo, count=1, flags=re.DOTALL
+        )
+
     def _criar_slug(self, texto):
         """Cria slug a partir do texto"""
         texto = texto.lower().strip()
@@ -738,6 +802,11 @@ class ApprovalProcessor:
         except FileNotFoundError:
             return {}
 
+    def etapas_para(self, tipo):
+        """Etapas da sequência de cadência para o tipo de contato"""
+        chave = 'sequencia_conexoes_existentes' if tipo == 'conexao_existente' else 'sequencia_novos_contatos'
+        return self.config.get(chave, {}).get('etapas', [])
+
     def verificar_aprovados(self):
         """Verifica quais leads têm mensagens aprovadas"""
         aprovados = []
@@ -809,25 +878,70 @@ class ApprovalProcessor:
 # ============================================
 
 def carregar_urls(arquivo):
-    """Carrega URLs do arquivo"""
+    """Carrega URLs do arquivo, normalizadas e sem perfis duplicados (só as URLs)"""
+    contagem = {"duplicados": 0}
     try:
-        if arquivo.endswith('.csv'):
-            df = pd.read_csv(arquivo)
-            return df.to_dict('records')
-        else:
-            with open(arquivo, 'r', encoding='utf-8') as f:
-                return [{"url": line.strip()} for line in f if line.strip()]
+        urls = [registro['url'] for registro in iterar_registros(arquivo, COLUNAS_BASE, IndiceAliases(), contagem)]
     except FileNotFoundError:
         print(f"❌ Arquivo não encontrado: {arquivo}")
         return []
 
+    if contagem['duplicados']:
+        print(f"🔗 {contagem['duplicados']} URL(s) duplicada(s) ignorada(s)")
+    return urls
+
+def carregar_leads_json():
+    """Carrega dados dos leads já extraídos"""
+    try:
+        with open(ARQUIVO_LEADS_JSON, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+def indexar_leads(leads, aliases=None):
+    """Indexa leads pela URL canônica (a última ocorrência de um perfil vence)"""
+    aliases = aliases or IndiceAliases()
+    return {aliases.resolver(lead.get('url', '')): lead for lead in leads}
+
 def salvar_leads_json(leads_data):
-    """Salva dados dos leads em JSON"""
+    """Salva dados dos leads em JSON, mesclando com os leads já extraídos"""
     os.makedirs(PASTA_LEADS, exist_ok=True)
+
+    # Mantém leads de extrações anteriores que não estão nesta execução
+    aliases = IndiceAliases()
+    leads_por_url = indexar_leads(carregar_leads_json(), aliases)
+    leads_por_url.update(indexar_leads(leads_data, aliases))
+    for url, lead in leads_por_url.items():
+        lead['url'] = url
+
     with open(ARQUIVO_LEADS_JSON, 'w', encoding='utf-8') as f:
-        json.dump(leads_data, f, indent=2, ensure_ascii=False)
+        json.dump(list(leads_por_url.values()), f, indent=2, ensure_ascii=False)
     print(f"\n💾 Dados salvos em: {ARQUIVO_LEADS_JSON}")
 
+def calcular_hashes(dados):
+    """Calcula um hash de conteúdo para cada campo material do lead"""
+    hashes = {}
+    for campo in CAMPOS_MATERIAIS:
+        valor = dados.get(campo)
+        if isinstance(valor, str):
+            valor = " ".join(valor.split())
+        serializado = json.dumps(valor, sort_keys=True, ensure_ascii=False)
+        hashes[campo] = hashlib.sha256(serializado.encode('utf-8')).hexdigest()[:16]
+    return hashes
+
+def detectar_alteracoes(hashes_atuais, hashes_anteriores):
+    """Retorna os campos materiais cujo hash mudou"""
+    if not hashes_anteriores:
+        return []
+    return [
+        campo for campo in CAMPOS_MATERIAIS
+        if hashes_atuais.get(campo) != hashes_anteriores.get(campo)
+    ]
+
+def _dados_aprovados(conteudo):
+    """Verifica se o checkbox de DADOS APROVADOS está marcado"""
+    return '[x] **dados aprovados**' in conteudo.lower()
+
 def comando_extrair():
     """Comando para extrair dados dos perfis"""
     print("""
@@ -837,6 +951,7 @@ def comando_extrair():
     ╚════════════════════════════════════════════╝
     """)
 
+    carregar_ambiente()
     if not EMAIL or not SENHA:
         print("❌ Configure LINKEDIN_EMAIL e LINKEDIN_SENHA no arquivo .env")
         return
@@ -857,6 +972,9 @@ def comando_extrair():
             return
 
         leads_data = []
+        leads_anteriores = indexar_leads(carregar_leads_json(), extractor.aliases)
+        inalterados = 0
+        alterados = 0
 
         for i, item in enumerate(urls, 1):
             url = item.get('url', item) if isinstance(item, dict) else item
@@ -865,16 +983,20 @@ def comando_extrair():
 
             # Extrai dados via API
             dados = extractor.extrair_dados_perfil(url)
+            anterior = leads_anteriores.get(extractor.aliases.resolver(url))
+            dados, resultado = _registrar_extracao(dados, anterior, generator)
             leads_data.append(dados)
 
-            # Gera arquivo markdown
-            generator.gerar_arquivo_lead(dados)
+            if resultado == "inalterado":
+                inalterados += 1
+            elif resultado == "alterado":
+                alterados += 1
 
             # Delay entre extrações (evita rate limiting)
             if i < len(urls):
-                delay = random.uniform(2, 4)
+                delay = extractor.relogio.uniforme(2, 4)
                 print(f"   ⏱️ Aguardando {delay:.1f}s...")
-                time.sleep(delay)
+                extractor.relogio.dormir(delay)
 
         # Salva JSON com todos os dados
         salvar_leads_json(leads_data)
@@ -883,6 +1005,8 @@ def comando_extrair():
         print("✅ EXTRAÇÃO CONCLUÍDA!")
         print("="*50)
         print(f"\n📁 Arquivos gerados em: {PASTA_LEADS}/")
+        if inalterados or alterados:
+            print(f"   ♻️ Sem mudanças: {inalterados} | 🔄 Com mudanças: {alterados}")
         print("\n📝 Próximos passos:")
         print("   1. Revise os arquivos .md na pasta leads/")
         print("   2. Verifique se os dados estão corretos")
@@ -895,6 +1019,94 @@ def comando_extrair():
     finally:
         extractor.fechar()
 
+def _registrar_extracao(dados, anterior, generator):
+    """
+    Compara a extração com a anterior e atualiza o .md só se algo mudou.
+    Retorna (dados, resultado) com resultado 'novo', 'alterado' ou 'inalterado'.
+    """
+    if anterior and not dados.get('hashes'):
+        # Extração falhou: mantém o que já tínhamos do lead
+        print("   ⚠️ Extração incompleta, mantendo dados anteriores")
+        return anterior, "inalterado"
+
+    # Publicações são adiadas: uma re-extração mantém as já buscadas (e o hash delas),
+    # marcadas para serem conferidas de novo antes da próxima geração de mensagens
+    if anterior and dados.get('publicacoes') is None and anterior.get('publicacoes') is not None:
+        dados['publicacoes'] = anterior['publicacoes']
+        dados['publicacoes_adiadas'] = True
+        dados['hashes'] = calcular_hashes(dados)
+
+    alteracoes = detectar_alteracoes(dados.get('hashes', {}), anterior.get('hashes')) if anterior else []
+    legado = bool(anterior) and not anterior.get('hashes')
+    if legado:
+        # Registro de uma versão sem hashes: regrava uma vez para passar a comparar
+        alteracoes = list(CAMPOS_MATERIAIS)
+
+    # O .md é do perfil, não do nome: uma mudança de nome reaproveita o arquivo
+    # (e a aprovação); registros antigos sem 'arquivo' usam o nome anterior
+    if anterior:
+        dados['arquivo'] = anterior.get('arquivo') or os.path.basename(generator.caminho_arquivo_lead(anterior))
+    else:
+        dados['arquivo'] = _arquivo_livre(generator.caminho_arquivo_lead(dados), dados.get('url', ''))
+    arquivo_md = generator.caminho_arquivo_lead(dados)
+    existente = _localizar_md(arquivo_md)
+
+    # Preserva o estado de geração das mensagens entre extrações
+    if anterior:
+        dados['hashes_mensagens'] = anterior.get('hashes_mensagens')
+        dados['precisa_regenerar'] = anterior.get('precisa_regenerar', False)
+
+    enfileirado = existente is not None and existente != arquivo_md
+    if anterior and (not alteracoes or (legado and enfileirado)):
+        # Nada material mudou (ou registro antigo de um lead já enfileirado, que
+        # só passa a ter hashes): mantém o .md e as mensagens aprovadas
+        print("   ♻️ Sem mudanças no perfil, arquivo mantido")
+        return dados, "inalterado"
+
+    if alteracoes:
+        print(f"   🔄 Campos alterados: {', '.join(alteracoes)}")
+        if dados.get('hashes_mensagens'):
+            dados['precisa_regenerar'] = True
+
+    if enfileirado:
+        # Lead já enfileirado mudou: volta para leads/ para gerar e aprovar de novo
+        os.replace(existente, arquivo_md)
+        print(f"   📁 Voltou para: {arquivo_md}")
+
+    # Mantém a aprovação dos dados de um .md já revisado
+    aprovado = False
+    if existente:
+        with open(arquivo_md, 'r', encoding='utf-8') as f:
+            aprovado = _dados_aprovados(f.read())
+
+    # Gera arquivo markdown
+    generator.gerar_arquivo_lead(dados, dados_aprovados=aprovado, alteracoes=alteracoes)
+    return dados, "alterado" if alteracoes else "novo"
+
+def _localizar_md(caminho):
+    """Onde está o .md do lead: na pasta de leads ou na subpasta para onde foi movido"""
+    if os.path.exists(caminho):
+        return caminho
+    for subpasta in SUBPASTAS_LEAD:
+        movido = os.path.join(os.path.dirname(caminho), subpasta, os.path.basename(caminho))
+        if os.path.exists(movido):
+            return movido
+    return None
+
+def _arquivo_livre(caminho, url):
+    """Nome do .md para um lead novo; se o slug já é de outro perfil, acrescenta o id do perfil"""
+    existente = _localizar_md(caminho)
+    if existente is None:
+        return os.path.basename(caminho)
+
+    with open(existente, 'r', encoding='utf-8') as f:
+        url_match = re.search(r'\*\*URL:\*\*\s*(\S+)', f.read())
+    if url_match and id_perfil(url_match.group(1)) == id_perfil(url):
+        return os.path.basename(caminho)
+
+    base, extensao = os.path.splitext(os.path.basename(caminho))
+    return f"{base}-{id_perfil(url) or 'perfil'}{extensao}"
+
 def comando_aprovar():
     """Comando para processar leads com mensagens aprovadas"""
     print("""
@@ -923,13 +1135,41 @@ def comando_aprovar():
         print(f"   - {lead['nome']} ({lead['tipo']})")
 
     print("\n" + "="*50)
-    confirma = input("\n🚀 Deseja iniciar o envio? (s/n): ").strip().lower()
+    confirma = input("\n📬 Enfileirar para envio pela cadência? (s/n): ").strip().lower()
 
     if confirma != 's':
         print("❌ Envio cancelado")
         return
 
-    # Importa o bot original para fazer os envios
+    # As mensagens entram na fila durável; o bot de cadência envia respeitando
+    # limites, janelas e dias de espera (mensagens 2 e 3 viram follow-ups)
+    fila = FilaAcoes()
+    aliases = IndiceAliases()
+    total = 0
+    recusadas = 0
+    for lead in aprovados:
+        etapas = processor.etapas_para(lead['tipo'])
+        mensagens = [m for m in lead['mensagens'] if m['numero'] <= max(len(etapas), 1)]
+        enfileiradas, recusados = fila.enfileirar_lead(
+            aliases.resolver(lead['url']), lead['tipo'], lead['nome'], mensagens, origem=lead['arquivo']
+        )
+        total += enfileiradas
+        if recusados:
+            recusadas += len(recusados)
+            numeros = ", ".join(str(n) for n in recusados)
+            print(f"   ⚠️ {lead['nome']}: mensagem(ns) {numeros} já enviada(s) - não enfileirada(s)")
+        _mover_lead(lead['arquivo'], "enfileirados")
+
+    print(f"\n✅ {total} mensagem(ns) enfileirada(s) para {len(aprovados)} lead(s)")
+    if recusadas:
+        print(f"   ⚠️ {recusadas} mensagem(ns) fora da fila (já enviadas)")
+
+    agora = input("\n🚀 Executar uma sessão de cadência agora? (s/n): ").strip().lower()
+    if agora != 's':
+        print("💡 A fila será processada na próxima execução do bot de cadência")
+        return
+
+    # Importa o bot original para fazer os envios (usa a mesma sessão de navegador)
     from linkedin_bot_cadencia import LinkedInBotCadencia
 
     bot = LinkedInBotCadencia()
@@ -941,46 +1181,10 @@ def comando_aprovar():
             print("❌ Falha no login")
             return
 
-        for i, lead in enumerate(aprovados, 1):
-            print(f"\n[{i}/{len(aprovados)}] Enviando para: {lead['nome']}")
-
-            url = lead['url']
-            tipo = lead['tipo']
-            mensagens = lead['mensagens']
-
-            if not mensagens:
-                print("   ⚠️ Nenhuma mensagem encontrada, pulando...")
-                continue
-
-            # Envia primeira mensagem da cadência
-            primeira_msg = mensagens[0]['texto']
-
-            if tipo == 'novo':
-                # Envia convite com mensagem
-                sucesso, status = bot.enviar_convite(url, primeira_msg)
-            else:
-                # Envia mensagem direta
-                sucesso, status = bot.enviar_mensagem(url, primeira_msg)
-
-            if sucesso:
-                print(f"   ✅ Enviado com sucesso!")
-                # Move arquivo para pasta 'enviados'
-                _mover_para_enviados(lead['arquivo'])
-            else:
-                print(f"   ❌ Falha: {status}")
-
-            # Delay entre envios
-            if i < len(aprovados):
-                delay = random.uniform(60, 120)
-                print(f"   ⏱️ Aguardando {delay:.0f}s...")
-                time.sleep(delay)
-
+        bot.recuperar_acoes_pendentes()
+        bot.processar_cadencia([])
         bot.salvar_log()
 
-        print("\n" + "="*50)
-        print("✅ ENVIOS CONCLUÍDOS!")
-        print("="*50)
-
     except KeyboardInterrupt:
         print("\n\n⚠️ Interrompido pelo usuário")
         bot.salvar_log()
@@ -988,13 +1192,13 @@ def comando_aprovar():
     finally:
         bot.fechar()
 
-def _mover_para_enviados(arquivo):
-    """Move arquivo para pasta de enviados"""
-    pasta_enviados = os.path.join(PASTA_LEADS, "enviados")
-    os.makedirs(pasta_enviados, exist_ok=True)
+def _mover_lead(arquivo, subpasta):
+    """Move o arquivo do lead para uma subpasta de PASTA_LEADS"""
+    pasta_destino = os.path.join(PASTA_LEADS, subpasta)
+    os.makedirs(pasta_destino, exist_ok=True)
 
     origem = os.path.join(PASTA_LEADS, arquivo)
-    destino = os.path.join(pasta_enviados, arquivo)
+    destino = os.path.join(pasta_destino, arquivo)
 
     if os.path.exists(origem):
         os.rename(origem, destino)
@@ -1009,6 +1213,7 @@ def comando_gerar():
     ╚════════════════════════════════════════════╝
     """)
 
+    carregar_ambiente()
     if not ANTHROPIC_API_KEY:
         print("❌ Configure ANTHROPIC_API_KEY no arquivo .env")
         return
@@ -1020,19 +1225,54 @@ def comando_gerar():
     # Carrega templates de exemplo
     templates = _carregar_templates_exemplo()
 
+    # Estado de geração de cada lead (hashes usados nas últimas mensagens)
+    aliases = IndiceAliases()
+    leads_store = carregar_leads_json()
+    leads_por_url = indexar_leads(leads_store, aliases)
+
     # Busca leads com dados aprovados
     leads_para_gerar = []
-    for arquivo in os.listdir(PASTA_LEADS):
-        if arquivo.endswith('.md') and not arquivo.startswith('_'):
-            caminho = os.path.join(PASTA_LEADS, arquivo)
+    a_conferir = []  # Já têm mensagens, mas as publicações não foram conferidas na última extração
+    inalterados = 0
+    for pasta in (PASTA_LEADS, os.path.join(PASTA_LEADS, "enfileirados")):
+        if not os.path.isdir(pasta):
+            continue
+        for arquivo in os.listdir(pasta):
+            if not arquivo.endswith('.md') or arquivo.startswith('_'):
+                continue
+            caminho = os.path.join(pasta, arquivo)
             with open(caminho, 'r', encoding='utf-8') as f:
                 conteudo = f.read()
 
             # Verifica se dados foram aprovados
-            if '[x] **DADOS APROVADOS**' in conteudo.lower() or '[X] **DADOS APROVADOS**' in conteudo:
-                # Verifica se já tem mensagens geradas
-                if '## Mensagens Geradas' not in conteudo:
-                    leads_para_gerar.append((arquivo, caminho, conteudo))
+            if not _dados_aprovados(conteudo):
+                continue
+
+            url_match = re.search(r'\*\*URL:\*\*\s*(.+)', conteudo)
+            lead = leads_por_url.get(aliases.resolver(url_match.group(1).strip())) if url_match else None
+
+            # Enfileirados só entram para conferir publicações
+            if pasta != PASTA_LEADS:
+                if lead and lead.get('publicacoes_adiadas') and lead.get('hashes_mensagens'):
+                    a_conferir.append((arquivo, caminho, conteudo, lead))
+                continue
+
+            # Verifica se já tem mensagens geradas e se o perfil mudou desde então
+            if '## Mensagens Geradas' not in conteudo:
+                leads_para_gerar.append((arquivo, caminho, conteudo, lead))
+            elif lead and lead.get('precisa_regenerar'):
+                leads_para_gerar.append((arquivo, caminho, _remover_mensagens(conteudo), lead))
+            elif lead and lead.get('publicacoes_adiadas'):
+                a_conferir.append((arquivo, caminho, conteudo, lead))
+            else:
+                inalterados += 1
+
+    # Publicações novas desde a geração também pedem mensagens novas
+    if a_conferir:
+        regenerar = _conferir_publicacoes(a_conferir)
+        leads_para_gerar.extend(regenerar)
+        inalterados += len(a_conferir) - len(regenerar)
+        salvar_leads_json(leads_store)
 
     if not leads_para_gerar:
         print("❌ Nenhum lead com dados aprovados para gerar mensagens!")
@@ -1043,13 +1283,20 @@ def comando_gerar():
         return
 
     print(f"\n📋 {len(leads_para_gerar)} lead(s) para gerar mensagens:")
-    for arquivo, _, _ in leads_para_gerar:
-        print(f"   - {arquivo}")
+    for arquivo, _, _, lead in leads_para_gerar:
+        motivo = " (perfil alterado)" if lead and lead.get('precisa_regenerar') else ""
+        print(f"   - {arquivo}{motivo}")
+    if inalterados:
+        print(f"   ♻️ {inalterados} lead(s) sem mudanças mantêm as mensagens atuais")
+
+    # Publicações adiadas na extração: busca agora, só para quem vai gerar mensagens
+    leads_para_gerar = _buscar_publicacoes_adiadas(leads_para_gerar)
 
     # Inicializa cliente Claude
+    import anthropic
     client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
-    for arquivo, caminho, conteudo in leads_para_gerar:
+    for arquivo, caminho, conteudo, lead in leads_para_gerar:
         print(f"\n🤖 Gerando mensagens para: {arquivo}")
 
         try:
@@ -1062,11 +1309,19 @@ def comando_gerar():
             # Atualiza o arquivo .md com as mensagens
             _atualizar_md_com_mensagens(caminho, conteudo, mensagens, dados)
 
+            # Registra com quais dados as mensagens foram geradas
+            if lead:
+                lead['hashes_mensagens'] = lead.get('hashes')
+                lead['precisa_regenerar'] = False
+
             print(f"   ✅ Mensagens geradas!")
 
         except Exception as e:
             print(f"   ❌ Erro: {str(e)}")
 
+    if leads_store:
+        salvar_leads_json(leads_store)
+
     print("\n" + "="*50)
     print("✅ GERAÇÃO CONCLUÍDA!")
     print("="*50)
@@ -1077,6 +1332,86 @@ def comando_gerar():
     print("   4. Execute: python linkedin_lead_extractor.py aprovar")
 
 
+def _buscar_publicacoes_adiadas(leads_para_gerar):
+    """
+    Busca as publicações dos leads aprovados que ainda não as têm (ou que
+    ficaram adiadas numa re-extração), numa passada separada com a sessão
+    de navegador compartilhada. Atualiza o lead, o .md e o conteúdo usado
+    na geração.
+    """
+    pendentes = [
+        item for item in leads_para_gerar
+        if item[3] and (item[3].get('publicacoes') is None or item[3].get('publicacoes_adiadas'))
+    ]
+    if not pendentes:
+        return leads_para_gerar
+
+    print(f"\n📝 Buscando publicações de {len(pendentes)} lead(s) aprovado(s)...")
+
+    extractor = LinkedInExtractor()
+    generator = LeadMarkdownGenerator()
+    atualizados = {}
+
+    try:
+        if not extractor.inicializar():
+            print("⚠️ Sem navegador: as mensagens serão geradas sem publicações")
+            return leads_para_gerar
+
+        for i, (arquivo, caminho, conteudo, lead) in enumerate(pendentes, 1):
+            publicacoes = extractor.buscar_publicacoes(lead['url'])
+            if publicacoes is None:
+                continue
+
+            # Quem chama decide se o novo hash pede regeneração
+            lead['publicacoes'] = publicacoes
+            lead.pop('publicacoes_adiadas', None)
+            lead['hashes'] = calcular_hashes(lead)
+
+            with open(caminho, 'r', encoding='utf-8') as f:
+                atual = f.read()
+            with open(caminho, 'w', encoding='utf-8') as f:
+                f.write(generator.atualizar_publicacoes_md(atual, publicacoes))
+            atualizados[caminho] = generator.atualizar_publicacoes_md(conteudo, publicacoes)
+
+            print(f"   [{i}/{len(pendentes)}] {arquivo}: {len(publicacoes)} publicação(ões)")
+
+            if i < len(pendentes):
+                extractor.relogio.dormir(extractor.relogio.uniforme(2, 4))
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️ Busca de publicações interrompida")
+
+    finally:
+        extractor.fechar()
+
+    return [
+        (arquivo, caminho, atualizados.get(caminho, conteudo), lead)
+        for arquivo, caminho, conteudo, lead in leads_para_gerar
+    ]
+
+
+def _conferir_publicacoes(itens):
+    """
+    Busca de novo as publicações de leads que já têm mensagens e retorna os
+    que passaram a ter publicações diferentes das usadas nas mensagens,
+    prontos para regenerar (de volta a leads/ se estavam enfileirados).
+    """
+    regenerar = []
+    for arquivo, caminho, conteudo, lead in _buscar_publicacoes_adiadas(itens):
+        if lead.get('publicacoes_adiadas'):
+            continue  # Busca falhou: confere na próxima vez
+        if lead['hashes'].get('publicacoes') == (lead.get('hashes_mensagens') or {}).get('publicacoes'):
+            continue
+
+        lead['precisa_regenerar'] = True
+        destino = os.path.join(PASTA_LEADS, arquivo)
+        if caminho != destino:
+            os.replace(caminho, destino)
+            print(f"   📁 Voltou para: {destino}")
+        regenerar.append((arquivo, destino, _remover_mensagens(conteudo), lead))
+    return regenerar
+
+
 def _carregar_templates_exemplo():
     """Carrega templates de exemplo para referência"""
     templates = {}
@@ -1220,6 +1555,15 @@ FORMATO DE RESPOSTA (use exatamente este formato):
     return response.content[0].text
 
 
+def _remover_mensagens(conteudo):
+    """Remove mensagens geradas e aprovação final, voltando ao status de dados aprovados"""
+    conteudo = re.sub(r'## Mensagens Geradas\n.*$', '', conteudo, flags=re.DOTALL)
+    return conteudo + """## Status
+
+- [x] **DADOS APROVADOS** - Marque para gerar mensagens personalizadas
+"""
+
+
 def _atualizar_md_com_mensagens(caminho, conteudo_original, mensagens_geradas, dados):
     """Atualiza o arquivo .md com as mensagens geradas"""
 
@@ -1250,6 +1594,55 @@ def _atualizar_md_com_mensagens(caminho, conteudo_original, mensagens_geradas, d
         f.write(conteudo)
 
 
+def comando_classificar():
+    """Reclassifica a área de todos os leads com a taxonomia atual"""
+    print("""
+    ╔════════════════════════════════════════════╗
+    ║   LinkedIn Lead Extractor                  ║
+    ║   Reclassificação de Áreas                 ║
+    ╚════════════════════════════════════════════╝
+    """)
+
+    leads = carregar_leads_json()
+    if not leads:
+        print(f"❌ Nenhum lead em {ARQUIVO_LEADS_JSON}. Execute 'extrair' primeiro.")
+        return
+
+    inicio = time.perf_counter()
+    classificador = obter_classificador()
+    areas_antes = [lead.get('area', '') for lead in leads]
+    alterados = classificador.classificar_lote(leads)
+    duracao = time.perf_counter() - inicio
+
+    print(f"📋 {len(leads)} leads classificados em {duracao * 1000:.0f} ms")
+    print(f"🔄 Área alterada em {alterados} lead(s)")
+
+    # Atualiza a linha de área nos .md dos leads alterados
+    generator = LeadMarkdownGenerator()
+    for lead, area_antes in zip(leads, areas_antes):
+        if lead['area'] == area_antes:
+            continue
+        arquivo_md = generator.caminho_arquivo_lead(lead)
+        if not os.path.exists(arquivo_md):
+            continue
+        with open(arquivo_md, 'r', encoding='utf-8') as f:
+            conteudo = f.read()
+        conteudo = re.sub(r'^- \*\*Área:\*\* .*$', f"- **Área:** {lead['area'] or 'Não identificada'}",
+                          conteudo, count=1, flags=re.MULTILINE)
+        with open(arquivo_md, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+
+    salvar_leads_json(leads)
+
+    # Distribuição por área principal
+    contagem = {}
+    for lead in leads:
+        area = lead['area'] or '(não identificada)'
+        contagem[area] = contagem.get(area, 0) + 1
+    print(f"\n📊 Leads por área:")
+    for area, total in sorted(contagem.items(), key=lambda item: -item[1]):
+        print(f"   {area}: {total}")
+
 def comando_status():
     """Mostra status dos leads"""
     print("""
@@ -1285,6 +1678,12 @@ def comando_status():
             else:
                 pendentes_dados.append(arquivo)
 
+    # 'aprovar' move para enfileirados; enviados é onde versões antigas moviam os leads
+    enfileirados = []
+    pasta_enfileirados = os.path.join(PASTA_LEADS, "enfileirados")
+    if os.path.exists(pasta_enfileirados):
+        enfileirados = [f for f in os.listdir(pasta_enfileirados) if f.endswith('.md')]
+
     pasta_enviados = os.path.join(PASTA_LEADS, "enviados")
     if os.path.exists(pasta_enviados):
         enviados = [f for f in os.listdir(pasta_enviados) if f.endswith('.md')]
@@ -1294,7 +1693,14 @@ def comando_status():
     print(f"   2️⃣  Dados aprovados (aguardando gerar): {len(dados_aprovados)}")
     print(f"   3️⃣  Mensagens geradas (aguardando revisão): {len(mensagens_geradas)}")
     print(f"   4️⃣  Mensagens aprovadas (prontos p/ envio): {len(mensagens_aprovadas)}")
-    print(f"   ✅ Já enviados: {len(enviados)}")
+    print(f"   📬 Enfileirados para o bot de cadência: {len(enfileirados)}")
+    if enviados:
+        print(f"   ✅ Já enviados (versões anteriores): {len(enviados)}")
+
+    fila = FilaAcoes().resumo()
+    if fila:
+        print(f"\n📬 Fila de mensagens: {fila.get('pendente', 0)} pendente(s), "
+              f"{fila.get('concluida', 0)} enviada(s), {fila.get('cancelada', 0)} cancelada(s)")
 
     if dados_aprovados:
         print(f"\n📋 Prontos para gerar mensagens:")
@@ -1308,6 +1714,40 @@ def comando_status():
             print(f"   - {a}")
         print(f"\n   Execute: python linkedin_lead_extractor.py aprovar")
 
+def comando_seletores():
+    """Mostra a taxa de acerto dos seletores e aponta os que pararam de funcionar"""
+    print("""
+    ╔════════════════════════════════════════════╗
+    ║   LinkedIn Lead Extractor                  ║
+    ║   Relatório de Seletores                   ║
+    ╚════════════════════════════════════════════╝
+    """)
+
+    linhas = obter_registro_seletores().relatorio()
+    if not linhas:
+        print("❌ Nenhuma cadeia de seletores configurada")
+        return
+
+    mortos = []
+    cadeia_atual = None
+    for cadeia, seletor, tentativas, acertos, taxa, morto in linhas:
+        if cadeia != cadeia_atual:
+            print(f"\n🔎 {cadeia}")
+            cadeia_atual = cadeia
+        # 💀 morto | ⚠️ tentado e nunca acertou | ✅ já acertou
+        marca = "💀" if morto else ("✅" if acertos else ("⚠️" if tentativas else "  "))
+        print(f"   {marca} {taxa:>5.0%}  {acertos:>5}/{tentativas:<5} {seletor}")
+        if morto:
+            mortos.append((cadeia, seletor))
+
+    if mortos:
+        print(f"\n⚠️ {len(mortos)} seletor(es) sem acerto recente — revise config/seletores.json:")
+        for cadeia, seletor in mortos:
+            print(f"   - [{cadeia}] {seletor}")
+    else:
+        print("\n✅ Nenhum seletor morto")
+
+
 def main():
     import sys
 
@@ -1324,15 +1764,17 @@ def main():
     Comandos:
         extrair   - Extrai dados dos perfis e gera arquivos .md
         gerar     - Usa Claude AI para criar mensagens personalizadas
-        aprovar   - Envia mensagens dos leads aprovados
+        aprovar   - Enfileira as mensagens aprovadas na cadência do bot
         status    - Mostra status dos leads
+        classificar - Reclassifica as áreas com config/areas.json
+        seletores - Taxa de acerto dos seletores (aponta os mortos)
 
     Fluxo:
         1. extrair  -> Extrai dados e gera arquivos .md
         2. Revise os dados e marque [x] **DADOS APROVADOS**
         3. gerar    -> Claude cria mensagens únicas para cada lead
         4. Revise as mensagens e marque [x] **MENSAGENS APROVADAS**
-        5. aprovar  -> Dispara envio dos aprovados
+        5. aprovar  -> Enfileira os aprovados (envio pela cadência)
         """)
         return
 
@@ -1346,9 +1788,13 @@ def main():
         comando_aprovar()
     elif comando == "status":
         comando_status()
+    elif comando == "classificar":
+        comando_classificar()
+    elif comando == "seletores":
+        comando_seletores()
     else:
         print(f"❌ Comando desconhecido: {comando}")
-        print("   Use: extrair, gerar, aprovar ou status")
+        print("   Use: extrair, gerar, aprovar, status, classificar ou seletores")
 
 
 if __name__ == "__main__":
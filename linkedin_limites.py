@@ -0,0 +1,90 @@
+"""
+Limitador de envios por janelas deslizantes
+Conta os envios na última hora, nas últimas 24 h e nos últimos 7 dias
+(janelas móveis, não zeradas na virada do relógio) a partir de um buffer
+circular com os instantes dos envios, persistido no estado da cadência.
+"""
+
+# Nome da janela -> (duração em segundos, chave do limite em cadencia.json["limites"])
+JANELAS = {
+    "hora": (3600, "max_por_hora"),
+    "dia": (86400, "max_por_dia"),
+    "semana": (7 * 86400, "max_por_semana"),
+}
+
+_DESCRICAO = {"hora": "por hora", "dia": "diário", "semana": "semanal"}
+
+
+class LimitadorEnvios:
+    """
+    Buffer circular com os instantes (epoch, em segundos) dos últimos N
+    envios, onde N é o maior limite configurado. Uma janela de duração D e
+    limite L admite um envio se houve menos de L envios ou se o L-ésimo
+    envio mais recente saiu da janela: verificação O(1) por janela, e o
+    mesmo cálculo dá o instante exato da próxima liberação.
+    """
+
+    def __init__(self, limites, eventos=None):
+        self.janelas = [
+            (nome, duracao, limites[chave])
+            for nome, (duracao, chave) in JANELAS.items()
+            if limites.get(chave)
+        ]
+        self.capacidade = max((limite for _, _, limite in self.janelas), default=1)
+        self._buffer = [0] * self.capacidade
+        self._fim = 0      # Próxima posição de escrita
+        self._total = 0    # Eventos válidos no buffer (até a capacidade)
+
+        for instante in sorted(eventos or [])[-self.capacidade:]:
+            self._anexar(instante)
+
+    def registrar(self, instante):
+        """Registra um envio no instante dado (mesmo anterior ao último, ex.: reconciliação)"""
+        if self._total and int(instante) < self._recente(1):
+            eventos = sorted(self.eventos() + [int(instante)])[-self.capacidade:]
+            self._fim = self._total = 0
+            for evento in eventos:
+                self._anexar(evento)
+            return
+        self._anexar(instante)
+
+    def _anexar(self, instante):
+        """Grava o instante na próxima posição do buffer"""
+        self._buffer[self._fim] = int(instante)
+        self._fim = (self._fim + 1) % self.capacidade
+        self._total = min(self._total + 1, self.capacidade)
+
+    def _recente(self, n):
+        """Instante do n-ésimo envio mais recente (1 = último)"""
+        return self._buffer[(self._fim - n) % self.capacidade]
+
+    def eventos(self):
+        """Instantes guardados, do mais antigo ao mais recente (para persistir)"""
+        return [self._recente(n) for n in range(self._total, 0, -1)]
+
+    def _liberacao(self, duracao, limite):
+        """Instante a partir do qual a janela admite mais um envio"""
+        if self._total < limite:
+            return 0
+        return self._recente(limite) + duracao
+
+    def admite(self, agora):
+        """(True, "OK") ou (False, motivo) com a janela que está cheia"""
+        for nome, duracao, limite in self.janelas:
+            if self._liberacao(duracao, limite) > agora:
+                return False, f"Limite {_DESCRICAO[nome]} atingido ({limite})"
+        return True, "OK"
+
+    def proxima_liberacao(self, agora):
+        """Instante exato do próximo envio admissível (agora, se já pode)"""
+        return max([agora] + [self._liberacao(duracao, limite) for _, duracao, limite in self.janelas])
+
+    def contagem(self, nome, agora):
+        """Envios dentro da janela"""
+        duracao = JANELAS[nome][0]
+        total = 0
+        for n in range(1, self._total + 1):
+            if self._recente(n) <= agora - duracao:
+                break
+            total += 1
+        return total
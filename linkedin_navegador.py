@@ -0,0 +1,789 @@
+"""
+Infraestrutura de navegador compartilhada pelo extrator e pelo bot
+- Resolução do chromedriver com cache local por versão do Chrome
+- Sessão única de navegador (perfil persistente, login reaproveitado)
+- Bloqueio de imagens, mídia e fontes com métricas de economia
+- Vigia de memória que recicla o navegador em execuções longas
+"""
+
+import atexit
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+
+from linkedin_espera import aguardar_pagina, EsperaAdaptativa
+from linkedin_relogio import obter_relogio
+
+ARQUIVO_CACHE_DRIVER = "data/cache/chromedriver.json"
+ARQUIVO_CADENCIA = "config/cadencia.json"
+ARQUIVO_REFERENCIA_RECURSOS = "data/cache/referencia_recursos.json"
+ARQUIVO_SESSAO = "data/cache/sessao_navegador.json"
+ARQUIVO_METRICAS_NAVEGADOR = "data/metricas_navegador.jsonl"
+
+# Perfil dedicado do bot (não conflita com o Chrome do usuário)
+PASTA_PERFIL_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chrome_profile")
+
+ARGUMENTOS_CHROME = [
+    "--start-maximized",
+    "--disable-notifications",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+]
+
+# Executáveis do Chrome procurados quando não está no PATH
+_CAMINHOS_CHROME = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+_VERSAO = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+
+# ============================================
+# RESOLUÇÃO DO CHROMEDRIVER
+# ============================================
+
+def _extrair_versao(texto):
+    """Retorna a versão 'a.b.c.d' encontrada no texto, ou None"""
+    match = _VERSAO.search(texto or "")
+    return match.group(0) if match else None
+
+
+def _major(versao):
+    return versao.split(".")[0] if versao else None
+
+
+def _executar_versao(executavel):
+    """Roda '<executável> --version' e extrai a versão (sem rede)"""
+    try:
+        saida = subprocess.run(
+            [executavel, "--version"], capture_output=True, text=True, timeout=10
+        ).stdout
+        return _extrair_versao(saida)
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def versao_chrome_instalado():
+    """Detecta a versão do Chrome instalado localmente"""
+    if sys.platform.startswith("win"):
+        try:
+            import winreg
+            for raiz in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(raiz, r"Software\Google\Chrome\BLBeacon") as chave:
+                        return _extrair_versao(winreg.QueryValueEx(chave, "version")[0])
+                except OSError:
+                    continue
+        except ImportError:
+            pass
+        return None
+
+    executavel = _executavel_chrome()
+    return _executar_versao(executavel) if executavel else None
+
+
+def _carregar_cache():
+    try:
+        with open(ARQUIVO_CACHE_DRIVER, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _salvar_cache(cache):
+    os.makedirs(os.path.dirname(ARQUIVO_CACHE_DRIVER), exist_ok=True)
+    with open(ARQUIVO_CACHE_DRIVER, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+
+
+def _driver_compativel(caminho, versao_chrome):
+    """Verifica localmente se o chromedriver existe e tem o mesmo major do Chrome"""
+    if not caminho or not os.path.isfile(caminho):
+        return None
+    versao_driver = _executar_versao(caminho)
+    if not versao_driver:
+        return None
+    if versao_chrome and _major(versao_driver) != _major(versao_chrome):
+        return None
+    return versao_driver
+
+
+def resolver_chromedriver():
+    """
+    Retorna o caminho do chromedriver compatível com o Chrome instalado.
+    Usa o cache (ou o chromedriver do PATH) sem acessar a rede; só chama
+    o webdriver_manager quando não há driver local com a versão certa.
+    """
+    cache = _carregar_cache()
+    versao_chrome = versao_chrome_instalado()
+    chave = _major(versao_chrome) or "desconhecida"
+
+    # 1. Driver já resolvido para esta versão do Chrome (mesmo arquivo: nem roda --version)
+    registro = cache.get(chave, {})
+    caminho = registro.get("caminho")
+    if caminho and os.path.isfile(caminho) and registro.get("mtime") == os.path.getmtime(caminho):
+        return caminho
+    if _driver_compativel(caminho, versao_chrome):
+        registro["mtime"] = os.path.getmtime(caminho)
+        _salvar_cache(cache)
+        return caminho
+
+    # 2. chromedriver no PATH com o mesmo major
+    no_path = shutil.which("chromedriver")
+    versao_driver = _driver_compativel(no_path, versao_chrome)
+    if versao_driver:
+        cache[chave] = {
+            "caminho": no_path,
+            "versao_driver": versao_driver,
+            "versao_chrome": versao_chrome,
+            "mtime": os.path.getmtime(no_path),
+        }
+        cache["ultimo"] = cache[chave]
+        _salvar_cache(cache)
+        return no_path
+
+    # 3. Versões divergem: baixa o driver certo
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        print("⬇️ Resolvendo chromedriver compatível (rede)...")
+        caminho = ChromeDriverManager().install()
+    except Exception as e:
+        # Offline: usa o último driver conhecido, se houver
+        ultimo = cache.get("ultimo", {}).get("caminho")
+        if ultimo and os.path.isfile(ultimo):
+            print(f"⚠️ Não foi possível baixar o chromedriver ({str(e)}); usando {ultimo}")
+            return ultimo
+        raise
+
+    cache[chave] = {
+        "caminho": caminho,
+        "versao_driver": _executar_versao(caminho),
+        "versao_chrome": versao_chrome,
+        "mtime": os.path.getmtime(caminho) if os.path.isfile(caminho) else None,
+    }
+    cache["ultimo"] = cache[chave]
+    _salvar_cache(cache)
+    return caminho
+
+
+# ============================================
+# POLÍTICA DE RECURSOS (imagens, mídia, fontes)
+# ============================================
+
+# Padrões bloqueados via CDP Network.setBlockedURLs, por tipo de recurso
+PADROES_RECURSOS = {
+    "imagens": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+                "*media.licdn.com/dms/image/*"],
+    "midia": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*dms.licdn.com/playlist/*"],
+    "fontes": ["*.woff", "*.woff2", "*.ttf", "*.otf"],
+}
+
+# Bytes transferidos e tempo de carga da página atual (Navigation/Resource Timing)
+_METRICAS_PAGINA_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+let bytes = nav ? nav.transferSize : 0;
+for (const r of performance.getEntriesByType('resource')) { bytes += r.transferSize || 0; }
+const fim = nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd) : 0;
+return {bytes: bytes, carga_ms: nav ? Math.max(0, fim - nav.startTime) : 0};
+"""
+
+
+class PoliticaRecursos:
+    """
+    Bloqueia downloads que a extração não usa (imagens, vídeos, fontes) e
+    mede bytes e tempo de carga por página. A economia é estimada contra
+    uma referência gravada nas sessões rodadas com o bloqueio desligado.
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.ativo = config.get("ativo", True)
+        self.tipos = [t for t in PADROES_RECURSOS if config.get(t, True)]
+        self.padroes_extras = config.get("padroes_extras", [])
+        self.paginas = 0
+        self.bytes = 0
+        self.carga_ms = 0.0
+
+    def padroes(self):
+        """Padrões de URL bloqueados pela política"""
+        if not self.ativo:
+            return []
+        padroes = [p for tipo in self.tipos for p in PADROES_RECURSOS[tipo]]
+        return padroes + list(self.padroes_extras)
+
+    def preferencias_chrome(self):
+        """Content settings do Chrome (aplicadas quando o chromedriver lança o navegador)"""
+        if self.ativo and "imagens" in self.tipos:
+            return {"profile.managed_default_content_settings.images": 2}
+        return {}
+
+    def argumentos_chrome(self):
+        """Equivalente em linha de comando, para o Chrome persistente"""
+        if self.ativo and "imagens" in self.tipos:
+            return ["--blink-settings=imagesEnabled=false"]
+        return []
+
+    def aplicar(self, driver):
+        """Registra os bloqueios na sessão CDP do driver"""
+        padroes = self.padroes()
+        if not padroes:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes})
+        except Exception as e:
+            print(f"⚠️ Não foi possível bloquear recursos: {str(e)}")
+
+    def registrar_pagina(self, driver):
+        """Soma as métricas da página que acabou de carregar"""
+        try:
+            metricas = driver.execute_script(_METRICAS_PAGINA_JS) or {}
+        except Exception:
+            return
+        self.paginas += 1
+        self.bytes += int(metricas.get("bytes") or 0)
+        self.carga_ms += float(metricas.get("carga_ms") or 0)
+
+    def _carregar_referencia(self):
+        try:
+            with open(ARQUIVO_REFERENCIA_RECURSOS, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _atualizar_referencia(self):
+        """Acumula as métricas de uma sessão sem bloqueio na referência"""
+        referencia = self._carregar_referencia()
+        for campo, valor in (("paginas", self.paginas), ("bytes", self.bytes), ("carga_ms", self.carga_ms)):
+            referencia[campo] = referencia.get(campo, 0) + valor
+
+        os.makedirs(os.path.dirname(ARQUIVO_REFERENCIA_RECURSOS), exist_ok=True)
+        with open(ARQUIVO_REFERENCIA_RECURSOS, 'w', encoding='utf-8') as f:
+            json.dump(referencia, f, indent=2)
+
+    def relatorio(self):
+        """Imprime o resumo da sessão e zera os contadores"""
+        if not self.paginas:
+            return
+
+        bytes_pagina = self.bytes / self.paginas
+        carga_pagina = self.carga_ms / self.paginas
+        print(f"\n📉 Recursos: {self.paginas} página(s), {self.bytes / 1e6:.1f} MB transferidos, "
+              f"carga média {carga_pagina:.0f} ms")
+
+        if not self.ativo:
+            self._atualizar_referencia()
+        else:
+            referencia = self._carregar_referencia()
+            if referencia.get("paginas"):
+                economia_bytes = (referencia["bytes"] / referencia["paginas"] - bytes_pagina) * self.paginas
+                economia_ms = (referencia["carga_ms"] / referencia["paginas"] - carga_pagina) * self.paginas
+                print(f"   Economia estimada: {economia_bytes / 1e6:.1f} MB e {economia_ms / 1000:.0f} s de carga")
+            else:
+                print("   (sem referência: rode uma sessão com navegador.recursos.ativo = false para medir a economia)")
+
+        self.paginas = 0
+        self.bytes = 0
+        self.carga_ms = 0.0
+
+
+# ============================================
+# VIGIA DE MEMÓRIA
+# ============================================
+
+def _processos_proc():
+    """Mapa pid -> (ppid, rss em bytes) lido de /proc (Linux sem psutil)"""
+    tamanho_pagina = os.sysconf("SC_PAGE_SIZE")
+    processos = {}
+    for nome in os.listdir("/proc"):
+        if not nome.isdigit():
+            continue
+        try:
+            with open(f"/proc/{nome}/stat", 'r') as f:
+                # O nome do processo vem entre parênteses e pode ter espaços
+                campos = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{nome}/statm", 'r') as f:
+                rss = int(f.read().split()[1]) * tamanho_pagina
+        except (OSError, IndexError, ValueError):
+            continue
+        processos[int(nome)] = (int(campos[1]), rss)
+    return processos
+
+
+def rss_processos(pids, incluir_filhos=True):
+    """
+    Soma o RSS (bytes) dos processos e, opcionalmente, de todos os seus
+    descendentes (renderers do Chrome). Usa psutil se estiver instalado;
+    sem ele, lê /proc no Linux. Retorna None se não houver como medir.
+    """
+    pids = [p for p in pids if p]
+    if not pids:
+        return None
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        total = 0
+        for pid in pids:
+            try:
+                processo = psutil.Process(pid)
+                grupo = [processo] + (processo.children(recursive=True) if incluir_filhos else [])
+                for item in grupo:
+                    try:
+                        total += item.memory_info().rss
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+
+    if not os.path.isdir("/proc"):
+        return None
+
+    processos = _processos_proc()
+    filhos = {}
+    for pid, (ppid, _) in processos.items():
+        filhos.setdefault(ppid, []).append(pid)
+
+    total = 0
+    vistos = set()
+    pilha = list(pids)
+    while pilha:
+        pid = pilha.pop()
+        if pid in vistos or pid not in processos:
+            continue
+        vistos.add(pid)
+        total += processos[pid][1]
+        if incluir_filhos:
+            pilha.extend(filhos.get(pid, []))
+    return total
+
+
+class VigiaMemoria:
+    """
+    Amostra periodicamente o RSS do Chrome e do chromedriver e o número de
+    páginas abertas pela sessão, exportando cada amostra em JSONL. Quando
+    um limite é ultrapassado, pede a reciclagem do navegador.
+    """
+
+    def __init__(self, config=None, relogio=None):
+        config = config or {}
+        self.relogio = relogio or obter_relogio()
+        self.ativo = config.get("ativo", True)
+        self.max_rss_mb = config.get("max_rss_mb", 1500)
+        self.max_paginas = config.get("max_paginas", 300)
+        self.intervalo_amostra = config.get("intervalo_amostra_s", 60)
+        self.ultima_amostra = 0.0
+        self.reciclagens = 0
+
+    def medir(self, sessao):
+        """Retorna uma amostra das métricas atuais da sessão"""
+        pid_driver = sessao.pid_driver()
+        rss_driver = rss_processos([pid_driver], incluir_filhos=False)
+        if sessao.anexado:
+            rss_navegador = rss_processos([sessao.pid_navegador()])
+        else:
+            # Sem Chrome persistente, o navegador é filho do chromedriver
+            rss_total = rss_processos([pid_driver])
+            rss_navegador = rss_total - rss_driver if rss_total is not None else None
+
+        def em_mb(valor):
+            return round(valor / 2**20, 1) if valor is not None else None
+
+        return {
+            "em": self.relogio.agora().isoformat(timespec="seconds"),
+            "rss_navegador_mb": em_mb(rss_navegador),
+            "rss_driver_mb": em_mb(rss_driver),
+            "paginas": sessao.paginas,
+            "reciclagens": self.reciclagens,
+        }
+
+    def avaliar(self, sessao):
+        """
+        Amostra (respeitando o intervalo) e retorna (reciclar, motivo).
+        Só deve ser chamado entre ações.
+        """
+        if not self.ativo or sessao.driver is None:
+            return False, ""
+
+        agora = self.relogio.monotonico()
+        if agora - self.ultima_amostra < self.intervalo_amostra:
+            return False, ""
+        self.ultima_amostra = agora
+
+        amostra = self.medir(sessao)
+        self._exportar(amostra)
+
+        rss_total = (amostra["rss_navegador_mb"] or 0) + (amostra["rss_driver_mb"] or 0)
+        if self.max_rss_mb and rss_total > self.max_rss_mb:
+            return True, f"memória {rss_total:.0f} MB > {self.max_rss_mb} MB"
+        if self.max_paginas and amostra["paginas"] >= self.max_paginas:
+            return True, f"{amostra['paginas']} páginas abertas (limite {self.max_paginas})"
+        return False, ""
+
+    def _exportar(self, amostra):
+        """Anexa a amostra ao arquivo de métricas"""
+        os.makedirs(os.path.dirname(ARQUIVO_METRICAS_NAVEGADOR), exist_ok=True)
+        with open(ARQUIVO_METRICAS_NAVEGADOR, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(amostra, ensure_ascii=False) + "\n")
+
+
+# ============================================
+# SESSÃO DE NAVEGADOR COMPARTILHADA
+# ============================================
+
+class SessaoNavegador:
+    """
+    Dona de uma única instância do Chrome e do diretório de perfil
+    (user-data-dir), entregue ao extrator e ao bot. Com 'manter_aberto'
+    (desligado por padrão), o Chrome roda como processo próprio com porta
+    de depuração em 127.0.0.1 e os comandos seguintes se conectam a ele,
+    já logado, em vez de abrir outro navegador e refazer o login. Qualquer
+    processo local pode controlar essa sessão pela porta enquanto ela
+    estiver aberta; sem 'manter_aberto' o navegador fecha com o comando.
+    """
+
+    def __init__(self, config=None, relogio=None):
+        config = config if config is not None else _carregar_config_navegador()
+        self.relogio = relogio or obter_relogio()
+        self.manter_aberto = config.get("manter_aberto", False)
+        # Caminhos relativos são resolvidos a partir da pasta do projeto
+        self.pasta_perfil = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         config.get("pasta_perfil", PASTA_PERFIL_PADRAO))
+        # Porta fixa só se configurada; senão, a do Chrome persistente registrado ou uma aleatória ao lançar
+        self.porta_fixa = int(config.get("porta_depuracao") or 0)
+        self.porta = self.porta_fixa or self._porta_registrada()
+        self.recursos = PoliticaRecursos(config.get("recursos"))
+        self.vigia = VigiaMemoria(config.get("vigia_memoria"), self.relogio)
+        self.espera = EsperaAdaptativa(config.get("esperas"), relogio=self.relogio)
+        self.paginas = 0
+        self.driver = None
+        self.anexado = False
+        self.login_validado = False
+        self._fechar_na_saida = False
+
+    def _porta_registrada(self):
+        """Porta do Chrome persistente lançado com este perfil (0 se não há)"""
+        try:
+            with open(ARQUIVO_SESSAO, 'r', encoding='utf-8') as f:
+                registro = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        return int(registro.get("porta") or 0) if registro.get("perfil") == self.pasta_perfil else 0
+
+    def iniciar(self):
+        """Retorna o driver da sessão, conectando ao Chrome aberto ou iniciando um novo"""
+        if self.driver is not None:
+            return self.driver
+
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        os.makedirs(self.pasta_perfil, exist_ok=True)
+        service = Service(resolver_chromedriver())
+        chrome_options = Options()
+
+        self.anexado = self.manter_aberto and (self._navegador_ativo() or self._lancar_navegador())
+        if self.anexado:
+            # Conecta ao Chrome que já está rodando com este perfil
+            chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{self.porta}")
+            print("♻️ Usando navegador persistente")
+        else:
+            for argumento in ARGUMENTOS_CHROME:
+                chrome_options.add_argument(argumento)
+            chrome_options.add_argument(f"--user-data-dir={self.pasta_perfil}")
+            if self.recursos.preferencias_chrome():
+                chrome_options.add_experimental_option("prefs", self.recursos.preferencias_chrome())
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+
+        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        if not self._fechar_na_saida:
+            # Garante que um navegador não persistente não sobreviva ao comando
+            atexit.register(self.fechar)
+            self._fechar_na_saida = True
+        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.recursos.aplicar(self.driver)
+        return self.driver
+
+    def abrir(self, url, tipo=None, grupos=None):
+        """
+        Navega até a URL e registra as métricas de carga da página. Com
+        'tipo', espera as condições de prontidão daquele tipo de página
+        (ver linkedin_espera) e retorna o resultado da espera.
+        """
+        self.driver.get(url)
+        self.paginas += 1
+        self.recursos.registrar_pagina(self.driver)
+        if tipo:
+            return aguardar_pagina(self.driver, tipo, grupos)
+        return None
+
+    def aguardar(self, seletor, clicavel=False):
+        """Espera um elemento com timeout adaptativo (ver EsperaAdaptativa)"""
+        return self.espera.aguardar(self.driver, seletor, clicavel)
+
+    def pid_driver(self):
+        """PID do chromedriver desta sessão"""
+        try:
+            return self.driver.service.process.pid
+        except AttributeError:
+            return None
+
+    def pid_navegador(self):
+        """PID do Chrome persistente (registrado quando foi lançado)"""
+        try:
+            with open(ARQUIVO_SESSAO, 'r', encoding='utf-8') as f:
+                registro = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return registro.get("pid") if registro.get("porta") == self.porta else None
+
+    def verificar_memoria(self):
+        """
+        Ponto seguro entre ações: consulta o vigia e, se algum limite foi
+        ultrapassado, recicla o navegador. Retorna True se reciclou.
+        """
+        reciclar, motivo = self.vigia.avaliar(self)
+        if not reciclar:
+            return False
+
+        print(f"\n♻️ Reciclando navegador: {motivo}")
+        self.reciclar()
+        return True
+
+    def reciclar(self):
+        """
+        Fecha o navegador por completo (inclusive o Chrome persistente) e
+        abre outro com o mesmo perfil; cookies e login vêm do user-data-dir.
+        """
+        self.recursos.relatorio()
+        if self.anexado:
+            try:
+                # Fecha o Chrome de forma ordenada, gravando o perfil em disco
+                self.driver.execute_cdp_cmd("Browser.close", {})
+            except Exception:
+                pass
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+        self.driver = None
+        self.paginas = 0
+        self.vigia.reciclagens += 1
+
+        if self.anexado:
+            for _ in range(20):
+                if not self._navegador_ativo():
+                    break
+                self.relogio.dormir(0.5)
+
+        self.iniciar()
+        self.login_validado = self.sessao_ativa()
+        return self.driver
+
+    def _navegador_ativo(self):
+        """Verifica se há um Chrome respondendo na porta de depuração"""
+        from urllib.request import urlopen
+
+        if not self.porta:
+            return False
+        try:
+            with urlopen(f"http://127.0.0.1:{self.porta}/json/version", timeout=1) as resposta:
+                return "Browser" in json.loads(resposta.read().decode("utf-8"))
+        except (OSError, ValueError):
+            return False
+
+    def _lancar_navegador(self):
+        """Inicia o Chrome como processo independente, que sobrevive ao comando atual"""
+        executavel = _executavel_chrome()
+        if not executavel:
+            return False
+
+        if not self.porta_fixa:
+            self.porta = _porta_livre()
+
+        argumentos = [executavel, "--remote-debugging-address=127.0.0.1",
+                      f"--remote-debugging-port={self.porta}",
+                      f"--user-data-dir={self.pasta_perfil}",
+                      "--no-first-run", "--no-default-browser-check"] + ARGUMENTOS_CHROME
+        argumentos += self.recursos.argumentos_chrome()
+        opcoes = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if sys.platform.startswith("win"):
+            opcoes["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+        else:
+            opcoes["start_new_session"] = True
+
+        print("🚀 Iniciando navegador persistente...")
+        processo = subprocess.Popen(argumentos, **opcoes)
+
+        os.makedirs(os.path.dirname(ARQUIVO_SESSAO), exist_ok=True)
+        with open(ARQUIVO_SESSAO, 'w', encoding='utf-8') as f:
+            json.dump({"pid": processo.pid, "porta": self.porta, "perfil": self.pasta_perfil}, f, indent=2)
+
+        for _ in range(30):
+            if self._navegador_ativo():
+                return True
+            self.relogio.dormir(0.5)
+        return False
+
+    def sessao_ativa(self):
+        """
+        Verificação barata de login: procura o cookie de sessão do LinkedIn
+        via CDP, sem navegar. Retorna False se não der para confirmar.
+        """
+        try:
+            cookies = self.driver.execute_cdp_cmd(
+                "Network.getCookies", {"urls": ["https://www.linkedin.com"]}
+            ).get("cookies", [])
+        except Exception:
+            return False
+
+        agora = self.relogio.agora().timestamp()
+        for cookie in cookies:
+            if cookie.get("name") == "li_at":
+                expira = cookie.get("expires", -1)
+                return expira <= 0 or expira > agora
+        return False
+
+    def garantir_login(self, email, senha):
+        """Garante que a sessão está logada, só navegando/logando se preciso"""
+        self.iniciar()
+
+        if self.login_validado or self.sessao_ativa():
+            print("✅ Sessão do LinkedIn ativa!")
+            self.login_validado = True
+            return True
+
+        self.driver.get("https://www.linkedin.com/feed/")
+        self.relogio.dormir(3)
+
+        if "login" in self.driver.current_url or "checkpoint" in self.driver.current_url \
+                or "authwall" in self.driver.current_url:
+            print("⚠️ Não está logado. Fazendo login...")
+            self.login_validado = self.fazer_login(email, senha)
+        else:
+            print("✅ Sessão do LinkedIn ativa!")
+            self.login_validado = True
+
+        return self.login_validado
+
+    def fazer_login(self, email, senha):
+        """Faz login no LinkedIn"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        print("\n🔐 Fazendo login...")
+
+        try:
+            self.driver.get("https://www.linkedin.com/login")
+            self.relogio.dormir(self.relogio.uniforme(2, 4))
+
+            email_field = WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located((By.ID, "username"))
+            )
+            email_field.clear()
+            email_field.send_keys(email)
+            self.relogio.dormir(self.relogio.uniforme(0.5, 1.5))
+
+            senha_field = self.driver.find_element(By.ID, "password")
+            senha_field.clear()
+            senha_field.send_keys(senha)
+            self.relogio.dormir(self.relogio.uniforme(0.5, 1.5))
+
+            self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
+            self.relogio.dormir(5)
+
+            if "feed" in self.driver.current_url:
+                print("✅ Login realizado!")
+                return True
+
+            if "checkpoint" in self.driver.current_url or "check" in self.driver.current_url:
+                print("⚠️ LinkedIn pediu verificação de segurança.")
+                print("   Complete a verificação manualmente no navegador...")
+                input("   Pressione ENTER quando terminar...")
+                return "login" not in self.driver.current_url
+
+            print(f"❌ Login falhou. URL atual: {self.driver.current_url}")
+            return False
+
+        except Exception as e:
+            print(f"❌ Erro no login: {str(e)}")
+            return False
+
+    def fechar(self):
+        """
+        Encerra o uso da sessão. Se conectado ao Chrome persistente, só
+        desconecta o chromedriver: o navegador continua aberto e logado
+        para o próximo comando.
+        """
+        if self.driver is None:
+            return
+
+        self.recursos.relatorio()
+        self.espera.salvar()
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+        self.driver = None
+        self.paginas = 0
+        self.login_validado = False
+        if self.anexado:
+            print("\n💤 Navegador mantido aberto para o próximo comando")
+        else:
+            print("\n👋 Navegador fechado")
+
+
+_sessao = None
+
+def obter_sessao():
+    """Retorna a sessão de navegador do processo (compartilhada entre extrator e bot)"""
+    global _sessao
+    if _sessao is None:
+        _sessao = SessaoNavegador()
+    return _sessao
+
+
+def _porta_livre():
+    """Porta TCP livre em 127.0.0.1 escolhida pelo sistema"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _carregar_config_navegador():
+    """Lê a seção 'navegador' de config/cadencia.json"""
+    try:
+        with open(ARQUIVO_CADENCIA, 'r', encoding='utf-8') as f:
+            return json.load(f).get("navegador", {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _executavel_chrome():
+    """Caminho do executável do Chrome, ou None"""
+    candidatos = list(_CAMINHOS_CHROME)
+    if sys.platform.startswith("win"):
+        for base in (os.environ.get("PROGRAMFILES", ""), os.environ.get("PROGRAMFILES(X86)", ""),
+                     os.environ.get("LOCALAPPDATA", "")):
+            candidatos.append(os.path.join(base, "Google", "Chrome", "Application", "chrome.exe"))
+
+    for candidato in candidatos:
+        executavel = shutil.which(candidato) or (candidato if os.path.isfile(candidato) else None)
+        if executavel:
+            return executavel
+    return None
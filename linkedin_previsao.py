@@ -0,0 +1,318 @@
+"""
+Previsão da cadência
+Projeta, dia a dia, quando cada etapa das sequências vai acontecer para a
+base inteira de contatos com as regras reais de janelas (CalendarioJanelas)
+e limites (LimitadorEnvios), sem abrir o navegador. Os contatos viram
+colunas NumPy (sequência, etapa, última ação, liberação, score), então
+cada dia simulado é um punhado de operações vetorizadas mesmo com 100 mil
+contatos. As condições das etapas (aceite, resposta) são consideradas
+satisfeitas: a previsão é o volume máximo que a cadência pode gerar.
+"""
+
+import math
+from datetime import datetime, time, timedelta
+
+from linkedin_limites import LimitadorEnvios
+from linkedin_prioridade import AgendaPrioridade, FOLLOWUP_ATRASADO, FOLLOWUP, PRIMEIRO_CONTATO
+
+# Tipo de contato -> linha das tabelas por sequência
+SEQUENCIAS = ("novo", "conexao_existente")
+
+HORIZONTE_DIAS = 365
+DIA = 86400
+
+
+class PrevisaoCadencia:
+    """
+    Simulação dia a dia a partir do estado atual. Em cada dia: calcula os
+    instantes em que um envio seria admitido (janelas + limites + intervalo
+    médio entre ações), escolhe os contatos vencidos na ordem da agenda de
+    prioridade e avança a etapa deles. Contatos ainda sem tipo seguem a
+    sequência de 'tipo_nao_detectado'; sequência inativa conta só a 1ª etapa.
+    """
+
+    def __init__(self, cadencia, config=None):
+        config = config or {}
+        self.cadencia = cadencia
+        self.horizonte = config.get("horizonte_dias", HORIZONTE_DIAS)
+        self.tipo_padrao = config.get("tipo_nao_detectado", "novo")
+        self.agenda = AgendaPrioridade(cadencia, cadencia.config.get("prioridade"))
+
+        limites = cadencia.config["limites"]
+        self.limites = limites
+        self.intervalo = (limites["intervalo_min_segundos"] + limites["intervalo_max_segundos"]) / 2
+
+        # Etapas efetivas por sequência: [(nome, dias_espera, é convite)]
+        self.etapas = []
+        for tipo in SEQUENCIAS:
+            sequencia = cadencia.get_sequencia_para_tipo(tipo)
+            etapas = sequencia.get("etapas", [])
+            if not sequencia.get("ativo", False):
+                etapas = etapas[:1]
+            self.etapas.append([
+                (e["nome"], e.get("dias_espera", 0), e["tipo"] in ("convite", "convite_com_mensagem"))
+                for e in etapas
+            ])
+
+    def _tabelas(self):
+        """(dias de espera, é convite) indexados por [sequência, etapa] e total de etapas por sequência"""
+        import numpy as np
+
+        largura = max(len(e) for e in self.etapas) + 1
+        espera = np.zeros((len(SEQUENCIAS), largura))
+        convite = np.zeros((len(SEQUENCIAS), largura), dtype=bool)
+        for s, etapas in enumerate(self.etapas):
+            for e, (_, dias, eh_convite) in enumerate(etapas):
+                espera[s, e] = dias
+                convite[s, e] = eh_convite
+        total = np.array([len(e) for e in self.etapas])
+        return espera, convite, total
+
+    def colunas(self, urls):
+        """
+        Visão colunar dos contatos da lista (sem duplicados): sequência,
+        etapa atual, última ação e fim do backoff (epoch; NaN/0 se não há),
+        score e se a sequência ainda está em andamento.
+        """
+        import numpy as np
+
+        contatos = self.cadencia.estado["contatos"]
+        indices = {tipo: s for s, tipo in enumerate(SEQUENCIAS)}
+        padrao = indices.get(self.tipo_padrao, 0)
+        _, _, total = self._tabelas()
+
+        vistos = set()
+        sequencia, etapa, ultima, liberado, score, ativo = [], [], [], [], [], []
+        sem_tipo = 0
+
+        for item in urls:
+            chave = self.cadencia.chave_contato(item.get("url", item) if isinstance(item, dict) else item)
+            if chave in vistos:
+                continue
+            vistos.add(chave)
+
+            contato = contatos.get(chave) or {}
+            # Contatos da fila trazem o tipo detectado na extração
+            tipo = contato.get("tipo") or (item.get("tipo") if isinstance(item, dict) else None)
+            if not tipo:
+                sem_tipo += 1
+            s = indices.get(tipo, padrao)
+            e = contato.get("etapa_atual", 0)
+
+            sequencia.append(s)
+            etapa.append(e)
+            ultima.append(
+                self.cadencia.data_local(contato["ultima_acao"]).timestamp()
+                if contato.get("ultima_acao") else math.nan
+            )
+            liberado.append(
+                self.cadencia.data_local(contato["proxima_tentativa"]).timestamp()
+                if contato.get("proxima_tentativa") else 0.0
+            )
+            score.append(self.agenda.pontuacao(item))
+            ativo.append(not contato.get("descartado") and not contato.get("respondeu") and e < total[s])
+
+        return {
+            "sequencia": np.array(sequencia, dtype=np.int8),
+            "etapa": np.array(etapa, dtype=np.int16),
+            "ultima": np.array(ultima, dtype=float),
+            "liberado": np.array(liberado, dtype=float),
+            "score": np.array(score, dtype=float),
+            "ativo": np.array(ativo, dtype=bool),
+            "sem_tipo": sem_tipo,
+        }
+
+    def _instantes(self, eventos, inicio, fim, maximo):
+        """Instantes do intervalo [inicio, fim) em que um envio seria admitido (até 'maximo')"""
+        limitador = LimitadorEnvios(self.limites, eventos)
+        calendario = self.cadencia.calendario
+        fuso = self.cadencia.fuso
+        instantes = []
+
+        instante = inicio
+        while instante < fim and len(instantes) < maximo:
+            momento = datetime.fromtimestamp(instante, fuso)
+            if not calendario.aberto(momento)[0]:
+                abertura = calendario.proxima_abertura(momento)
+                if abertura is None:
+                    break
+                instante = abertura.timestamp()
+                continue
+
+            liberacao = limitador.proxima_liberacao(instante)
+            if liberacao > instante:
+                instante = liberacao
+                continue
+
+            limitador.registrar(instante)
+            instantes.append(instante)
+            instante += self.intervalo
+
+        return [i for i in instantes if i < fim]
+
+    def _ordem(self, candidatos, vencimento, colunas, espera, agora):
+        """Índices dos candidatos na ordem em que o bot os atenderia no dia"""
+        import numpy as np
+
+        etapa = colunas["etapa"][candidatos]
+        score = colunas["score"][candidatos]
+        agenda = self.agenda
+
+        if not agenda.ativo:
+            classe = np.full(len(candidatos), PRIMEIRO_CONTATO)
+            peso = np.zeros(len(candidatos))
+        else:
+            # Mesma chave da AgendaPrioridade: classe, atraso em dias além da espera, score
+            passados = np.floor((agora - colunas["ultima"][candidatos]) / DIA)
+            atraso = np.maximum(0, np.nan_to_num(passados - espera[colunas["sequencia"][candidatos], etapa]))
+            followup = etapa > 0
+            classe = np.where(
+                followup,
+                np.where(atraso > agenda.tolerancia, FOLLOWUP_ATRASADO, FOLLOWUP),
+                PRIMEIRO_CONTATO
+            )
+            peso = agenda.peso_score * score + np.where(followup, agenda.peso_atraso * atraso, 0.0)
+
+        # Já vencidos no começo do dia: pela agenda; os que vencem depois: por vencimento
+        depois = np.where(vencimento[candidatos] > agora, vencimento[candidatos], -np.inf)
+        ordem = np.lexsort((candidatos, -peso, classe, depois))
+        return candidatos[ordem]
+
+    def prever(self, urls):
+        """Projeta a cadência até concluir todos os contatos ou atingir o horizonte"""
+        import numpy as np
+
+        espera, convite, total = self._tabelas()
+        colunas = self.colunas(urls)
+        sequencia, etapa, ativo = colunas["sequencia"], colunas["etapa"], colunas["ativo"]
+        ultima = colunas["ultima"]
+
+        etapa_inicial = etapa.copy()
+        ativos_inicio = int(ativo.sum())
+        conclusao = np.full(len(etapa), np.nan)
+        por_etapa = np.zeros(espera.shape, dtype=np.int64)
+        ultima_por_etapa = np.full(espera.shape, np.nan)
+        dias = []
+
+        eventos = self.cadencia.limitador.eventos()
+        fuso = self.cadencia.fuso
+        inicio = self.cadencia.agora()
+        instante = inicio.timestamp()
+
+        for d in range(self.horizonte):
+            if not ativo.any():
+                break
+
+            dia = inicio.date() + timedelta(days=d)
+            fim = fuso.localize(datetime.combine(dia + timedelta(days=1), time())).timestamp()
+            instantes = self._instantes(eventos, instante, fim, int(ativo.sum()))
+
+            enviados = np.zeros(0, dtype=np.int64)
+            horarios = []
+            if instantes:
+                # Vencimento: última ação + dias de espera da próxima etapa, ou fim do backoff
+                vencimento = np.fmax(
+                    np.nan_to_num(ultima + espera[sequencia, etapa] * DIA, nan=-np.inf),
+                    colunas["liberado"]
+                )
+                candidatos = np.flatnonzero(ativo & (vencimento <= instantes[-1]))
+                ordem = self._ordem(candidatos, vencimento, colunas, espera, instantes[0])
+
+                # Cada instante vai para o próximo contato já vencido nele
+                j = 0
+                escolhidos = []
+                for i in ordem:
+                    while j < len(instantes) and instantes[j] < vencimento[i]:
+                        j += 1
+                    if j == len(instantes):
+                        break
+                    escolhidos.append(i)
+                    horarios.append(instantes[j])
+                    j += 1
+                enviados = np.array(escolhidos, dtype=np.int64)
+
+            if len(enviados):
+                s, e = sequencia[enviados], etapa[enviados]
+                convites = int(convite[s, e].sum())
+                np.add.at(por_etapa, (s, e), 1)
+                ultima_por_etapa[s, e] = fim
+
+                etapa[enviados] += 1
+                ultima[enviados] = horarios
+                concluidos = enviados[etapa[enviados] >= total[s]]
+                ativo[concluidos] = False
+                conclusao[concluidos] = fim
+                eventos = eventos + horarios
+            else:
+                convites = 0
+
+            dias.append({
+                "data": dia,
+                "envios": len(enviados),
+                "convites": convites,
+                "mensagens": len(enviados) - convites,
+                "em_andamento": int(ativo.sum()),
+            })
+            instante = fim
+
+        # Datas em que 50%, 90% e 100% dos contatos em andamento concluem
+        concluidas = np.sort(conclusao[~np.isnan(conclusao)])
+        marcos = {}
+        for percentual in (50, 90, 100):
+            necessarios = math.ceil(ativos_inicio * percentual / 100)
+            if necessarios and len(concluidas) >= necessarios:
+                marcos[percentual] = self._data(concluidas[necessarios - 1] - 1)
+
+        etapas = []
+        for s, tipo in enumerate(SEQUENCIAS):
+            for e, (nome, dias_espera, _) in enumerate(self.etapas[s]):
+                etapas.append({
+                    "tipo": tipo,
+                    "etapa": e + 1,
+                    "nome": nome,
+                    "feitas": int(((sequencia == s) & (etapa_inicial > e)).sum()),
+                    "previstas": int(por_etapa[s, e]),
+                    "ultima": self._data(ultima_por_etapa[s, e] - 1) if por_etapa[s, e] else None,
+                })
+
+        return {
+            "contatos": len(etapa),
+            "em_andamento": ativos_inicio,
+            "sem_tipo": colunas["sem_tipo"],
+            "dias": dias,
+            "etapas": etapas,
+            "conclusao": marcos,
+            "nao_concluem": int(ativo.sum()),
+        }
+
+    def _data(self, instante):
+        return datetime.fromtimestamp(instante, self.cadencia.fuso).date()
+
+    def imprimir(self, resultado, dias_exibidos=30):
+        """Resumo da previsão no terminal"""
+        print("\n📈 PREVISÃO DA CADÊNCIA")
+        print(f"   Contatos na lista: {resultado['contatos']} ({resultado['em_andamento']} em andamento)")
+        if resultado['sem_tipo']:
+            print(f"   Sem tipo detectado: {resultado['sem_tipo']} (previstos como '{self.tipo_padrao}')")
+
+        com_envios = [d for d in resultado['dias'] if d['envios']]
+        print(f"\n📅 Volume diário ({len(com_envios)} dia(s) com envios):")
+        print(f"   {'data':<12} {'envios':>7} {'convites':>9} {'mensagens':>10} {'em andamento':>13}")
+        for d in com_envios[:dias_exibidos]:
+            print(f"   {d['data'].strftime('%d/%m/%Y'):<12} {d['envios']:>7} {d['convites']:>9} "
+                  f"{d['mensagens']:>10} {d['em_andamento']:>13}")
+        if len(com_envios) > dias_exibidos:
+            restantes = com_envios[dias_exibidos:]
+            print(f"   ... mais {len(restantes)} dia(s), {sum(d['envios'] for d in restantes)} envio(s) "
+                  f"até {restantes[-1]['data'].strftime('%d/%m/%Y')}")
+
+        print("\n🪜 Por etapa (feitas / previstas / última prevista):")
+        for e in resultado['etapas']:
+            ultima = e['ultima'].strftime('%d/%m/%Y') if e['ultima'] else "-"
+            print(f"   {e['tipo']:<18} {e['etapa']}. {e['nome']:<18} {e['feitas']:>7} {e['previstas']:>8}   {ultima}")
+
+        print("\n🏁 Conclusão das sequências:")
+        for percentual, data in resultado['conclusao'].items():
+            print(f"   {percentual}% dos contatos em andamento: {data.strftime('%d/%m/%Y')}")
+        if resultado['nao_concluem']:
+            print(f"   ⚠️ {resultado['nao_concluem']} contato(s) não concluem em {self.horizonte} dias")
@@ -0,0 +1,89 @@
+"""
+Agenda de prioridade das ações pendentes
+Ordena as ações de uma sessão para que o orçamento diário vá primeiro
+para quem já está no meio da sequência: follow-ups atrasados, depois os
+demais follow-ups (pesados pelo atraso e pelo score do lead) e por último
+os primeiros contatos. Usa um heap: escolher a próxima ação é O(log n).
+"""
+
+import heapq
+
+# Classes de prioridade (menor sai primeiro)
+FOLLOWUP_ATRASADO = 0
+FOLLOWUP = 1
+PRIMEIRO_CONTATO = 2
+
+_NOMES = {
+    FOLLOWUP_ATRASADO: "follow-up(s) atrasado(s)",
+    FOLLOWUP: "follow-up(s)",
+    PRIMEIRO_CONTATO: "primeiro(s) contato(s)",
+}
+
+
+class AgendaPrioridade:
+    """
+    Heap de (classe, -peso, ordem original, item). O peso combina os dias
+    de atraso da etapa e o score do lead (coluna configurável da lista);
+    a ordem original desempata, então com a agenda desativada tudo sai
+    na ordem da lista.
+    """
+
+    def __init__(self, cadencia, config=None):
+        config = config or {}
+        self.cadencia = cadencia
+        self.ativo = config.get("ativo", True)
+        self.tolerancia = config.get("tolerancia_atraso_dias", 1)
+        self.peso_atraso = config.get("peso_atraso", 1.0)
+        self.peso_score = config.get("peso_score", 0.5)
+        self.campo_score = config.get("campo_score", "score")
+        self._heap = []
+        self._ordem = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def pontuacao(self, dados):
+        """Score do lead (coluna 'campo_score' da linha da lista), 0 se ausente ou inválido"""
+        try:
+            return float(dados.get(self.campo_score) or 0) if isinstance(dados, dict) else 0.0
+        except (TypeError, ValueError):
+            return 0.0
+
+    def chave(self, item):
+        """(classe, -peso) da ação pendente"""
+        if not self.ativo:
+            return (PRIMEIRO_CONTATO, 0.0)
+
+        etapa = item.get('etapa')
+        etapas = self.cadencia.get_sequencia_para_tipo(item.get('tipo')).get('etapas', []) if etapa else []
+        if not etapa or etapa not in etapas or etapas.index(etapa) == 0:
+            return (PRIMEIRO_CONTATO, -self.peso_score * self.pontuacao(item.get('dados')))
+
+        # Dias além do 'dias_espera' da etapa
+        contato = self.cadencia.get_etapa_contato(item['url'])
+        atraso = 0
+        if contato.get('ultima_acao'):
+            passados = (self.cadencia.agora() - self.cadencia.data_local(contato['ultima_acao'])).days
+            atraso = max(0, passados - etapa.get('dias_espera', 0))
+
+        classe = FOLLOWUP_ATRASADO if atraso > self.tolerancia else FOLLOWUP
+        return (classe, -(self.peso_atraso * atraso + self.peso_score * self.pontuacao(item.get('dados'))))
+
+    def adicionar(self, itens):
+        """Adiciona as ações pendentes (na ordem da lista)"""
+        for item in itens:
+            classe, peso = self.chave(item)
+            self._heap.append((classe, peso, self._ordem, item))
+            self._ordem += 1
+        heapq.heapify(self._heap)
+
+    def proximo(self):
+        """Retira a ação de maior prioridade"""
+        return heapq.heappop(self._heap)[3]
+
+    def resumo(self):
+        """Texto com a quantidade de ações por classe"""
+        contagem = {}
+        for classe, _, _, _ in self._heap:
+            contagem[classe] = contagem.get(classe, 0) + 1
+        return ", ".join(f"{contagem[c]} {_NOMES[c]}" for c in sorted(contagem))
@@ -0,0 +1,70 @@
+"""
+Relógio e aleatoriedade injetáveis
+Todo acesso a horário, espera e sorteio do bot e do extrator passa por um
+Relogio. O padrão é o relógio de parede; RelogioSimulado avança o tempo
+virtual na hora em vez de dormir e sorteia com semente fixa, para
+reproduzir execuções (ex: uma semana de modo contínuo em segundos, ver
+benchmarks/bench_semana_simulada.py).
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+
+class Relogio:
+    """Relógio de parede com gerador aleatório próprio (semente opcional)"""
+
+    def __init__(self, semente=None):
+        self.aleatorio = random.Random(semente)
+
+    def agora(self, fuso=None):
+        """Como datetime.now(fuso)"""
+        return datetime.now(fuso)
+
+    def monotonico(self):
+        """Segundos de um relógio que só avança (para medir intervalos)"""
+        return time.monotonic()
+
+    def dormir(self, segundos):
+        time.sleep(segundos)
+
+    def uniforme(self, minimo, maximo):
+        return self.aleatorio.uniform(minimo, maximo)
+
+
+class RelogioSimulado(Relogio):
+    """
+    Tempo virtual a partir de 'inicio' (datetime com fuso; padrão: agora).
+    dormir() só avança o relógio, então esperas de minutos ou dias levam
+    microssegundos e a execução inteira é determinística pela semente.
+    """
+
+    def __init__(self, inicio=None, semente=0):
+        super().__init__(semente)
+        self.inicio = (inicio or datetime.now()).astimezone()
+        self.decorrido = 0.0
+
+    def agora(self, fuso=None):
+        instante = self.inicio + timedelta(seconds=self.decorrido)
+        # Sem fuso, devolve o horário local ingênuo, como datetime.now()
+        return instante.astimezone(fuso) if fuso else instante.astimezone().replace(tzinfo=None)
+
+    def monotonico(self):
+        return self.decorrido
+
+    def dormir(self, segundos):
+        self.decorrido += max(0.0, segundos)
+
+
+_relogio = Relogio()
+
+def obter_relogio():
+    """Retorna o relógio do processo"""
+    return _relogio
+
+def definir_relogio(relogio):
+    """Troca o relógio do processo (ex: RelogioSimulado para reproduzir uma execução)"""
+    global _relogio
+    _relogio = relogio
+    return relogio
@@ -0,0 +1,149 @@
+"""
+Registro central de seletores CSS
+Carrega as cadeias de fallback de config/seletores.json, registra a taxa
+de acerto de cada seletor e reordena as cadeias pelo sucesso recente,
+para que a maioria das buscas acerte na primeira tentativa. Seletores
+que pararam de funcionar aparecem no relatório.
+"""
+
+import json
+import os
+
+from linkedin_relogio import obter_relogio
+
+ARQUIVO_SELETORES = "config/seletores.json"
+ARQUIVO_ESTATISTICAS = "data/cache/estatisticas_seletores.json"
+
+# Peso de cada nova tentativa na taxa recente (média móvel exponencial)
+PESO_RECENTE = 0.2
+# Taxa assumida para seletores ainda sem tentativas
+TAXA_INICIAL = 0.5
+# Com pelo menos esse número de tentativas e taxa abaixo do limite, o seletor é dado como morto
+MIN_TENTATIVAS_MORTO = 10
+TAXA_MORTO = 0.05
+
+
+class RegistroSeletores:
+    """Cadeias de seletores com estatísticas de acerto por seletor"""
+
+    def __init__(self, arquivo=ARQUIVO_SELETORES, arquivo_estatisticas=ARQUIVO_ESTATISTICAS, relogio=None):
+        self.arquivo = arquivo
+        self.relogio = relogio or obter_relogio()
+        self.arquivo_estatisticas = arquivo_estatisticas
+        self.cadeias = self._carregar_cadeias()
+        self.estatisticas = self._carregar_estatisticas()
+        self.alterado = False
+        self._ordem = {}
+
+    def _carregar_cadeias(self):
+        """Carrega as cadeias do arquivo de configuração"""
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                return json.load(f).get("cadeias", {})
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"⚠️ Não foi possível carregar {self.arquivo}: {e}")
+            return {}
+
+    def _carregar_estatisticas(self):
+        try:
+            with open(self.arquivo_estatisticas, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def salvar(self):
+        """Salva as estatísticas se houve mudança"""
+        if not self.alterado:
+            return
+        os.makedirs(os.path.dirname(self.arquivo_estatisticas), exist_ok=True)
+        with open(self.arquivo_estatisticas, 'w', encoding='utf-8') as f:
+            json.dump(self.estatisticas, f, indent=2, ensure_ascii=False)
+        self.alterado = False
+
+    def _stats(self, cadeia, seletor):
+        return self.estatisticas.get(cadeia, {}).get(seletor)
+
+    def ordem(self, cadeia):
+        """Seletores da cadeia, do maior para o menor acerto recente (empate: ordem do config)"""
+        if cadeia not in self._ordem:
+            seletores = self.cadeias.get(cadeia, [])
+            self._ordem[cadeia] = sorted(
+                seletores,
+                key=lambda s: -(self._stats(cadeia, s) or {}).get("taxa", TAXA_INICIAL)
+            )
+        return self._ordem[cadeia]
+
+    def registrar(self, cadeia, seletor, acertou):
+        """Atualiza contadores e taxa recente do seletor"""
+        stats = self.estatisticas.setdefault(cadeia, {}).setdefault(
+            seletor, {"tentativas": 0, "acertos": 0, "taxa": TAXA_INICIAL, "ultimo_acerto": None}
+        )
+        stats["tentativas"] += 1
+        stats["taxa"] = round((1 - PESO_RECENTE) * stats["taxa"] + PESO_RECENTE * (1.0 if acertou else 0.0), 4)
+        if acertou:
+            stats["acertos"] += 1
+            stats["ultimo_acerto"] = self.relogio.agora().isoformat(timespec="seconds")
+
+        self.alterado = True
+        self._ordem.pop(cadeia, None)
+
+    def buscar_texto(self, driver, cadeia, validar=None, todos=False):
+        """
+        Percorre a cadeia e retorna o primeiro texto aceito por 'validar'
+        (padrão: não vazio). Com 'todos', testa todos os elementos de cada
+        seletor, não só o primeiro. Usa find_elements: erro não vira exceção.
+        """
+        from selenium.common.exceptions import WebDriverException
+        from selenium.webdriver.common.by import By
+
+        validar = validar or bool
+
+        for seletor in self.ordem(cadeia):
+            try:
+                elementos = driver.find_elements(By.CSS_SELECTOR, seletor)
+                for elemento in (elementos if todos else elementos[:1]):
+                    texto = elemento.text.strip()
+                    if validar(texto):
+                        self.registrar(cadeia, seletor, True)
+                        return texto
+            except WebDriverException:
+                pass
+            self.registrar(cadeia, seletor, False)
+
+        return ""
+
+    def buscar_elementos(self, driver, cadeia):
+        """Retorna os elementos do primeiro seletor da cadeia que encontrar algo"""
+        from selenium.common.exceptions import WebDriverException
+        from selenium.webdriver.common.by import By
+
+        for seletor in self.ordem(cadeia):
+            try:
+                elementos = driver.find_elements(By.CSS_SELECTOR, seletor)
+            except WebDriverException:
+                elementos = []
+            self.registrar(cadeia, seletor, bool(elementos))
+            if elementos:
+                return elementos
+
+        return []
+
+    def relatorio(self):
+        """Linhas (cadeia, seletor, tentativas, acertos, taxa, morto) na ordem atual de cada cadeia"""
+        linhas = []
+        for cadeia in self.cadeias:
+            for seletor in self.ordem(cadeia):
+                stats = self._stats(cadeia, seletor) or {"tentativas": 0, "acertos": 0, "taxa": TAXA_INICIAL}
+                morto = stats["tentativas"] >= MIN_TENTATIVAS_MORTO and stats["taxa"] < TAXA_MORTO
+                linhas.append((cadeia, seletor, stats["tentativas"], stats["acertos"], stats["taxa"], morto))
+        return linhas
+
+
+_registro = None
+
+def obter_registro_seletores():
+    """Retorna o registro de seletores do processo"""
+    global _registro
+    if _registro is None:
+        _registro = RegistroSeletores()
+    return _registro
@@ -0,0 +1,127 @@
+"""
+Normalização de URLs de perfil do LinkedIn
+Converte as variações de uma mesma URL (barra final, http/https,
+subdomínio, ?miniProfile..., /recent-activity/...) numa URL canônica
+e mantém um índice persistente de aliases descobertos em navegação
+(ex: URL com ID interno que redireciona para o slug público).
+"""
+
+import json
+import os
+import re
+from urllib.parse import urlsplit, unquote, quote
+
+ARQUIVO_ALIASES = "data/aliases_perfis.json"
+
+URL_BASE_PERFIL = "https://www.linkedin.com/in/"
+
+# IDs internos de membro (/in/ACoAAB...) diferenciam maiúsculas; slugs públicos não
+_ID_MEMBRO = re.compile(r'^ACo[A-Za-z0-9_-]{20,}$')
+
+_SLUG_SEGURO = re.compile(r'^[A-Za-z0-9_.~-]+$')
+
+# Caminho rápido para o formato mais comum, sem passar por urlsplit
+_URL_PERFIL = re.compile(r'^\s*(?:https?://)?(?:[a-z0-9-]+\.)?linkedin\.com/in/([^/?#%\s]+)(?:[/?#]\S*)?\s*$', re.IGNORECASE)
+
+
+def id_perfil(url):
+    """
+    Retorna o id canônico do perfil (slug em minúsculas, exceto IDs
+    internos de membro) ou None se a URL não for de um perfil /in/.
+    """
+    if not url or not isinstance(url, str):
+        return None
+
+    rapido = _URL_PERFIL.match(url)
+    if rapido:
+        slug = rapido.group(1)
+        return slug if _ID_MEMBRO.match(slug) else slug.lower()
+
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url.lstrip("/")
+
+    try:
+        partes = urlsplit(url)
+    except ValueError:
+        return None
+
+    host = (partes.hostname or "").lower()
+    if host != "linkedin.com" and not host.endswith(".linkedin.com"):
+        return None
+
+    segmentos = [s for s in partes.path.split("/") if s]
+    if len(segmentos) < 2 or segmentos[0].lower() != "in":
+        return None
+
+    slug = unquote(segmentos[1]).strip()
+    if not _ID_MEMBRO.match(slug):
+        slug = slug.lower()
+    return slug or None
+
+
+def url_canonica(url):
+    """
+    Retorna a URL canônica do perfil (https://www.linkedin.com/in/<slug>/).
+    URLs que não são de perfil voltam apenas sem espaços nas pontas.
+    """
+    slug = id_perfil(url)
+    if slug is None:
+        return url.strip() if isinstance(url, str) else url
+    if not _SLUG_SEGURO.match(slug):
+        slug = quote(slug, safe='-_.~')
+    return f"{URL_BASE_PERFIL}{slug}/"
+
+
+class IndiceAliases:
+    """Índice persistente URL canônica -> URL canônica final do perfil"""
+
+    def __init__(self, arquivo=ARQUIVO_ALIASES):
+        self.arquivo = arquivo
+        self.aliases = self._carregar()
+
+    def _carregar(self):
+        """Carrega o índice do disco"""
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def salvar(self):
+        """Salva o índice no disco"""
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        with open(self.arquivo, 'w', encoding='utf-8') as f:
+            json.dump(self.aliases, f, indent=2, ensure_ascii=False)
+
+    def resolver(self, url):
+        """Retorna a URL canônica do perfil, seguindo aliases conhecidos"""
+        return self.seguir(url_canonica(url))
+
+    def seguir(self, canonica):
+        """Segue os aliases a partir de uma URL que já está na forma canônica"""
+        if canonica not in self.aliases:
+            return canonica
+        vistos = set()
+        while canonica in self.aliases and canonica not in vistos:
+            vistos.add(canonica)
+            canonica = self.aliases[canonica]
+        return canonica
+
+    def registrar(self, url_original, url_final):
+        """
+        Registra que url_original leva ao perfil url_final (ex: após
+        redirecionamento no navegador). Retorna True se o índice mudou.
+        """
+        if id_perfil(url_final) is None:
+            return False
+
+        origem = url_canonica(url_original)
+        destino = self.resolver(url_final)
+
+        if origem == destino or self.aliases.get(origem) == destino:
+            return False
+
+        self.aliases[origem] = destino
+        self.salvar()
+        return True